@@ -0,0 +1,22 @@
+'''
+
+Benchmark suite for PyMinesweeper: mine placement, board generation, initialisation and reveal for
+each minefield engine over a grid of board sizes and mine densities, plus the frame time of the GUI
+main loop (drawn headless through SDL's dummy video driver), and the import time of the modules that
+headless workers load, which is held under a budget:
+
+    python -m benchmarks imports
+
+Results are written as JSON and two result files (e.g. of two commits) can be compared:
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare benchmarks/baseline.json results.json
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: __init__.py
+    @package: pyminesweeper v0.9
+
+'''
+
+from .bench import run_benchmarks, compare_results, load_results, save_results, check_import_budgets
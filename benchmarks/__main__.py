@@ -0,0 +1,79 @@
+'''
+
+Command line for the benchmark suite.
+
+    python -m benchmarks run [--sizes 10 100] [--densities 0.05 0.4] [--no-gui] [--output results.json]
+    python -m benchmarks compare base.json new.json [--threshold 0.1]
+    python -m benchmarks imports [--repeat 5]
+
+'compare' exits with status 1 if any case got slower than the threshold allows, 'imports' if a headless
+module takes longer to import than its budget or imports pygame.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: __main__.py
+    @package: pyminesweeper v0.9
+
+'''
+import json
+import sys
+from argparse import ArgumentParser
+from benchmarks.bench import run_benchmarks, compare_results, load_results, save_results, check_import_budgets, SIZES, DENSITIES, ENGINES, IMPORT_REPEAT
+
+if __name__ == '__main__':
+    parser = ArgumentParser(prog = "python -m benchmarks", allow_abbrev = False)
+    commands = parser.add_subparsers(dest = "command")
+
+    run_parser = commands.add_parser("run", help = "Run the benchmarks and write the results as JSON.")
+    run_parser.add_argument("--sizes", type = int, nargs = "+", default = SIZES, help = "Sides of the square boards to benchmark.")
+    run_parser.add_argument("--densities", type = float, nargs = "+", default = DENSITIES, help = "Fractions of cells holding mines.")
+    run_parser.add_argument("--engines", nargs = "+", default = list(ENGINES), choices = list(ENGINES), help = "Minefield engines to benchmark.")
+    run_parser.add_argument("--no-gui", action = "store_true", help = "Skip the GUI frame benchmarks.")
+    run_parser.add_argument("--no-imports", action = "store_true", help = "Skip the import time benchmarks.")
+    run_parser.add_argument("--min-time", type = float, default = 0.2, help = "Seconds to spend repeating each case.")
+    run_parser.add_argument("--min-repeat", type = int, default = 3, help = "Minimum number of runs of each case.")
+    run_parser.add_argument("--max-repeat", type = int, default = 1000, help = "Maximum number of runs of each case.")
+    run_parser.add_argument("--output", "-o", default = None, help = "File to write the results to (default: print them).")
+
+    compare_parser = commands.add_parser("compare", help = "Compare two result files.")
+    compare_parser.add_argument("base", help = "Results to compare against (e.g. benchmarks/baseline.json).")
+    compare_parser.add_argument("new", help = "New results.")
+    compare_parser.add_argument("--threshold", type = float, default = 0.1, help = "Relative slow-down reported as a regression.")
+    compare_parser.add_argument("--statistic", default = "median", choices = ["median", "best"], help = "Time compared for each case.")
+
+    imports_parser = commands.add_parser("imports", help = "Check the import times of the headless modules against their budgets.")
+    imports_parser.add_argument("--repeat", type = int, default = IMPORT_REPEAT, help = "Fresh interpreters to time each import in.")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_benchmarks(sizes = args.sizes, densities = args.densities,
+                                 engines = dict((name, ENGINES[name]) for name in args.engines), gui = not args.no_gui, imports = not args.no_imports,
+                                 min_time = args.min_time, min_repeat = args.min_repeat, max_repeat = args.max_repeat)
+        if args.output:
+            save_results(results, args.output)
+        else:
+            print(json.dumps(results, indent = 1))
+
+    elif args.command == "compare":
+        base, new = load_results(args.base), load_results(args.new)
+        rows, regressions = compare_results(base, new, threshold = args.threshold, statistic = args.statistic)
+
+        print("%s (%s) -> %s (%s)"%(args.base, base['meta'].get('commit'), args.new, new['meta'].get('commit')))
+        for key, base_time, new_time, ratio in rows:
+            marker = "  <-- slower" if key in regressions else ""
+            print("%-60s %10.3f ms -> %10.3f ms  x%.2f%s"%(key, 1e3*base_time, 1e3*new_time, ratio, marker))
+        print("\n%d cases compared, %d regressions (threshold %.0f%%)"%(len(rows), len(regressions), 100*args.threshold))
+
+        sys.exit(1 if regressions else 0)
+
+    elif args.command == "imports":
+        rows, failures = check_import_budgets(repeat = args.repeat)
+        for module, median, budget, loads_pygame in rows:
+            marker = "  <-- imports pygame" if loads_pygame else ("  <-- over budget" if median > budget else "")
+            print("%-50s %8.1f ms  (budget %6.1f ms)%s"%(module, 1e3*median, 1e3*budget, marker))
+
+        sys.exit(1 if failures else 0)
+
+    else:
+        parser.print_help()
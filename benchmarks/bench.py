@@ -0,0 +1,278 @@
+'''
+
+Benchmark cases, the runner and the comparison of result files.
+
+Every case is timed with a fresh setup before each repetition (the setup is not timed), repeated at least
+'min_repeat' times and until 'min_time' seconds have been spent, setups included (or 'max_repeat' runs
+were made), and reported by its best and median time.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: bench.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+from pyminesweeper.core import MineField, ArrayMineField, Game
+
+SIZES = [10, 100, 1000, 5000]
+DENSITIES = [0.05, 0.15, 0.4, 0.8]
+ENGINES = {'MineField': MineField, 'ArrayMineField': ArrayMineField}
+
+# ----- one Cell object per cell: the legacy engine is not run on boards larger than this
+MAX_LEGACY_CELLS = 1000*1000
+
+GUI_BOARDS = [(9, 9, 10), (16, 16, 40), (16, 30, 99), (30, 30, 180)]
+GUI_FRAMES = 50
+
+# ----- modules imported by headless workers, with the time (seconds) their import may take in a fresh interpreter;
+#       none of them may import pygame
+IMPORT_BUDGETS = {'pyminesweeper.core': 0.05,
+                  'pyminesweeper.interface': 0.05,
+                  'pyminesweeper.interface.solver_interface': 0.25,
+                  'pyminesweeper.interface.tournament': 0.25}
+IMPORT_REPEAT = 5
+
+
+def _measure(setup, run, min_time, min_repeat, max_repeat):
+    '''
+        Time run(setup()) repeatedly.
+
+        @Return -- list of times in seconds
+    '''
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_repeat and (len(times) < min_repeat or time.perf_counter() - started < min_time):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _num_mines(rows, cols, density):
+    return min(max(1, int(round(density*rows*cols))), rows*cols - 4)
+
+
+def _zero_or_safe_cell(field):
+    '''
+        A cell whose reveal opens a region (a zero cell) if there is one, else any safe cell.
+    '''
+    if hasattr(field, 'number_grid'):
+        zeros = np.argwhere((field.number_grid == 0) & ~field.mine_mask)
+        if len(zeros):
+            return tuple(int(x) for x in zeros[0])
+        return tuple(int(x) for x in np.argwhere(~field.mine_mask)[0])
+
+    safe = None
+    for r, row in enumerate(field):
+        for c, cell in enumerate(row):
+            if not cell._is_mine:
+                if cell.get_number() == 0:
+                    return r, c
+                safe = safe or (r, c)
+    return safe
+
+
+def _engine_cases(field_type, rows, cols, num_mines):
+    '''
+        (name, setup, run) of the minefield benchmarks for one engine and board.
+    '''
+    def empty():
+        return field_type.create_new(rows, cols, 0)
+
+    def generated():
+        return field_type.create_new(rows, cols, num_mines, seed = 0)
+
+    def initialised():
+        field = generated()
+        field.initialise()
+        return field, _zero_or_safe_cell(field)
+
+    return [('create_new', lambda: None, lambda _: field_type.create_new(rows, cols, num_mines, seed = 0)),
+            ('place_random_mines', empty, lambda field: field._place_random_mines(num_mines, np.random.default_rng(0))),
+            ('initialise', generated, lambda field: field.initialise()),
+            ('reveal_cells', initialised, lambda state: state[0].reveal_cells(*state[1]))]
+
+
+def _gui_frame_times(rows, cols, num_mines, frames):
+    '''
+        Times of 'frames' iterations of the GUI main loop (without the frame-rate clock), on a board with
+        about half of its safe cells revealed. The mouse sweeps over the field, as it would during play.
+    '''
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from pyminesweeper.interface import GUI
+    from pyminesweeper.interface.gui import XMARGIN, YMARGIN
+
+    game = Game(rows, cols, num_mines, end_program_when_game_finishes = False, seed = 0, first_click_safe = True)
+    gui = GUI(game)
+    rng = np.random.default_rng(0)
+    game.play_move(rows//2, cols//2, Game.GameAction.REVEAL)
+    for r, c in rng.permutation([(r, c) for r in range(rows) for c in range(cols)]):
+        if game.minefield.revealed_safe_cells*2 >= game.minefield.safe_cells:
+            break
+        if not game.minefield[r][c]._is_mine:
+            game.play_move(int(r), int(c), Game.GameAction.REVEAL)
+
+    times = []
+    step = gui.BOXSIZE + gui.GAPSIZE
+    for frame in range(frames):
+        position = (XMARGIN + (frame % rows)*step + 1, YMARGIN + (frame % cols)*step + 1)
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos = position, rel = (0, 0), buttons = (0, 0, 0)))
+        start = time.perf_counter()
+        gui._frame()
+        times.append(time.perf_counter() - start)
+
+    pygame.quit() # the next GUI initialises pygame again
+    return times
+
+
+def import_times(module, repeat = IMPORT_REPEAT):
+    '''
+        Times of importing 'module' in 'repeat' fresh interpreters (the interpreter start-up is not included).
+
+        @Return -- list of times in seconds, and whether the import loaded pygame
+
+    '''
+    code = ('import sys, time; start = time.perf_counter(); import %s; '
+            'print(time.perf_counter() - start, "pygame" in sys.modules)')%module
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH = os.pathsep.join([root] + [path for path in [os.environ.get('PYTHONPATH')] if path]))
+
+    times, loads_pygame = [], False
+    for _ in range(repeat):
+        elapsed, pygame_loaded = subprocess.check_output([sys.executable, '-c', code], env = env).decode().split()[-2:]
+        times.append(float(elapsed))
+        loads_pygame = loads_pygame or pygame_loaded == 'True'
+    return times, loads_pygame
+
+
+def check_import_budgets(budgets = IMPORT_BUDGETS, repeat = IMPORT_REPEAT):
+    '''
+        Time the imports of the modules in 'budgets' (dict of module -> seconds allowed).
+
+        @Return -- list of (module, median time, budget, loads pygame), and the modules over budget or loading pygame
+
+    '''
+    rows, failures = [], []
+    for module, budget in budgets.items():
+        times, loads_pygame = import_times(module, repeat)
+        median = float(np.median(times))
+        rows.append((module, median, budget, loads_pygame))
+        if median > budget or loads_pygame:
+            failures.append(module)
+    return rows, failures
+
+
+def _result(name, engine, rows, cols, density, times):
+    return {'name': name, 'engine': engine, 'rows': rows, 'cols': cols, 'density': density,
+            'repeat': len(times), 'best': min(times), 'median': float(np.median(times))}
+
+
+def result_key(result):
+    return '%s/%s/%dx%d/%g'%(result['name'], result['engine'], result['rows'], result['cols'], result['density'])
+
+
+def _metadata():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr = subprocess.DEVNULL,
+                                         cwd = os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'date': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': platform.python_version(),
+            'numpy': np.__version__, 'platform': platform.platform(), 'cpu_count': os.cpu_count()}
+
+
+def run_benchmarks(sizes = SIZES, densities = DENSITIES, engines = ENGINES, gui = True, imports = True,
+                   min_time = 0.2, min_repeat = 3, max_repeat = 1000, verbose = True):
+    '''
+        Run all benchmark cases.
+
+        Args:
+            sizes: sides of the square boards to run
+            densities: fractions of cells holding mines
+            engines: dict of name -> minefield type
+            gui: also time GUI frames (needs pygame; drawn with the dummy video driver)
+            imports: also time the imports of the modules in IMPORT_BUDGETS (as case 'import', the engine being the module)
+            min_time, min_repeat, max_repeat: a case is run at least min_repeat times and until min_time seconds have passed (at most max_repeat times)
+
+        @Return -- dict with 'meta' (commit, versions, ...) and 'results' (one entry per case)
+
+    '''
+    results = []
+
+    def record(result):
+        results.append(result)
+        if verbose:
+            sys.stderr.write('%-60s best %10.3f ms   median %10.3f ms   (%d runs)\n'%(result_key(result), 1e3*result['best'],
+                                                                                 1e3*result['median'], result['repeat']))
+
+    for size in sizes:
+        for density in densities:
+            num_mines = _num_mines(size, size, density)
+            for engine, field_type in engines.items():
+                if field_type is MineField and size*size > MAX_LEGACY_CELLS:
+                    continue
+                for name, setup, run in _engine_cases(field_type, size, size, num_mines):
+                    record(_result(name, engine, size, size, density, _measure(setup, run, min_time, min_repeat, max_repeat)))
+
+    if imports:
+        for module in IMPORT_BUDGETS:
+            record(_result('import', module, 0, 0, 0, import_times(module)[0]))
+
+    if gui:
+        for rows, cols, num_mines in GUI_BOARDS:
+            times = _gui_frame_times(rows, cols, num_mines, GUI_FRAMES)
+            record(_result('gui_frame', 'MineField', rows, cols, num_mines/float(rows*cols), times))
+
+    return {'meta': _metadata(), 'results': results}
+
+
+def save_results(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent = 1)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(base, new, threshold = 0.1, statistic = 'median'):
+    '''
+        Compare two result dicts (as returned by run_benchmarks / load_results), case by case.
+
+        Args:
+            threshold: relative slow-down (new/base - 1) above which a case counts as a regression
+            statistic: 'median' or 'best'
+
+        @Return -- list of (key, base time, new time, ratio new/base) for the cases in both, and the keys of the regressions
+
+    '''
+    base_times = dict((result_key(result), result[statistic]) for result in base['results'])
+    rows, regressions = [], []
+    for result in new['results']:
+        key = result_key(result)
+        if key not in base_times:
+            continue
+        ratio = result[statistic]/max(base_times[key], 1e-12)
+        rows.append((key, base_times[key], result[statistic], ratio))
+        if ratio > 1. + threshold:
+            regressions.append(key)
+    return rows, regressions
+
+
+
+if __name__ == '__main__':
+
+    print(json.dumps(run_benchmarks(sizes = [10, 100], densities = [0.15], gui = False, imports = False, verbose = False), indent = 1))
@@ -1,3 +1,24 @@
-
 from .minefield import Cell, MineField
 from .game import Game
+
+# ----- classes needing NumPy are imported on first access (PEP 562), so that Game on a MineField loads fast
+_LAZY = {'ArrayMineField': 'array_minefield',
+         'EndlessMineField': 'endless_minefield',
+         'BoardPool': 'board_pool',
+         'BatchGame': 'batch_game',
+         'MinesweeperEnv': 'minesweeper_env'}
+
+__all__ = ['Cell', 'MineField', 'Game'] + list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+        value = getattr(import_module('.' + _LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module %r has no attribute %r"%(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,633 @@
+'''
+
+A NumPy array-backed minefield. Mines, neighbour counts, visibility and flags are stored as
+compact arrays instead of one Cell object per cell, while the minefield[row][col] interface
+of MineField (is_visible, is_flagged, get_number(), ...) is kept through light-weight views.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: array_minefield.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import numpy as np
+from pyminesweeper.core.minefield import _check_mine_count, _choose_mine_cells, _corner_cells, _first_click_exclusions, _mine_free_cells, _rng_state, _set_rng_state
+from pyminesweeper.core.tracing import traced
+
+
+def _make_generator(seed):
+    '''
+        Random number generator for mine placement: 'seed' may be None, an int, a NumPy Generator or a random.Random (used as is).
+    '''
+    if seed is None or isinstance(seed, int):
+        return np.random.default_rng(seed)
+    return seed
+
+
+class _ZeroRegions(object):
+    '''
+        Connected-component labelling (8-connectivity) of the zero cells of a board.
+
+        Zero cells are first grouped into runs (horizontal stretches of zero cells within one row). Runs in
+        neighbouring rows that touch are joined with vectorised hooking and pointer jumping, so the work is
+        done per run rather than per cell. Every region keeps the list of its runs, which lets a region and
+        its border be expanded in time proportional to the region size.
+
+    '''
+
+    def __init__(self, zero_mask):
+
+        self.num_rows, self.num_cols = zero_mask.shape
+        index_type = np.int32 if zero_mask.size < 2**31 else np.int64
+
+        # ----- split zero cells into runs; run_ids holds the run of every zero cell and -1 elsewhere
+        starts = zero_mask.copy()
+        starts[:, 1:] &= ~zero_mask[:, :-1]
+        self.run_first = np.flatnonzero(starts).astype(index_type)
+        run_ids = np.cumsum(starts.ravel(), dtype=index_type) - 1
+        run_ids[~zero_mask.ravel()] = -1
+        self.run_ids = run_ids.reshape(zero_mask.shape)
+        num_runs = len(self.run_first)
+        self.run_length = np.bincount(run_ids[run_ids >= 0], minlength=num_runs).astype(index_type)
+
+        # ----- pairs of runs in consecutive rows that touch (vertically or diagonally)
+        sources, targets = [], []
+        for dc in (-1, 0, 1):
+            c0, c1 = max(0, -dc), self.num_cols - max(0, dc)
+            below = self.run_ids[1:, c0:c1]
+            above = self.run_ids[:-1, c0+dc:c1+dc]
+            touching = (below >= 0) & (above >= 0)
+            below, above = below[touching], above[touching]
+            # consecutive cells of a run mostly touch the same run; drop the repeats before hooking
+            keep = np.ones(len(below), dtype=bool)
+            keep[1:] = (below[1:] != below[:-1]) | (above[1:] != above[:-1])
+            sources.append(below[keep])
+            targets.append(above[keep])
+        sources = np.concatenate(sources)
+        targets = np.concatenate(targets)
+
+        # ----- hook larger roots onto smaller ones until every pair of touching runs shares a root
+        parent = np.arange(num_runs, dtype=index_type)
+        while True:
+            root_s, root_t = parent[sources], parent[targets]
+            differ = root_s != root_t
+            if not differ.any():
+                break
+            sources, targets = sources[differ], targets[differ]
+            np.minimum.at(parent, np.maximum(root_s[differ], root_t[differ]), np.minimum(root_s[differ], root_t[differ]))
+            while True:
+                jumped = parent[parent]
+                if np.array_equal(jumped, parent):
+                    break
+                parent = jumped
+
+        roots, self.run_region = np.unique(parent, return_inverse=True)
+        self.region_runs = np.argsort(self.run_region, kind='stable').astype(index_type)
+        self.region_starts = np.zeros(len(roots) + 1, dtype=index_type)
+        np.cumsum(np.bincount(self.run_region, minlength=len(roots)), out=self.region_starts[1:])
+
+    def region_at(self, row, col):
+        '''
+            Region id of the zero cell at [row,col], or -1 if the cell is not a zero cell.
+        '''
+        run = self.run_ids[row, col]
+        return -1 if run < 0 else self.run_region[run]
+
+    def cells_with_border(self, region):
+        '''
+            Flat indices of all cells of the region and of the (non-zero) cells bordering it.
+        '''
+        runs = self.region_runs[self.region_starts[region]:self.region_starts[region+1]]
+        first, length = self.run_first[runs], self.run_length[runs]
+        rows, cols = np.divmod(first, self.num_cols)
+
+        cells = _expand_spans(first, length)
+
+        # ----- border: the cells left and right of each run, and the spans above and below it (one cell wider on each side)
+        span_left = np.maximum(cols - 1, 0)
+        span_length = np.minimum(cols + length + 1, self.num_cols) - span_left
+        border = [rows*self.num_cols + span_left, np.minimum(cols + length, self.num_cols - 1) + rows*self.num_cols]
+        for dr in (-1, 1):
+            inside = (rows + dr >= 0) & (rows + dr < self.num_rows)
+            border.append(_expand_spans((rows[inside] + dr)*self.num_cols + span_left[inside], span_length[inside]))
+        border = np.concatenate(border)
+        border = np.unique(border[self.run_ids.ravel()[border] < 0])
+
+        return np.concatenate([cells, border])
+
+
+def _expand_spans(first, length):
+    '''
+        Flat indices covered by the spans [first[i], first[i]+length[i]).
+    '''
+    total = int(length.sum())
+    offsets = np.arange(total, dtype=first.dtype) - np.repeat(np.cumsum(length) - length, length)
+    return np.repeat(first, length) + offsets
+
+
+class CellView(object):
+    '''
+        A view onto a single cell of an ArrayMineField. Behaves like a Cell, but reads and writes the arrays of the field.
+    '''
+    __slots__ = ('_field', '_row', '_col')
+
+    def __init__(self, field, row, col):
+        self._field = field
+        self._row = row
+        self._col = col
+
+    @property
+    def _is_mine(self):
+        return bool(self._field._mines[self._row, self._col])
+
+    @property
+    def is_visible(self):
+        return bool(self._field._visible[self._row, self._col])
+
+    @is_visible.setter
+    def is_visible(self, value):
+        self._field._visible[self._row, self._col] = value
+
+    @property
+    def is_flagged(self):
+        return bool(self._field._flagged[self._row, self._col])
+
+    @is_flagged.setter
+    def is_flagged(self, value):
+        self._field._flagged[self._row, self._col] = value
+
+    def show(self):
+        '''
+            Reveal the content of the cell. This function merely makes the cell 'visible', and hence its number accessible.
+        '''
+        self.is_visible = True
+        if not self._is_mine:
+            self.is_flagged = False
+
+    def flag(self):
+        if not self.is_visible:
+            self.is_flagged = not self.is_flagged
+
+    def get_number(self):
+        if self.is_visible and not self._is_mine:
+            return int(self._field._numbers[self._row, self._col])
+        else:
+            return None
+
+    def __str__(self):
+        if self.is_flagged:
+            return 'F'
+        if self.is_visible:
+            if self._is_mine:
+                return 'X'
+            else:
+                return str(self.get_number())
+        return ' '
+
+    def __repr__(self):
+
+        return self.__str__()
+
+
+class RowView(object):
+    '''
+        A view onto a row of an ArrayMineField, indexable by column like a row of MineField.
+    '''
+    __slots__ = ('_field', '_row')
+
+    def __init__(self, field, row):
+        self._field = field
+        self._row = row
+
+    def __getitem__(self, col):
+        if col < 0:
+            col += self._field.num_cols
+        if not 0 <= col < self._field.num_cols:
+            raise IndexError("Column index out of range: %d"%col)
+        return CellView(self._field, self._row, col)
+
+    def __len__(self):
+        return self._field.num_cols
+
+    def __iter__(self):
+        return (CellView(self._field, self._row, c) for c in range(self._field.num_cols))
+
+    def __str__(self):
+        return '(' + ', '.join(str(cell) for cell in self) + ')'
+
+    def __repr__(self):
+
+        return self.__str__()
+
+
+class ArrayMineField(object):
+
+    '''
+        Drop-in alternative to MineField for large (and rectangular) boards. The mine, number, visible and
+        flagged arrays take one byte per cell each instead of a Cell object per cell; with the zero-region
+        index computed by initialise(), an initialised board holds about 10 bytes per cell (measured), with
+        a peak of about 20 bytes per cell during initialise(). On a 5000 x 5000 board with 15% mines,
+        create_new() takes about 1 s and initialise() about 2 s on one core.
+
+        The state arrays are exposed read-only through mine_mask, number_grid, visible_mask and flag_mask
+        for vectorised consumers; minefield[row][col] returns a CellView for code written against MineField.
+
+    '''
+
+    def __init__(self, num_rows, num_cols):
+        '''
+            Create a blank grid
+
+        '''
+        assert num_rows > 0 and num_cols > 0, "Invalid size for board. Num of rows: %d, Num of cols: %d"%(num_rows, num_cols)
+
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+        self._mines = np.zeros((num_rows, num_cols), dtype=bool)
+        self._numbers = np.zeros((num_rows, num_cols), dtype=np.int8)
+        self._visible = np.zeros((num_rows, num_cols), dtype=bool)
+        self._flagged = np.zeros((num_rows, num_cols), dtype=bool)
+
+        self._zero_regions = None
+
+        self.revealed_safe_cells = 0
+        self._num_mines = 0
+        self._is_playing = False
+
+        self.seed = None
+        self._rng = None
+        self._pending_mines = 0 # mines whose placement waits for the first click
+        self._safe_neighbourhood = False
+        self._mine_free = set() # cells kept free of mines when they were placed (see mine_free_cells)
+
+        self._journal = None # changes made since the first snapshot(), for restore()
+        self._journal_start = 0 # token of the first change in the journal (changes before it were dropped by commit())
+
+    @property
+    def _mine_locations(self):
+        return np.argwhere(self._mines).tolist()
+
+    def _place_mine_at(self, row, col):
+        if not self._is_playing:
+            if not self._mines[row, col]:
+                self._mines[row, col] = True
+                self._num_mines += 1
+        else:
+            raise Exception("Error: Should not add mine after initialising MineField!")
+
+    @traced('generate')
+    def _place_random_mines(self, num_mines, rng=None, excluded=None):
+        '''
+            Place mines at random cells (never at the corners, or in 'excluded' if given) until there are 'num_mines' mines.
+            Cells are drawn without replacement; for dense boards the cells left free are drawn instead.
+
+        '''
+        if excluded is None:
+            excluded = _corner_cells(self.num_rows, self.num_cols)
+        excluded = np.array(sorted(excluded), dtype=np.int64)
+        flat = self._mines.ravel()
+        if self._num_mines:
+            excluded = np.union1d(excluded, np.flatnonzero(flat))
+        needed = num_mines - self._num_mines
+        if needed <= 0:
+            return
+
+        allowed = flat.size - len(excluded)
+        _check_mine_count(needed, allowed)
+
+        rng = _make_generator(rng)
+        if not hasattr(rng, 'integers'):
+            chosen = np.array(_choose_mine_cells(rng, self.num_rows, self.num_cols, needed, excluded.tolist()), dtype=np.int64)
+        else:
+            to_draw = needed if needed <= allowed//2 else allowed - needed
+            drawn = rng.choice(flat.size, size=min(to_draw + len(excluded), flat.size), replace=False)
+            drawn = drawn[~np.isin(drawn, excluded)][:to_draw]
+            if to_draw == needed:
+                chosen = drawn
+            else:
+                is_free = np.zeros(flat.size, dtype=bool)
+                is_free[excluded] = True
+                is_free[drawn] = True
+                chosen = np.flatnonzero(~is_free)
+
+        flat[chosen] = True
+        self._num_mines += len(chosen)
+        self._mine_free = set(excluded[~flat[excluded]].tolist())
+
+    def _generate_on_first_click(self, row_id, col_id):
+        '''
+            Place the mines deferred by create_new(..., first_click_safe=True) so that [row_id,col_id] (and optionally its neighbourhood) is safe.
+
+        '''
+        placed = set(np.flatnonzero(self._mines).tolist()) if self._num_mines else set()
+        excluded = _first_click_exclusions(self.num_rows, self.num_cols, row_id, col_id, self._num_mines + self._pending_mines, placed, self._safe_neighbourhood)
+
+        if self._journal is not None:
+            placed = np.flatnonzero(self._mines) if self._num_mines else None
+            self._journal.append(('generate', placed, self._num_mines, self._pending_mines, _rng_state(self._rng),
+                                  self._numbers, self._zero_regions))
+        self._place_random_mines(self._num_mines + self._pending_mines, self._rng, excluded)
+        self._pending_mines = 0
+        self._prepare_numbers()
+
+    def _count_all_surrounding(self):
+        '''
+            Number of mines around every cell, computed in one vectorised pass over a padded copy of the mine array.
+        '''
+        padded = np.pad(self._mines, 1).view(np.uint8)
+        counts = np.zeros((self.num_rows, self.num_cols), dtype=np.int8)
+        for dr in range(3):
+            for dc in range(3):
+                if dr == 1 and dc == 1:
+                    continue
+                counts += padded[dr:dr+self.num_rows, dc:dc+self.num_cols]
+        return counts
+
+    def _prepare_numbers(self):
+        self._numbers = self._count_all_surrounding()
+        self._zero_regions = _ZeroRegions((self._numbers == 0) & ~self._mines)
+
+    @traced('initialise')
+    def initialise(self):
+        '''
+            Has to be run before running the game.
+
+        '''
+        total_mines = self._num_mines + self._pending_mines
+        if not self._is_playing and total_mines > 0 and total_mines <= (self.num_rows*self.num_cols - 4):
+            self.safe_cells = self.num_rows*self.num_cols - total_mines
+
+            if not self._pending_mines:
+                self._prepare_numbers()
+
+            self._is_playing = True
+        else:
+            print ("Error while Initialising MineField: Check number of mines!")
+        return self._is_playing
+
+    @traced('reveal_cells', lambda opened: {'cells': len(opened)})
+    def reveal_cells(self, row_id, col_id):
+        '''
+            Reveals the selected cell. If it is safe, and has no mines around it, the whole zero region
+            labelled by initialise() is revealed together with its border, in time proportional to the region size.
+            If the selected cell is a mine, game is over.
+
+            @Return -- (n x 2) int array of the [row,col] pairs of the cells that were revealed by this call
+
+        '''
+        if self._pending_mines and self._is_playing:
+            self._generate_on_first_click(row_id, col_id)
+
+        if self._visible[row_id, col_id]:
+            return np.empty((0, 2), dtype=np.intp)
+
+        if self._mines[row_id, col_id]:
+            if self._journal is not None:
+                self._journal.append(('reveal', np.array([row_id*self.num_cols + col_id]), [], self.revealed_safe_cells))
+            self._visible[row_id, col_id] = True
+            self.stop_play()
+            return np.array([[row_id, col_id]], dtype=np.intp)
+
+        region = self._zero_regions.region_at(row_id, col_id)
+        if region < 0:
+            if self._journal is not None:
+                flat = np.array([row_id*self.num_cols + col_id])
+                self._journal.append(('reveal', flat, flat if self._flagged[row_id, col_id] else [], self.revealed_safe_cells))
+            self._visible[row_id, col_id] = True
+            self._flagged[row_id, col_id] = False
+            self.revealed_safe_cells += 1
+            return np.array([[row_id, col_id]], dtype=np.intp)
+
+        flat = self._zero_regions.cells_with_border(region)
+        visible, flagged = self._visible.ravel(), self._flagged.ravel()
+        flat = flat[~visible[flat]]
+        if self._journal is not None:
+            self._journal.append(('reveal', flat, flat[flagged[flat]], self.revealed_safe_cells))
+        visible[flat] = True
+        flagged[flat] = False
+        self.revealed_safe_cells += len(flat)
+        return np.column_stack(np.divmod(flat, self.num_cols)).astype(np.intp)
+
+    def flag_cell(self, row_id, col_id):
+
+        if not self._visible[row_id, col_id]:
+            if self._journal is not None:
+                self._journal.append(('flag', row_id, col_id))
+            self._flagged[row_id, col_id] = not self._flagged[row_id, col_id]
+
+    def stop_play(self):
+        if self._journal is not None:
+            self._journal.append(('stop', self._is_playing))
+        self._is_playing = False
+
+    def reveal_all(self, only_mines = True):
+
+        if not self._is_playing:
+            if self._journal is not None:
+                self._journal.append(('reveal', np.flatnonzero(self._mines & ~self._visible), [], self.revealed_safe_cells))
+            self._visible |= self._mines
+        else:
+            raise Exception("Cannot reveal all cells when still in play. End game using stop_play() method (of MineField class) if required.")
+
+    @classmethod
+    def create_new(cls, row, col, num_mines, seed=None, first_click_safe=False, safe_neighbourhood=False):
+        '''
+            Creates a 'row' x 'col' grid with 'num_mines' number of mines at random location (except at the corners)
+
+            Args:
+                seed: None, an int, a NumPy Generator or a random.Random used for placing the mines
+                first_click_safe: if True, mines are only placed on the first call to reveal_cells(), away from the revealed cell
+                safe_neighbourhood: with first_click_safe, also keep the neighbours of the first revealed cell free of mines
+
+        '''
+        board = cls(row, col)
+
+        board.seed = seed if isinstance(seed, int) else None
+        if first_click_safe:
+            _check_mine_count(num_mines, row*col - 1) # the first revealed cell is kept free
+            board._rng = _make_generator(seed)
+            board._pending_mines = num_mines
+            board._safe_neighbourhood = safe_neighbourhood
+        else:
+            board._place_random_mines(num_mines, seed)
+
+        return board
+
+    @classmethod
+    def from_mines(cls, mines):
+        '''
+            Creates a grid with mines at the given cells
+
+            Args:
+                mines: (rows x cols) bool array (or nested lists), True where there is a mine
+
+        '''
+        mines = np.asarray(mines, dtype=bool)
+        board = cls(*mines.shape)
+        board._mines[...] = mines
+        board._num_mines = int(np.count_nonzero(mines))
+        return board
+
+    def _restore_state(self, visible, flagged):
+        '''
+            Make the cells visible / flagged as given by the (rows x cols) bool arrays 'visible' and 'flagged'.
+        '''
+        self._visible[...] = visible
+        self._flagged[...] = flagged
+        self.revealed_safe_cells = int(np.count_nonzero(self._visible & ~self._mines))
+
+    def snapshot(self):
+        '''
+            Mark the current state of the board, to go back to with restore(). From the first snapshot on, every
+            change (reveal, flag, end of play, placement of deferred mines) is journaled, so that taking a snapshot
+            is O(1) and restoring costs as much as the cells changed since.
+
+            @Return -- a token for restore(); tokens taken after the state that is restored become invalid
+
+        '''
+        if self._journal is None:
+            self._journal = []
+        return self._journal_start + len(self._journal)
+
+    def restore(self, token):
+        '''
+            Undo every change made since snapshot() returned 'token'. Undoing the first click of a first_click_safe
+            board also takes back its mines (and rewinds the random number generator that placed them).
+        '''
+        if self._journal is None or not 0 <= token - self._journal_start <= len(self._journal):
+            raise Exception("Invalid snapshot token: %s"%str(token))
+        while self._journal_start + len(self._journal) > token:
+            self._undo(self._journal.pop())
+
+    def commit(self, token=None):
+        '''
+            Drop the journal before snapshot() returned 'token', which no snapshot still in use needs: restore() can then
+            only go back to 'token' or later. With no token, the whole journal is dropped and journaling stops until the
+            next snapshot().
+        '''
+        if self._journal is None:
+            return
+        end = self._journal_start + len(self._journal)
+        if token is None:
+            self._journal, self._journal_start = None, end
+            return
+        if not self._journal_start <= token <= end:
+            raise Exception("Invalid snapshot token: %s"%str(token))
+        del self._journal[:token - self._journal_start]
+        self._journal_start = token
+
+    def _undo(self, change):
+        kind = change[0]
+        if kind == 'reveal':
+            _, flat, unflagged, revealed_safe_cells = change
+            self._visible.ravel()[flat] = False
+            self._flagged.ravel()[unflagged] = True
+            self.revealed_safe_cells = revealed_safe_cells
+        elif kind == 'flag':
+            self._flagged[change[1], change[2]] = not self._flagged[change[1], change[2]]
+        elif kind == 'stop':
+            self._is_playing = change[1]
+        elif kind == 'generate':
+            _, placed, self._num_mines, self._pending_mines, rng_state, self._numbers, self._zero_regions = change
+            self._mines[...] = False
+            if placed is not None:
+                self._mines.ravel()[placed] = True
+            _set_rng_state(self._rng, rng_state)
+
+    def save(self, path):
+        '''
+            Write the board (mines, revealed and flagged cells) to a compact binary file. See core/snapshot.py.
+        '''
+        from pyminesweeper.core import snapshot
+        snapshot.save(self, path)
+
+    @classmethod
+    def load(cls, path):
+        '''
+            Read a board written by save() (by either engine) into this engine. The whole board is read into memory;
+            to look at part of a large saved board, use snapshot.BoardSnapshot.
+        '''
+        from pyminesweeper.core import snapshot
+        return snapshot.load(path, cls)[0]
+
+    @property
+    def mine_free_cells(self):
+        '''
+            Cells (flat indices, row*num_cols + col) that the mine placement keeps free of mines, such as the corners.
+            Empty for boards built from given mines (from_mines(), load()).
+        '''
+        return _mine_free_cells(self)
+
+    @property
+    def is_intact(self):
+        return self._is_playing
+
+    @property
+    def revealed_all_safe_cells(self):
+        return self.revealed_safe_cells == self.safe_cells
+
+    @property
+    def mine_mask(self):
+        return self._read_only(self._mines)
+
+    @property
+    def number_grid(self):
+        return self._read_only(self._numbers)
+
+    @property
+    def visible_mask(self):
+        return self._read_only(self._visible)
+
+    @property
+    def flag_mask(self):
+        return self._read_only(self._flagged)
+
+    @staticmethod
+    def _read_only(array):
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.num_rows
+        if not 0 <= row < self.num_rows:
+            raise IndexError("Row index out of range: %d"%row)
+        return RowView(self, row)
+
+    def __iter__(self):
+        return (RowView(self, r) for r in range(self.num_rows))
+
+    def __str__(self):
+        '''
+            To String method: shows minefield row by row, including flags and revealed cells.
+            Flagged cells are marked 'F'
+            Mines are marked 'X'
+
+        '''
+        chars = np.full((self.num_rows, self.num_cols), ' ', dtype='<U1')
+        safe_visible = self._visible & ~self._mines
+        chars[safe_visible] = self._numbers[safe_visible].astype('<U1')
+        chars[self._visible & self._mines] = 'X'
+        chars[self._flagged] = 'F'
+
+        return ''.join('(' + ', '.join(row) + ')\n' for row in chars.tolist())
+
+
+
+if __name__ == '__main__':
+
+
+    field = ArrayMineField.create_new(5,5,5)
+    field.initialise()
+
+    print (field)
+
+    field.reveal_cells(0,0)
+
+    print (field)
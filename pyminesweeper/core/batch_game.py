@@ -0,0 +1,259 @@
+'''
+
+A batched game engine for stepping many games of the same board shape at once. The boards are held
+in stacked NumPy arrays (games x rows x cols), and play_moves() applies one move to every game in a
+single vectorised call, which removes the per-game Python overhead of looping over Game objects.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: batch_game.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import numpy as np
+from pyminesweeper.core import Game
+from pyminesweeper.core.array_minefield import _ZeroRegions
+
+
+class BatchGame(object):
+
+    '''
+        'num_games' games on 'row' x 'col' boards with 'num_mines' mines each (never at the corners, as in MineField).
+
+        Moves are given as arrays of rows, cols and actions (Game.GameAction values, or their int values), one entry per game.
+        Games that finish are reset to a new board automatically (unless auto_reset is False), after their final
+        status, reward and changed cells have been returned.
+
+    '''
+
+    REVEAL = Game.GameAction.REVEAL.value
+    FLAG = Game.GameAction.FLAG.value
+
+    # ----- rewards returned by play_moves()
+    REWARD_WIN = 1.0
+    REWARD_LOSS = -1.0
+    REWARD_PROGRESS = 0.1 # a reveal that opened at least one cell
+    REWARD_NO_PROGRESS = -0.1 # a reveal of an already revealed cell
+    REWARD_FLAG = 0.0
+
+    def __init__(self, num_games, row, col, num_mines, seed = None, first_click_safe = False, safe_neighbourhood = False, auto_reset = True):
+        '''
+            Args:
+                seed: None, an int or a NumPy Generator used for placing the mines of all games
+                first_click_safe: the first revealed cell of every game is never a mine (the board is re-drawn if it would be)
+                safe_neighbourhood: with first_click_safe, also keep the neighbours of the first revealed cell free of mines
+                auto_reset: start a new game on every board whose game has finished
+
+        '''
+        assert num_games > 0, "Invalid number of games: %d"%num_games
+        assert 0 < num_mines <= row*col - 4, "Invalid number of mines: %d"%num_mines
+
+        self.num_games = num_games
+        self.num_rows = row
+        self.num_cols = col
+        self.num_mines = num_mines
+        self.safe_cells = row*col - num_mines
+
+        self._rng = np.random.default_rng(seed) if seed is None or isinstance(seed, int) else seed
+        self._first_click_safe = first_click_safe
+        self._safe_neighbourhood = safe_neighbourhood
+        self._auto_reset = auto_reset
+
+        shape = (num_games, row, col)
+        self._mines = np.zeros(shape, dtype=bool)
+        self._numbers = np.zeros(shape, dtype=np.int8)
+        self._visible = np.zeros(shape, dtype=bool)
+        self._flagged = np.zeros(shape, dtype=bool)
+        self._zero_labels = np.full(shape, -1, dtype=np.int32) # zero region of every zero cell, -1 elsewhere
+        self._revealed = np.zeros(num_games, dtype=np.int64)
+        self._status = np.full(num_games, Game.GameStatus.RUNNING.value, dtype=np.int8)
+        self._fresh = np.ones(num_games, dtype=bool) # no cell revealed yet
+
+        corners = np.zeros((row, col), dtype=bool)
+        corners[[0, 0, -1, -1], [0, -1, 0, -1]] = True
+        self._corners = corners.ravel()
+
+        self.reset()
+
+    def _place_mines(self, games, keep_free = None):
+        '''
+            New random mines on the given boards: every board takes the 'num_mines' cells with the lowest random keys,
+            with the corners (and the cells in 'keep_free', one mask per board) never chosen.
+        '''
+        keys = self._rng.random((len(games), self.num_rows*self.num_cols))
+        keys[:, self._corners] = 2
+        if keep_free is not None:
+            keys[keep_free.reshape(len(games), -1)] = 3
+        chosen = np.argpartition(keys, self.num_mines - 1, axis=1)[:, :self.num_mines]
+
+        mines = np.zeros(keys.shape, dtype=bool)
+        np.put_along_axis(mines, chosen, True, axis=1)
+        self._mines[games] = mines.reshape(len(games), self.num_rows, self.num_cols)
+        self._prepare_numbers(games)
+
+    def _prepare_numbers(self, games):
+        '''
+            Neighbour counts and zero-region labels of the given boards, computed for all of them at once.
+        '''
+        mines = self._mines[games]
+        padded = np.pad(mines, ((0, 0), (1, 1), (1, 1))).view(np.uint8)
+        numbers = np.zeros(mines.shape, dtype=np.int8)
+        for dr in range(3):
+            for dc in range(3):
+                if dr == 1 and dc == 1:
+                    continue
+                numbers += padded[:, dr:dr+self.num_rows, dc:dc+self.num_cols]
+        self._numbers[games] = numbers
+
+        # ----- label all boards as one tall board, with a separating row of non-zero cells below each board
+        zero = np.zeros((len(games), self.num_rows+1, self.num_cols), dtype=bool)
+        zero[:, :-1] = (numbers == 0) & ~mines
+        regions = _ZeroRegions(zero.reshape(-1, self.num_cols))
+        labels = np.where(regions.run_ids >= 0, regions.run_region[regions.run_ids], -1)
+        self._zero_labels[games] = labels.reshape(zero.shape)[:, :-1]
+
+    def reset(self, games = None):
+        '''
+            Start new games on the given boards (all boards if None).
+        '''
+        games = np.arange(self.num_games) if games is None else np.asarray(games)
+        if len(games) == 0:
+            return
+        self._place_mines(games)
+        self._visible[games] = False
+        self._flagged[games] = False
+        self._revealed[games] = 0
+        self._status[games] = Game.GameStatus.RUNNING.value
+        self._fresh[games] = True
+
+    def play_moves(self, rows, cols, actions):
+        '''
+            Play one move in every game: action[i] (REVEAL or FLAG) at [rows[i],cols[i]] of game i.
+            Moves for games that are not running are ignored.
+
+            @Return:
+                status: int8 array of Game.GameStatus values of every game after its move (before any automatic reset)
+                rewards: float array with the reward of every move
+                changed: bool array (games x rows x cols) of the cells whose visibility or flag changed
+
+        '''
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        actions = np.array([getattr(a, 'value', a) for a in actions], dtype=np.int64) if not isinstance(actions, np.ndarray) else actions
+
+        games = np.arange(self.num_games)
+        running = self._status == Game.GameStatus.RUNNING.value
+        hidden = ~self._visible[games, rows, cols]
+
+        rewards = np.zeros(self.num_games)
+        changed = np.zeros(self._visible.shape, dtype=bool)
+
+        # ----- flags
+        flag = np.flatnonzero(running & (actions == self.FLAG) & hidden)
+        self._flagged[flag, rows[flag], cols[flag]] ^= True
+        changed[flag, rows[flag], cols[flag]] = True
+        rewards[flag] = self.REWARD_FLAG
+
+        # ----- reveals of already visible cells
+        rewards[running & (actions == self.REVEAL) & ~hidden] = self.REWARD_NO_PROGRESS
+
+        reveal = np.flatnonzero(running & (actions == self.REVEAL) & hidden)
+        if self._first_click_safe:
+            self._make_first_clicks_safe(reveal[self._fresh[reveal]], rows, cols)
+        self._fresh[reveal] = False
+        r, c = rows[reveal], cols[reveal]
+
+        # ----- mines
+        boom = self._mines[reveal, r, c]
+        lost = reveal[boom]
+        self._visible[lost, rows[lost], cols[lost]] = True
+        changed[lost, rows[lost], cols[lost]] = True
+        self._status[lost] = Game.GameStatus.FAILED.value
+        rewards[lost] = self.REWARD_LOSS
+
+        # ----- safe cells with a number: only the cell itself opens
+        safe, r, c = reveal[~boom], r[~boom], c[~boom]
+        single = self._zero_labels[safe, r, c] < 0
+        opened = safe[single]
+        self._visible[opened, r[single], c[single]] = True
+        self._flagged[opened, r[single], c[single]] = False
+        changed[opened, r[single], c[single]] = True
+        self._revealed[opened] += 1
+
+        # ----- safe zero cells: the whole zero region and its border open
+        flood, r, c = safe[~single], r[~single], c[~single]
+        if len(flood):
+            region = self._zero_labels[flood] == self._zero_labels[flood, r, c][:, None, None]
+            padded = np.pad(region, ((0, 0), (1, 1), (1, 1)))
+            grown = np.zeros(region.shape, dtype=bool)
+            for dr in range(3):
+                for dc in range(3):
+                    grown |= padded[:, dr:dr+self.num_rows, dc:dc+self.num_cols]
+            new = grown & ~self._visible[flood]
+            self._visible[flood] |= new
+            self._flagged[flood] &= ~new
+            changed[flood] |= new
+            self._revealed[flood] += new.sum(axis=(1, 2))
+
+        rewards[safe] = self.REWARD_PROGRESS
+        won = safe[self._revealed[safe] == self.safe_cells]
+        self._status[won] = Game.GameStatus.WON.value
+        rewards[won] = self.REWARD_WIN
+
+        status = self._status.copy()
+        if self._auto_reset:
+            self.reset(np.flatnonzero(status != Game.GameStatus.RUNNING.value))
+
+        return status, rewards, changed
+
+    def _make_first_clicks_safe(self, games, rows, cols):
+        '''
+            Re-draw the boards of 'games' whose first revealed cell would be a mine, keeping that cell (and optionally its neighbours) free.
+        '''
+        games = games[self._mines[games, rows[games], cols[games]] | self._safe_neighbourhood]
+        if len(games) == 0:
+            return
+        keep_free = np.zeros((len(games), self.num_rows, self.num_cols), dtype=bool)
+        keep_free[np.arange(len(games)), rows[games], cols[games]] = True
+        if self._safe_neighbourhood and self.num_rows*self.num_cols - 4 - 9 >= self.num_mines:
+            padded = np.pad(keep_free, ((0, 0), (1, 1), (1, 1)))
+            for dr in range(3):
+                for dc in range(3):
+                    keep_free |= padded[:, dr:dr+self.num_rows, dc:dc+self.num_cols]
+        if self.num_rows*self.num_cols - 4 - keep_free.sum(axis=(1, 2)).max() < self.num_mines:
+            return
+        self._place_mines(games, keep_free)
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def observation(self):
+        '''
+            int8 array (games x rows x cols) of what a player sees: the number of revealed cells, -1 for hidden cells, -2 for flagged cells.
+        '''
+        obs = np.where(self._visible, self._numbers, -1).astype(np.int8)
+        obs[self._visible & self._mines] = -1
+        obs[self._flagged] = -2
+        return obs
+
+    @property
+    def visible_mask(self):
+        return self._visible
+
+    @property
+    def flag_mask(self):
+        return self._flagged
+
+
+
+if __name__ == '__main__':
+
+    batch = BatchGame(4, 9, 9, 10, seed=0)
+
+    status, rewards, changed = batch.play_moves([4, 4, 4, 4], [4, 4, 4, 4], [Game.GameAction.REVEAL]*4)
+
+    print(status, rewards)
+    print(batch.observation[0])
@@ -0,0 +1,266 @@
+'''
+
+Bitboard view of a minefield for whole-board solver queries. Every row of a board state (mines,
+visible, flagged) is one Python int with bit c set for column c, so a query over the whole board is
+a handful of shifts and bitwise operations per row instead of a Python call per cell and neighbour.
+
+Neighbour counts are computed bit-sliced: the count of every cell is held in four bit planes (bits 0
+to 3 of the count), and the eight shifted neighbour boards are added to them with carry chains.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: bitboard.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import numpy as np
+
+NUM_PLANES = 4 # counts 0..8 need four bits
+
+
+def _neighbour_boards(rows, r, full):
+    '''
+        The eight boards whose bit c says whether the corresponding neighbour of [r,c] is set.
+    '''
+    above = rows[r-1] if r > 0 else 0
+    below = rows[r+1] if r+1 < len(rows) else 0
+    this = rows[r]
+    return ((above << 1) & full, above, above >> 1,
+            (this << 1) & full, this >> 1,
+            (below << 1) & full, below, below >> 1)
+
+
+def neighbour_counts(rows, full):
+    '''
+        Number of set neighbours of every cell, bit-sliced.
+
+        Args:
+            rows: list of row bitsets
+            full: bitset with every column set
+
+        @Return -- list of NUM_PLANES lists of row bitsets; bit c of planes[i][r] is bit i of the count of [r,c]
+
+    '''
+    planes = [[0]*len(rows) for _ in range(NUM_PLANES)]
+    for r in range(len(rows)):
+        p0 = p1 = p2 = p3 = 0
+        for x in _neighbour_boards(rows, r, full):
+            carry = p0 & x
+            p0 ^= x
+            x = carry
+            carry = p1 & x
+            p1 ^= x
+            x = carry
+            carry = p2 & x
+            p2 ^= x
+            p3 |= carry # counts never exceed 8, so bit 3 cannot carry further
+        planes[0][r], planes[1][r], planes[2][r], planes[3][r] = p0, p1, p2, p3
+    return planes
+
+
+def dilate(rows, full):
+    '''
+        Cells that are set or have a set neighbour.
+    '''
+    spread = [x | ((x << 1) & full) | (x >> 1) for x in rows]
+    last = len(rows) - 1
+    return [spread[r] | (spread[r-1] if r > 0 else 0) | (spread[r+1] if r < last else 0) for r in range(len(rows))]
+
+
+def count_equals(planes, value, full):
+    '''
+        Cells whose bit-sliced count equals 'value' (an int).
+    '''
+    result = []
+    for r in range(len(planes[0])):
+        match = full
+        for i in range(NUM_PLANES):
+            match &= planes[i][r] if (value >> i) & 1 else ~planes[i][r]
+        result.append(match & full)
+    return result
+
+
+def counts_equal(planes, other_planes, full):
+    '''
+        Cells whose bit-sliced counts are equal in 'planes' and 'other_planes'.
+    '''
+    result = []
+    for r in range(len(planes[0])):
+        differ = 0
+        for i in range(NUM_PLANES):
+            differ |= planes[i][r] ^ other_planes[i][r]
+        result.append(~differ & full)
+    return result
+
+
+def to_array(rows, num_cols):
+    '''
+        bool array (rows x cols) of a list of row bitsets.
+    '''
+    num_bytes = (num_cols + 7)//8
+    packed = np.frombuffer(b''.join(x.to_bytes(num_bytes, 'little') for x in rows), dtype=np.uint8)
+    return np.unpackbits(packed.reshape(len(rows), num_bytes), axis=1, count=num_cols, bitorder='little').astype(bool)
+
+
+def from_array(mask):
+    '''
+        List of row bitsets of a bool array.
+    '''
+    packed = np.packbits(np.asarray(mask, dtype=bool), axis=1, bitorder='little')
+    return [int.from_bytes(row.tobytes(), 'little') for row in packed]
+
+
+def cells(rows):
+    '''
+        [row,col] pairs of the set cells, row by row.
+    '''
+    for r, x in enumerate(rows):
+        while x:
+            low = x & -x
+            yield r, low.bit_length() - 1
+            x ^= low
+
+
+def population(rows):
+    return sum(bin(x).count('1') for x in rows)
+
+
+class BitBoard(object):
+
+    '''
+        Mines, visible and flagged cells of a board as lists of row bitsets (bit c of row r is cell [r,c]).
+
+        Build it with BitBoard.from_minefield() and keep it up to date with reveal() / flag() (e.g. from
+        Game.last_revealed), or rebuild it. The numbers of the revealed cells are derived from the mines with
+        neighbour_counts(); queries only ever look at the numbers of visible cells.
+
+    '''
+
+    def __init__(self, num_rows, num_cols, mines = None, visible = None, flagged = None):
+
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.full = (1 << num_cols) - 1
+
+        self.mines = list(mines) if mines is not None else [0]*num_rows
+        self.visible = list(visible) if visible is not None else [0]*num_rows
+        self.flagged = list(flagged) if flagged is not None else [0]*num_rows
+
+        self._number_planes = None # neighbour counts of the mines, computed on first use
+
+    @classmethod
+    def from_minefield(cls, minefield):
+        '''
+            Bitboard of the current state of a MineField or ArrayMineField.
+        '''
+        num_rows, num_cols = minefield.num_rows, minefield.num_cols
+        if hasattr(minefield, 'mine_mask'):
+            return cls(num_rows, num_cols, from_array(minefield.mine_mask), from_array(minefield.visible_mask), from_array(minefield.flag_mask))
+
+        board = cls(num_rows, num_cols)
+        for r, row in enumerate(minefield):
+            for c, cell in enumerate(row):
+                bit = 1 << c
+                if cell._is_mine:
+                    board.mines[r] |= bit
+                if cell.is_visible:
+                    board.visible[r] |= bit
+                if cell.is_flagged:
+                    board.flagged[r] |= bit
+        return board
+
+    def reveal(self, revealed):
+        '''
+            Mark the [row,col] pairs in 'revealed' (e.g. Game.last_revealed) visible and unflagged.
+        '''
+        for r, c in revealed:
+            bit = 1 << int(c)
+            self.visible[int(r)] |= bit
+            self.flagged[int(r)] &= ~bit
+
+    def flag(self, row, col):
+        '''
+            Toggle the flag of a hidden cell.
+        '''
+        if not (self.visible[row] >> col) & 1:
+            self.flagged[row] ^= 1 << col
+
+    @property
+    def hidden(self):
+        return [~x & self.full for x in self.visible]
+
+    @property
+    def number_planes(self):
+        '''
+            Bit-sliced neighbour mine counts of every cell (see neighbour_counts). Only meaningful for visible cells.
+        '''
+        if self._number_planes is None:
+            self._number_planes = neighbour_counts(self.mines, self.full)
+        return self._number_planes
+
+    def revealed_numbers(self):
+        '''
+            Visible safe cells with a number above zero.
+        '''
+        zero = count_equals(self.number_planes, 0, self.full)
+        return [v & ~m & ~z for v, m, z in zip(self.visible, self.mines, zero)]
+
+    def frontier(self):
+        '''
+            Hidden cells next to a revealed number.
+        '''
+        near_numbers = dilate(self.revealed_numbers(), self.full)
+        return [n & ~v & self.full for n, v in zip(near_numbers, self.visible)]
+
+    def numbers_with_hidden_neighbours(self):
+        '''
+            Revealed numbers that still have at least one hidden neighbour.
+        '''
+        near_hidden = dilate(self.hidden, self.full)
+        return [n & h for n, h in zip(self.revealed_numbers(), near_hidden)]
+
+    def hidden_neighbour_counts(self):
+        '''
+            Bit-sliced number of hidden neighbours of every cell.
+        '''
+        return neighbour_counts(self.hidden, self.full)
+
+    def flag_neighbour_counts(self):
+        '''
+            Bit-sliced number of flagged neighbours of every cell.
+        '''
+        return neighbour_counts(self.flagged, self.full)
+
+    def satisfied_numbers(self):
+        '''
+            Revealed numbers with as many flagged neighbours as their number: their other hidden neighbours
+            are safe if the flags are right (the cells a "chord" would open).
+        '''
+        equal = counts_equal(self.flag_neighbour_counts(), self.number_planes, self.full)
+        return [n & e for n, e in zip(self.revealed_numbers(), equal)]
+
+    def saturated_numbers(self):
+        '''
+            Revealed numbers with exactly as many hidden neighbours as their number: all of those are mines.
+        '''
+        equal = counts_equal(self.hidden_neighbour_counts(), self.number_planes, self.full)
+        return [n & e for n, e in zip(self.revealed_numbers(), equal)]
+
+    def to_array(self, rows):
+        return to_array(rows, self.num_cols)
+
+
+
+if __name__ == '__main__':
+
+    from pyminesweeper.core import ArrayMineField
+
+    field = ArrayMineField.create_new(9, 9, 10, seed = 1, first_click_safe = True)
+    field.initialise()
+    field.reveal_cells(4, 4)
+
+    board = BitBoard.from_minefield(field)
+    print(field)
+    print("Frontier:\n%s"%board.to_array(board.frontier()).astype(int))
+    print("Numbers whose hidden neighbours are all mines: %s"%list(cells(board.saturated_numbers())))
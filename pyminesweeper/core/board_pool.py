@@ -0,0 +1,129 @@
+'''
+
+A pool of boards generated ahead of time: a background thread creates and initialises minefields of one
+configuration into a bounded queue, so that starting a new game (e.g. resetting the GUI after a win or a
+loss) only takes a ready board instead of placing the mines and counting the numbers on the spot.
+
+    pool = BoardPool(16, 30, 99, seed = 7)
+    game = pool.new_game()      # or Game(16, 30, 99, False, minefield = pool.get())
+
+Every board gets its own int seed (stored as its 'seed', so saved games and move logs can reproduce it),
+drawn in order from the pool's seed: a pool with the same seed hands out the same sequence of boards.
+
+A thread rather than a process: the boards are Python objects that would have to be copied back from a
+worker process, and generation mostly runs while the player is thinking. The pool makes ArrayMineField
+boards by default, whose generation runs mostly in NumPy with the GIL released, so it overlaps with the
+GUI or bot thread. MineField boards are generated in pure Python, which competes with that thread for
+the GIL, so a pool of them only helps when the foreground thread is idle (waiting for input).
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: board_pool.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import queue
+import random
+import threading
+
+from pyminesweeper.core.array_minefield import ArrayMineField
+from pyminesweeper.core.game import Game
+
+
+class BoardPool(object):
+
+    def __init__(self, row, col, num_mines, size = 2, field_type = ArrayMineField, seed = None,
+                 first_click_safe = False, safe_neighbourhood = False):
+        '''
+            Args:
+                size: number of ready boards kept at most (generation pauses while the pool is full)
+                field_type: engine of the boards: ArrayMineField (generated alongside the foreground thread) or MineField (competes with it for the GIL)
+                seed: None or an int; the seeds of the boards are drawn from it
+                first_click_safe, safe_neighbourhood: as for Game
+
+        '''
+        self.field_info = [row, col, num_mines]
+        self._field_type = field_type
+        self._options = {'first_click_safe': first_click_safe, 'safe_neighbourhood': safe_neighbourhood}
+        self._seeds = random.Random(seed)
+
+        self._queue = queue.Queue(maxsize = size)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target = self._generate, name = 'BoardPool', daemon = True)
+        self._thread.start()
+
+    def _generate(self):
+
+        row, col, num_mines = self.field_info
+        while not self._stopped.is_set():
+            try:
+                board = self._field_type.create_new(row, col, num_mines, seed = self._seeds.getrandbits(63), **self._options)
+                if not board.initialise():
+                    raise Exception("Cannot generate a %d x %d board with %d mines"%(row, col, num_mines))
+            except Exception as e:
+                board = e # handed to get(), which raises it
+
+            while not self._stopped.is_set():
+                try:
+                    self._queue.put(board, timeout = 0.1)
+                    break
+                except queue.Full:
+                    pass
+            if isinstance(board, Exception):
+                return
+
+    def get(self, timeout = None):
+        '''
+            Next board of the pool, initialised (waits until one is ready if the pool is empty).
+
+            @Return -- the ArrayMineField (or MineField)
+
+        '''
+        if self._stopped.is_set():
+            raise Exception("BoardPool is closed")
+        board = self._queue.get(timeout = timeout)
+        if isinstance(board, Exception):
+            self._queue.put(board) # every later get() fails the same way
+            raise board
+        return board
+
+    def new_game(self, end_program_when_game_finishes = False):
+        '''
+            A Game on the next board of the pool (not started yet).
+        '''
+        row, col, num_mines = self.field_info
+        return Game(row, col, num_mines, end_program_when_game_finishes, minefield = self.get())
+
+    @property
+    def num_ready(self):
+        return self._queue.qsize()
+
+    def close(self):
+        '''
+            Stop generating boards.
+        '''
+        self._stopped.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+
+if __name__ == '__main__':
+
+    import time
+
+    pool = BoardPool(300, 300, 18000, size = 4, seed = 1)
+    time.sleep(5.)
+    for _ in range(4):
+        start = time.perf_counter()
+        game = pool.new_game()
+        game.start_game()
+        print("New 300 x 300 game ready in %.2f ms (seed %d)"%(1e3*(time.perf_counter() - start), game.minefield.seed))
+    pool.close()
@@ -0,0 +1,196 @@
+'''
+
+A deterministic constraint-propagation solver. Every revealed number gives a constraint "this many
+mines among these unknown neighbours"; the single-cell rule (no mines left / as many mines as cells)
+and the subset rule (for constraints A within B, B minus A holds B's count minus A's count) find safe
+cells and certain mines.
+
+The constraint set is kept up to date incrementally: the solver is told which cells were revealed, and
+only the constraints touching those cells (and the constraints overlapping them) are re-examined.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: constraint_solver.py
+    @package: pyminesweeper v0.9
+
+'''
+
+from collections import deque
+
+
+class ConstraintSolver(object):
+
+    '''
+        Cells are addressed by flat index (row*num_cols + col) internally; the public methods take [row,col].
+
+    '''
+
+    def __init__(self, num_rows, num_cols):
+
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+        self.revealed = set()
+        self.mines = set() # cells proven to be mines
+        self.safe = set() # cells proven safe, not revealed yet
+
+        self._safe_queue = deque()
+        self._mine_queue = deque()
+
+        self._constraints = {} # revealed cell -> [set of unknown neighbours, number of mines among them]
+        self._constraints_of = {} # unknown cell -> set of revealed cells whose constraint contains it
+        self._dirty = deque()
+        self._is_dirty = set()
+
+    def _neighbours(self, cell):
+        row, col = divmod(cell, self.num_cols)
+        return [r*self.num_cols + c for r in range(max(row-1, 0), min(row+2, self.num_rows))
+                                    for c in range(max(col-1, 0), min(col+2, self.num_cols))
+                                    if r != row or c != col]
+
+    def _mark_dirty(self, owner):
+        if owner not in self._is_dirty:
+            self._is_dirty.add(owner)
+            self._dirty.append(owner)
+
+    def _remove_unknown(self, cell, is_mine):
+        '''
+            'cell' is no longer unknown: drop it from every constraint containing it.
+        '''
+        for owner in self._constraints_of.pop(cell, ()):
+            constraint = self._constraints[owner]
+            constraint[0].discard(cell)
+            if is_mine:
+                constraint[1] -= 1
+            self._mark_dirty(owner)
+
+    def _set_safe(self, cell):
+        if cell not in self.safe and cell not in self.revealed:
+            self.safe.add(cell)
+            self._safe_queue.append(cell)
+            self._remove_unknown(cell, False)
+
+    def _set_mine(self, cell):
+        if cell not in self.mines:
+            self.mines.add(cell)
+            self._mine_queue.append(cell)
+            self._remove_unknown(cell, True)
+
+    def add_revealed(self, cells):
+        '''
+            Tell the solver about newly revealed safe cells.
+
+            Args:
+                cells: iterable of (row, col, number) triples
+
+        '''
+        for row, col, number in cells:
+            cell = row*self.num_cols + col
+            if cell in self.revealed:
+                continue
+            self.revealed.add(cell)
+            self.safe.discard(cell)
+            self._remove_unknown(cell, False)
+
+            unknown, remaining = set(), number
+            for neighbour in self._neighbours(cell):
+                if neighbour in self.mines:
+                    remaining -= 1
+                elif neighbour not in self.revealed and neighbour not in self.safe:
+                    unknown.add(neighbour)
+            self._constraints[cell] = [unknown, remaining]
+            for neighbour in unknown:
+                self._constraints_of.setdefault(neighbour, set()).add(cell)
+            self._mark_dirty(cell)
+
+        self._propagate()
+
+    def _propagate(self):
+        while self._dirty:
+            owner = self._dirty.popleft()
+            self._is_dirty.discard(owner)
+            constraint = self._constraints.get(owner)
+            if constraint is None:
+                continue
+            unknown, remaining = constraint
+
+            # ----- single-cell rule
+            if not unknown:
+                del self._constraints[owner]
+                continue
+            if remaining == 0:
+                for cell in list(unknown):
+                    self._set_safe(cell)
+                continue
+            if remaining == len(unknown):
+                for cell in list(unknown):
+                    self._set_mine(cell)
+                continue
+
+            # ----- subset rule, against the constraints sharing a cell with this one
+            others = set()
+            for cell in unknown:
+                others.update(self._constraints_of.get(cell, ()))
+            others.discard(owner)
+            for other in others:
+                other_constraint = self._constraints.get(other)
+                if other_constraint is None:
+                    continue
+                other_unknown, other_remaining = other_constraint
+                if unknown <= other_unknown:
+                    small, small_remaining, large, large_remaining = unknown, remaining, other_unknown, other_remaining
+                elif other_unknown <= unknown:
+                    small, small_remaining, large, large_remaining = other_unknown, other_remaining, unknown, remaining
+                else:
+                    continue
+                difference = large - small
+                if not difference:
+                    continue
+                if large_remaining == small_remaining:
+                    for cell in difference:
+                        self._set_safe(cell)
+                elif large_remaining - small_remaining == len(difference):
+                    for cell in difference:
+                        self._set_mine(cell)
+                else:
+                    continue
+                # this constraint changed; look at it again once the others are done
+                if owner in self._constraints:
+                    self._mark_dirty(owner)
+                break
+
+    def next_safe_cell(self):
+        '''
+            A cell proven safe and not revealed yet, as (row, col), or None.
+        '''
+        while self._safe_queue:
+            cell = self._safe_queue.popleft()
+            if cell not in self.revealed:
+                return divmod(cell, self.num_cols)
+        return None
+
+    def next_mine(self):
+        '''
+            A cell proven to be a mine that has not been handed out yet, as (row, col), or None.
+        '''
+        if self._mine_queue:
+            return divmod(self._mine_queue.popleft(), self.num_cols)
+        return None
+
+    def is_known(self, row, col):
+        '''
+            Whether the cell at [row,col] is revealed, proven safe or proven a mine.
+        '''
+        cell = row*self.num_cols + col
+        return cell in self.revealed or cell in self.safe or cell in self.mines
+
+
+
+if __name__ == '__main__':
+
+    # 1 1 .
+    # . . .      -> the cells of the bottom row are decided by the numbers above
+    solver = ConstraintSolver(2, 3)
+    solver.add_revealed([(0, 0, 1), (0, 1, 1), (0, 2, 0)])
+
+    print(solver.next_safe_cell(), solver.next_mine())
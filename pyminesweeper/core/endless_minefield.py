@@ -0,0 +1,403 @@
+'''
+
+An unbounded ('endless') minefield. The board is split into square chunks whose mines are generated
+deterministically from a seed and the chunk coordinates, so any chunk can be dropped and regenerated.
+Neighbour counts are only computed for chunks that reveal_cells() touches, and chunks are kept in an
+LRU cache: untouched or finished chunks are regenerated on demand, other evicted chunks have their
+(bit-packed) visibility and flags spilled to memory and, beyond a bounded number, to disk.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: endless_minefield.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import os
+import tempfile
+from collections import OrderedDict, deque
+
+import numpy as np
+
+
+def _zigzag(n):
+    '''
+        Map an int of any sign to a non-negative int (0, -1, 1, -2, ... -> 0, 1, 2, 3, ...), for seeding.
+    '''
+    return 2*n if n >= 0 else -2*n - 1
+
+
+class _Chunk(object):
+    __slots__ = ('mines', 'numbers', 'visible', 'flagged')
+
+    def __init__(self, mines):
+        self.mines = mines
+        self.numbers = None # computed when a reveal first touches the chunk
+        self.visible = np.zeros(mines.shape, dtype=bool)
+        self.flagged = np.zeros(mines.shape, dtype=bool)
+
+    @property
+    def is_untouched(self):
+        return not (self.visible.any() or self.flagged.any())
+
+    @property
+    def is_finished(self):
+        '''
+            All safe cells of the chunk are revealed (so its visibility can be regenerated from the mines).
+        '''
+        return np.array_equal(self.visible, ~self.mines)
+
+
+class EndlessCell(object):
+    '''
+        Read-only view of a cell of an EndlessMineField, with the same accessors as Cell.
+    '''
+    __slots__ = ('_field', '_row', '_col')
+
+    def __init__(self, field, row, col):
+        self._field = field
+        self._row = row
+        self._col = col
+
+    def _lookup(self):
+        return self._field._locate(self._row, self._col)
+
+    @property
+    def _is_mine(self):
+        chunk, r, c = self._lookup()
+        return bool(chunk.mines[r, c])
+
+    @property
+    def is_visible(self):
+        chunk, r, c = self._lookup()
+        return bool(chunk.visible[r, c])
+
+    @property
+    def is_flagged(self):
+        chunk, r, c = self._lookup()
+        return bool(chunk.flagged[r, c])
+
+    def get_number(self):
+        chunk, r, c = self._lookup()
+        if chunk.visible[r, c] and not chunk.mines[r, c]:
+            return int(chunk.numbers[r, c])
+        return None
+
+    def __str__(self):
+        chunk, r, c = self._lookup()
+        if chunk.flagged[r, c]:
+            return 'F'
+        if chunk.visible[r, c]:
+            return 'X' if chunk.mines[r, c] else str(chunk.numbers[r, c])
+        return ' '
+
+    def __repr__(self):
+
+        return self.__str__()
+
+
+class EndlessRow(object):
+    __slots__ = ('_field', '_row')
+
+    def __init__(self, field, row):
+        self._field = field
+        self._row = row
+
+    def __getitem__(self, col):
+        return EndlessCell(self._field, self._row, col)
+
+
+class EndlessMineField(object):
+
+    '''
+        A minefield without edges. Cells are addressed by any (possibly negative) integer row and col,
+        and field[row][col] gives read-only cell views like MineField does.
+
+        Each cached chunk costs 4 bytes per cell; at most 'max_chunks' chunks are cached, also while cells
+        are only being looked at. Evicted chunks that were played on cost 2 bits per cell, in memory for the
+        'max_spilled' most recently evicted ones and on disk for the others, except finished chunks without
+        flags, which are regenerated from the seed.
+
+    '''
+
+    def __init__(self, density=0.15, seed=None, chunk_size=64, max_chunks=256, spill_dir=None, max_spilled=1024, reveal_limit=100000, safe_start=True):
+        '''
+            Args:
+                density: probability of a cell being a mine
+                seed: non-negative int; the same seed always gives the same board
+                chunk_size: number of cells on a side of a chunk
+                max_chunks: number of chunks kept in the LRU cache
+                spill_dir: directory to spill the state of evicted chunks to (a temporary directory, created when first needed, if None)
+                max_spilled: number of evicted chunk states kept in memory (bit-packed) before they are spilled to disk
+                reveal_limit: maximum number of cells opened by one reveal_cells() call (zero regions can be unbounded on sparse boards)
+                safe_start: keep the 3 x 3 cells around [0,0] free of mines
+
+        '''
+        assert 0 < density < 1, "Invalid mine density: %s"%density
+        assert chunk_size > 2 and max_chunks > 9, "Chunks should have more than 2 cells on a side and the cache should hold more than 9 chunks"
+
+        self.density = density
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy % 2**63)
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.reveal_limit = reveal_limit
+        self._safe_start = safe_start
+
+        self._spill_dir = spill_dir
+        self._temporary_dir = None # created for spilling to disk if no spill_dir was given
+        if spill_dir is not None and not os.path.isdir(spill_dir):
+            os.makedirs(spill_dir)
+        self.max_spilled = max_spilled
+
+        self._chunks = OrderedDict()
+        self._spilled = OrderedDict() # (chunk_row, chunk_col) -> packed (visible, flagged) of evicted chunks, oldest first
+        self._on_disk = set() # evicted chunks whose state was spilled to disk
+        self._finished = set() # evicted chunks that were completely revealed and had no flags
+        self._pending = deque() # revealed cells whose neighbours are still to be opened (cut off by reveal_limit)
+
+        self.revealed_safe_cells = 0
+        self._is_playing = False
+
+    def _generate_mines(self, chunk_row, chunk_col):
+        rng = np.random.default_rng([self.seed, _zigzag(chunk_row), _zigzag(chunk_col)])
+        mines = rng.random((self.chunk_size, self.chunk_size)) < self.density
+        if self._safe_start and chunk_row in (-1, 0) and chunk_col in (-1, 0):
+            for r in (-1, 0, 1):
+                for c in (-1, 0, 1):
+                    if r // self.chunk_size == chunk_row and c // self.chunk_size == chunk_col:
+                        mines[r % self.chunk_size, c % self.chunk_size] = False
+        return mines
+
+    def _mines_of(self, chunk_row, chunk_col):
+        '''
+            Mines of a chunk, taken from the cache if present (without touching the LRU order).
+        '''
+        chunk = self._chunks.get((chunk_row, chunk_col))
+        return chunk.mines if chunk is not None else self._generate_mines(chunk_row, chunk_col)
+
+    def _chunk(self, chunk_row, chunk_col):
+        key = (chunk_row, chunk_col)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        chunk = _Chunk(self._generate_mines(chunk_row, chunk_col))
+        if key in self._finished:
+            chunk.visible = ~chunk.mines
+        elif key in self._spilled or key in self._on_disk:
+            chunk.visible, chunk.flagged = self._load_spilled(key)
+        if chunk.visible.any():
+            self._count_surrounding(chunk_row, chunk_col, chunk)
+        self._chunks[key] = chunk
+        self._evict()
+        return chunk
+
+    def _count_surrounding(self, chunk_row, chunk_col, chunk):
+        '''
+            Neighbour counts of a chunk, from its mines padded with the bordering rows/cols of the 8 surrounding chunks.
+        '''
+        size = self.chunk_size
+        padded = np.zeros((size+2, size+2), dtype=np.uint8)
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                mines = chunk.mines if dr == dc == 0 else self._mines_of(chunk_row+dr, chunk_col+dc)
+                src_rows = slice(size-1, size) if dr < 0 else (slice(0, 1) if dr > 0 else slice(0, size))
+                src_cols = slice(size-1, size) if dc < 0 else (slice(0, 1) if dc > 0 else slice(0, size))
+                dst_rows = slice(0, 1) if dr < 0 else (slice(size+1, size+2) if dr > 0 else slice(1, size+1))
+                dst_cols = slice(0, 1) if dc < 0 else (slice(size+1, size+2) if dc > 0 else slice(1, size+1))
+                padded[dst_rows, dst_cols] = mines[src_rows, src_cols]
+
+        numbers = np.zeros((size, size), dtype=np.int8)
+        for dr in range(3):
+            for dc in range(3):
+                if dr == 1 and dc == 1:
+                    continue
+                numbers += padded[dr:dr+size, dc:dc+size]
+        chunk.numbers = numbers
+
+    def _locate(self, row, col):
+        '''
+            The chunk holding the cell at [row,col], and the cell's position inside it. Neighbour counts are only
+            there if a cell of the chunk was revealed.
+        '''
+        chunk_row, r = divmod(row, self.chunk_size)
+        chunk_col, c = divmod(col, self.chunk_size)
+        return self._chunk(chunk_row, chunk_col), r, c
+
+    def _locate_numbered(self, row, col):
+        '''
+            As _locate(), computing the neighbour counts of the chunk if needed (for revealing the cell).
+        '''
+        chunk, r, c = self._locate(row, col)
+        if chunk.numbers is None:
+            self._count_surrounding(row // self.chunk_size, col // self.chunk_size, chunk)
+        return chunk, r, c
+
+    def _spill_path(self, key):
+        if self._spill_dir is None:
+            self._temporary_dir = tempfile.TemporaryDirectory(prefix='pyminesweeper-') # removed with the field
+            self._spill_dir = self._temporary_dir.name
+        return os.path.join(self._spill_dir, 'chunk_%d_%d.npz'%key)
+
+    def _load_spilled(self, key):
+        '''
+            Visibility and flags of an evicted chunk (taken out of the spilled states: the chunk is cached again).
+        '''
+        if key in self._spilled:
+            packed = self._spilled.pop(key)
+        else:
+            path = self._spill_path(key)
+            with np.load(path) as data:
+                packed = data['visible'], data['flagged']
+            os.remove(path)
+            self._on_disk.discard(key)
+        shape = (self.chunk_size, self.chunk_size)
+        return tuple(np.unpackbits(bits, count=shape[0]*shape[1]).reshape(shape).astype(bool) for bits in packed)
+
+    def _evict(self):
+        '''
+            Drop least recently used chunks until the cache holds at most max_chunks chunks, and move the oldest
+            spilled states to disk until at most max_spilled are kept in memory.
+        '''
+        while len(self._chunks) > self.max_chunks:
+            key, chunk = self._chunks.popitem(last=False)
+            if chunk.is_untouched:
+                continue
+            if chunk.is_finished and not chunk.flagged.any():
+                self._finished.add(key)
+                continue
+            self._finished.discard(key)
+            self._spilled[key] = np.packbits(chunk.visible), np.packbits(chunk.flagged)
+
+        while len(self._spilled) > self.max_spilled:
+            key, packed = self._spilled.popitem(last=False)
+            np.savez(self._spill_path(key), visible=packed[0], flagged=packed[1])
+            self._on_disk.add(key)
+
+    def initialise(self):
+        '''
+            Has to be run before running the game. Nothing is generated up front.
+
+        '''
+        if not self._is_playing:
+            self._is_playing = True
+        return self._is_playing
+
+    def reveal_cells(self, row_id, col_id):
+        '''
+            Reveals the selected cell. If it is safe, and has no mines around it, adjacent cells are revealed (explicit queue,
+            at most reveal_limit cells per call). If the selected cell is a mine, game is over. Zero cells whose neighbours
+            were not opened because of reveal_limit are kept, and opened by the next call (or by continue_reveal()).
+
+            @Return -- list of [row,col] pairs of the cells that were revealed by this call
+
+        '''
+        chunk, r, c = self._locate_numbered(row_id, col_id)
+        if chunk.visible[r, c]:
+            return self.continue_reveal()
+
+        chunk.visible[r, c] = True
+        chunk.flagged[r, c] = False
+        if chunk.mines[r, c]:
+            self.stop_play()
+            return [(row_id, col_id)]
+
+        self.revealed_safe_cells += 1
+        self._pending.appendleft((row_id, col_id))
+        return self._expand([(row_id, col_id)])
+
+    def continue_reveal(self):
+        '''
+            Open the neighbours of the zero cells left over by a reveal_cells() call that reached reveal_limit (up to
+            reveal_limit more cells).
+
+            @Return -- list of [row,col] pairs of the cells that were revealed by this call
+
+        '''
+        return self._expand([])
+
+    @property
+    def has_pending_reveal(self):
+        '''
+            True if a reveal_cells() call stopped at reveal_limit and left cells to open (see continue_reveal()).
+        '''
+        return bool(self._pending)
+
+    def _expand(self, opened):
+        '''
+            Open the neighbours of the zero cells in self._pending (revealed cells whose neighbours may be hidden),
+            until it is empty or 'opened' holds reveal_limit cells.
+
+            @Return -- 'opened', with the cells revealed appended
+
+        '''
+        # ----- the queue holds cell coordinates, not chunks: a chunk may be evicted (and reloaded) while the region opens
+        queue = self._pending
+        num_opened = len(opened)
+        while queue and len(opened) < self.reveal_limit:
+            row, col = queue.popleft()
+            chunk, r, c = self._locate_numbered(row, col)
+            if chunk.numbers[r, c] != 0:
+                continue
+            for surr_row, surr_col in ((row-1, col-1), (row-1, col), (row-1, col+1), (row, col-1),
+                                       (row, col+1), (row+1, col-1), (row+1, col), (row+1, col+1)):
+                neighbour, nr, nc = self._locate(surr_row, surr_col)
+                if neighbour.visible[nr, nc]:
+                    continue
+                if len(opened) == self.reveal_limit:
+                    queue.appendleft((row, col)) # not all its neighbours are open: left for the next call
+                    break
+                neighbour, nr, nc = self._locate_numbered(surr_row, surr_col)
+                neighbour.visible[nr, nc] = True
+                neighbour.flagged[nr, nc] = False
+                opened.append((surr_row, surr_col))
+                queue.append((surr_row, surr_col))
+
+        self.revealed_safe_cells += len(opened) - num_opened
+        return opened
+
+    def flag_cell(self, row_id, col_id):
+
+        chunk, r, c = self._locate(row_id, col_id)
+        if not chunk.visible[r, c]:
+            chunk.flagged[r, c] = not chunk.flagged[r, c]
+
+    def stop_play(self):
+        self._is_playing = False
+
+    @property
+    def is_intact(self):
+        return self._is_playing
+
+    @property
+    def num_cached_chunks(self):
+        return len(self._chunks)
+
+    def __getitem__(self, row):
+        return EndlessRow(self, row)
+
+    def window(self, top, left, num_rows, num_cols):
+        '''
+            String of the 'num_rows' x 'num_cols' part of the field with top-left cell [top,left], in the format of MineField.__str__.
+
+        '''
+        retval = ''
+        for row in range(top, top+num_rows):
+            retval += '(' + ', '.join(str(self[row][col]) for col in range(left, left+num_cols)) + ')\n'
+        return retval
+
+    def __str__(self):
+        return self.window(-10, -10, 21, 21)
+
+
+
+if __name__ == '__main__':
+
+
+    field = EndlessMineField(density=0.1, seed=0)
+    field.initialise()
+
+    field.reveal_cells(0,0)
+
+    print (field)
@@ -13,6 +13,7 @@ The Game class for solving an instance of Minefield. The interface class can be
 
 import sys
 from pyminesweeper.core import MineField
+from pyminesweeper.core.tracing import traced
 from enum import Enum, unique
 
 class Game:
@@ -29,11 +30,33 @@ class Game:
         FAILED = -1
         WON = 2
 
-    def __init__(self, row, col, num_mines, end_program_when_game_finishes = True):
+    def __init__(self, row, col, num_mines, end_program_when_game_finishes = True, field_type = MineField,
+                 seed = None, first_click_safe = False, safe_neighbourhood = False, minefield = None, undo = False, max_undo = None):
+        '''
+            Args:
+                field_type: the minefield engine to play on; MineField (default) or ArrayMineField for large boards
+                seed: None, an int, a random.Random or a NumPy Generator used for placing the mines
+                first_click_safe: place the mines only when the first cell is revealed, so that it is never a mine
+                safe_neighbourhood: with first_click_safe, also keep the neighbours of the first revealed cell free of mines
+                minefield: play on this (row x col) minefield with num_mines mines instead of creating one (field_type, seed and the first-click options are then ignored)
+                undo: keep the history of the moves for undo() and redo(); the minefield then journals every change (see commit())
+                max_undo: with undo, keep only the last 'max_undo' moves undoable (and the journal of the minefield that they need)
+
+        '''
 
-        self._minefield = MineField.create_new(row, col, num_mines)
+        if minefield is None:
+            minefield = field_type.create_new(row, col, num_mines, seed = seed,
+                                              first_click_safe = first_click_safe, safe_neighbourhood = safe_neighbourhood)
+        self._minefield = minefield
         self._shut_down_when_finished = end_program_when_game_finishes
         self._status = Game.GameStatus.NOT_RUNNING
+        self._last_revealed = []
+        self._undo = undo
+        self._max_undo = max_undo
+        self._history = [] # (move, state before it) of every move played, for undo() (only with undo = True)
+        self._history_start = 0 # number of moves played before self._history[0] (dropped by commit())
+        self._undone = [] # moves taken back by undo(), for redo()
+        self._move_log = None # MoveLogWriter of record()
 
         self.field_info = [row, col, num_mines]
 
@@ -54,14 +77,23 @@ class Game:
     @property
     def status(self):
         return self._status
+
+    @property
+    def last_revealed(self):
+        '''
+            The [row,col] pairs of the cells revealed by the last move (empty after a flag move).
+        '''
+        return self._last_revealed
     
 
     def start_game(self):
-        if self._minefield.initialise():
+        # ----- a minefield handed over ready (e.g. by a BoardPool) is already initialised
+        if self._minefield._is_playing or self._minefield.initialise():
             self._status = Game.GameStatus.RUNNING
         else:
             raise Exception("Game Failed to Start. MineField Initialising Failed.")
 
+    @traced('play_move')
     def play_move(self, row, col, action):
         '''
             Args:
@@ -71,32 +103,169 @@ class Game:
         '''
 
         if self._status == Game.GameStatus.RUNNING:
+            before = self.snapshot() if self._undo else None
             if action == Game.GameAction.FLAG:
                 self._minefield.flag_cell(row,col)
+                self._last_revealed = []
 
             elif action == Game.GameAction.REVEAL:
-                self._minefield.reveal_cells(row, col)
+                self._last_revealed = self._minefield.reveal_cells(row, col)
 
                 if not self._minefield.is_intact:
                     self._status = Game.GameStatus.FAILED
                 elif self._minefield.revealed_all_safe_cells:
                     self._status = Game.GameStatus.WON
 
-                if self._shut_down_when_finished:
-                    if self._status == Game.GameStatus.FAILED:
-                        print("Game Over: Cell at [%d,%d] was a mine!"%(row,col))
-                        sys.exit()
-                    elif self._status == Game.GameStatus.WON:
-                        print ("\n\tGame Won!\n")
-                        sys.exit()
             else:
                 raise Exception("Unknown Action requested")
 
+            if self._undo:
+                self._history.append(((row, col, action), before))
+                self._undone = []
+                if self._max_undo is not None and len(self._history) > self._max_undo:
+                    self.commit(self._history[len(self._history) - self._max_undo][1])
+            if self._move_log is not None:
+                self._move_log.append(row, col, action)
+
+            if self._shut_down_when_finished:
+                if self._status == Game.GameStatus.FAILED:
+                    print("Game Over: Cell at [%d,%d] was a mine!"%(row,col))
+                    sys.exit()
+                elif self._status == Game.GameStatus.WON:
+                    print ("\n\tGame Won!\n")
+                    sys.exit()
+
         else:
             raise Exception("Game is not running!")
 
         return self._status
 
+    def snapshot(self):
+        '''
+            Mark the current state of the game, to go back to with restore() (e.g. to try moves in a lookahead search).
+            O(1): the minefield journals its changes from the first call on (see MineField.snapshot()).
+        '''
+        return (self._minefield.snapshot(), self._status, self._last_revealed, self._history_start + len(self._history))
+
+    def restore(self, state):
+        '''
+            Go back to a state returned by snapshot(), at a cost proportional to the cells changed since. Clears the redo list.
+        '''
+        token, self._status, self._last_revealed, num_moves = state
+        self._minefield.restore(token)
+        del self._history[num_moves - self._history_start:]
+        self._undone = []
+
+    def commit(self, state = None):
+        '''
+            Forget what happened before a state returned by snapshot() (everything if None), e.g. once a lookahead search
+            has restored its root: restore() and undo() can no longer go back past it, and the minefield drops the part of
+            its journal that is not needed any more (see MineField.commit()).
+        '''
+        if state is None:
+            self._minefield.commit()
+            self._history_start += len(self._history)
+            self._history = []
+            return
+        token, _, _, num_moves = state
+        self._minefield.commit(token)
+        del self._history[:num_moves - self._history_start]
+        self._history_start = num_moves
+
+    def undo(self):
+        '''
+            Take back the last move (also after the game was lost or won). Needs Game(..., undo = True).
+
+            @Return -- the status after undoing, or None if there was no move to undo
+
+        '''
+        if not self._undo:
+            raise Exception("Undo is off: create the Game with undo = True")
+        if not self._history:
+            return None
+        move, before = self._history.pop()
+        undone = self._undone
+        self.restore(before)
+        self._undone = undone + [move]
+        if self._move_log is not None:
+            self._move_log.append_undo()
+        return self._status
+
+    def redo(self):
+        '''
+            Play the last move taken back by undo() again.
+
+            @Return -- the status after the move, or None if there was no move to redo
+
+        '''
+        if not self._undone:
+            return None
+        undone = self._undone
+        row, col, action = undone.pop()
+        self.play_move(row, col, action)
+        self._undone = undone
+        return self._status
+
+    def save(self, path):
+        '''
+            Write the game (board and status) to a compact binary file. See core/snapshot.py.
+        '''
+        from pyminesweeper.core import snapshot
+        snapshot.save(self._minefield, path, self._status)
+
+    @classmethod
+    def load(cls, path, end_program_when_game_finishes = False, field_type = None, undo = False):
+        '''
+            Restore a game written by save(), in the state it was saved in (a running game can be played on directly).
+            The whole board is read into memory (see snapshot.BoardSnapshot to look at part of a large saved board).
+
+            Args:
+                field_type: engine to load the board into (default: the engine it was saved from)
+
+        '''
+        from pyminesweeper.core import snapshot
+        return cls._resume(*snapshot.load(path, field_type), end_program_when_game_finishes = end_program_when_game_finishes, undo = undo)
+
+    @classmethod
+    def loads(cls, data, end_program_when_game_finishes = False, field_type = None, undo = False):
+        '''
+            Restore a game from the contents (bytes) of a save file, e.g. the board at the start of a move log.
+        '''
+        from pyminesweeper.core import snapshot
+        return cls._resume(*snapshot.loads(data, field_type), end_program_when_game_finishes = end_program_when_game_finishes, undo = undo)
+
+    @classmethod
+    def _resume(cls, minefield, status, end_program_when_game_finishes = False, undo = False):
+
+        game = cls(minefield.num_rows, minefield.num_cols, minefield._num_mines + minefield._pending_mines,
+                   end_program_when_game_finishes, minefield = minefield, undo = undo)
+        game._status = Game.GameStatus(status) if status is not None else Game.GameStatus.NOT_RUNNING
+        return game
+
+    def record(self, path, flush = True):
+        '''
+            Start appending every move (and undo) to a move log at 'path', starting with the current state of the board.
+            See core/movelog.py; replay the log with movelog.Replay.
+
+            If the mines are still to be placed on the first click and the board has no int seed, it is given a fresh
+            random int seed, so that the log reproduces the same mines.
+
+            Args:
+                flush: write every move to the file as it is played (so that the log survives a crash or sys.exit())
+
+            @Return -- the MoveLogWriter (call close() on it, or stop_recording(), when done)
+
+        '''
+        from pyminesweeper.core.movelog import MoveLogWriter
+        self.stop_recording()
+        self._move_log = MoveLogWriter(path, self, flush = flush)
+        return self._move_log
+
+    def stop_recording(self):
+        if self._move_log is not None:
+            self._move_log.close()
+            self._move_log = None
+
     def end_and_reveal_field(self, only_mines = True):
         self._minefield.stop_play()
         self._minefield.reveal_all(only_mines = only_mines)
@@ -10,6 +10,97 @@ The base classes for defining a minefield.
 '''
 
 import random
+from collections import deque
+from pyminesweeper.core.tracing import tracer, traced
+
+
+def _make_random(seed):
+    '''
+        Random number generator for mine placement: 'seed' may be None, an int, a random.Random or a NumPy Generator (used as is).
+    '''
+    if seed is None or isinstance(seed, int):
+        return random.Random(seed)
+    return seed
+
+def _rng_state(rng):
+    return rng.bit_generator.state if hasattr(rng, 'bit_generator') else rng.getstate()
+
+def _set_rng_state(rng, state):
+    if hasattr(rng, 'bit_generator'):
+        rng.bit_generator.state = state
+    else:
+        rng.setstate(state)
+
+def _sample_cells(rng, num_cells, count, excluded=()):
+    '''
+        Sample 'count' distinct flat cell indices out of range(num_cells), avoiding the cells in 'excluded'.
+        Draws without replacement, so the cost is O(count + len(excluded)) rather than growing with the density.
+
+        Args:
+            rng: a random.Random or a NumPy Generator
+    '''
+    excluded = set(excluded)
+    draw = min(count + len(excluded), num_cells)
+    if hasattr(rng, 'integers'):
+        sample = rng.choice(num_cells, size=draw, replace=False).tolist()
+    else:
+        sample = rng.sample(range(num_cells), draw)
+    return [cell for cell in sample if cell not in excluded][:count]
+
+def _choose_mine_cells(rng, num_rows, num_cols, count, excluded):
+    '''
+        Flat indices of 'count' random mine cells, none of them in 'excluded'.
+        For dense boards the (fewer) cells left free are sampled instead of the mines.
+    '''
+    num_cells = num_rows*num_cols
+    excluded = set(excluded)
+    allowed = num_cells - len(excluded)
+    _check_mine_count(count, allowed)
+    if count <= allowed//2:
+        return _sample_cells(rng, num_cells, count, excluded)
+    free = excluded.union(_sample_cells(rng, num_cells, allowed - count, excluded))
+    return [cell for cell in range(num_cells) if cell not in free]
+
+def _check_mine_count(count, allowed):
+    '''
+        Raise a ValueError if 'count' mines do not fit into the 'allowed' cells.
+    '''
+    if count < 0 or count > allowed:
+        raise ValueError("Cannot place %d mines: only %d cells may hold a mine"%(count, allowed))
+
+def _corner_cells(num_rows, num_cols):
+    return {0, num_cols-1, (num_rows-1)*num_cols, num_rows*num_cols-1}
+
+def _mine_free_cells(field):
+    '''
+        Cells (flat indices) that the mine placement of 'field' keeps free of mines: those excluded when the mines were
+        placed or, while they wait for the first click, the corners if they stay free whichever cell is clicked.
+    '''
+    if not field._pending_mines:
+        return field._mine_free
+    total_mines = field._num_mines + field._pending_mines
+    if field.num_rows*field.num_cols - 5 - field._num_mines >= total_mines: # corners, clicked cell and mines placed already excluded
+        return _corner_cells(field.num_rows, field.num_cols)
+    return set()
+
+def _first_click_exclusions(num_rows, num_cols, row, col, num_mines, placed, safe_neighbourhood):
+    '''
+        Cells to keep free of mines when generating the board on the first click at [row,col]: the corners, the clicked cell
+        and, if 'safe_neighbourhood', its neighbours. Rules are dropped (neighbourhood first, then corners) if they leave too few cells.
+    '''
+    clicked = {row*num_cols + col}
+    neighbourhood = set(r*num_cols + c for r in range(max(row-1, 0), min(row+2, num_rows))
+                                        for c in range(max(col-1, 0), min(col+2, num_cols)))
+    candidates = []
+    if safe_neighbourhood:
+        candidates.append(_corner_cells(num_rows, num_cols) | neighbourhood)
+    candidates += [_corner_cells(num_rows, num_cols) | clicked, clicked]
+    for excluded in candidates:
+        excluded = excluded | placed
+        if num_rows*num_cols - len(excluded) >= num_mines:
+            return excluded
+    return clicked | placed
+
 
 class Cell(object):
     def __init__(self, is_mine, is_visible=False, is_flagged=False):
@@ -76,13 +167,22 @@ class MineField(tuple):
         self.num_rows = len(self)
         self.num_cols = len(self[0])
 
-        assert self.num_rows == self.num_cols, "Invalid size for board. Num of rows: %d, Num of cols: %d"%(self.num_rows, self.num_cols)
+        assert all(len(row) == self.num_cols for row in self), "Invalid size for board. All rows should have %d cols"%self.num_cols
 
         self.revealed_safe_cells = 0
         self._num_mines = 0
         self._mine_locations = []
         self._is_playing = False
 
+        self.seed = None
+        self._rng = None
+        self._pending_mines = 0 # mines whose placement waits for the first click
+        self._safe_neighbourhood = False
+        self._mine_free = set() # cells kept free of mines when they were placed (see mine_free_cells)
+
+        self._journal = None # changes made since the first snapshot(), for restore()
+        self._journal_start = 0 # token of the first change in the journal (changes before it were dropped by commit())
+
     def _place_mine_at(self, row, col):
         if not self._is_playing:
             if not self[row][col]._is_mine:
@@ -92,38 +192,62 @@ class MineField(tuple):
         else:
             raise Exception("Error: Should not add mine after initialising MineField!")
 
-    def _place_random_mines(self, num_mines):
+    @traced('generate')
+    def _place_random_mines(self, num_mines, rng=None, excluded=None):
+        '''
+            Place mines at random cells (never at the corners, or in 'excluded' if given) until there are 'num_mines' mines.
+
+        '''
+        if excluded is None:
+            excluded = _corner_cells(self.num_rows, self.num_cols)
+        excluded = set(excluded).union(r*self.num_cols + c for r, c in self._mine_locations)
+        if num_mines < self._num_mines:
+            return
 
-        xy = [] 
-        while self._num_mines < num_mines: 
-            x = random.randint(0,self.num_rows-1)
-            y = random.randint(0,self.num_cols-1)
-            xy.append([x,y]) 
-            if xy.count([x,y]) > 1: 
-                xy.remove([x,y]) 
-            elif (x == 0 and y == 0) or (x == 0 and y == self.num_cols-1) or (x == self.num_rows-1 and y == 0) or (x == self.num_rows-1 and y == self.num_cols-1):
-                xy.remove([x,y])
-            else: 
-                self._place_mine_at(x, y)
+        for cell in _choose_mine_cells(_make_random(rng), self.num_rows, self.num_cols, num_mines - self._num_mines, excluded):
+            self._place_mine_at(*divmod(cell, self.num_cols))
+        self._mine_free = excluded.difference(r*self.num_cols + c for r, c in self._mine_locations)
 
+    def _generate_on_first_click(self, row_id, col_id):
+        '''
+            Place the mines deferred by create_new(..., first_click_safe=True) so that [row_id,col_id] (and optionally its neighbourhood) is safe.
+
+        '''
+        placed = set(r*self.num_cols + c for r, c in self._mine_locations)
+        excluded = _first_click_exclusions(self.num_rows, self.num_cols, row_id, col_id, self._num_mines + self._pending_mines, placed, self._safe_neighbourhood)
+
+        if self._journal is not None:
+            self._journal.append(('generate', len(self._mine_locations), self._pending_mines, _rng_state(self._rng)))
+        self._is_playing = False
+        self._place_random_mines(self._num_mines + self._pending_mines, self._rng, excluded)
+        self._pending_mines = 0
+        self._count_all_surrounding()
+        self._is_playing = True
+
+    @traced('initialise')
     def initialise(self):
         '''
             Has to be run before running the game.
 
         '''
-        if not self._is_playing and self._num_mines > 0 and self._num_mines <= (self.num_rows*self.num_cols - 4) and self._num_mines == len(self._mine_locations):  
-            self.safe_cells = self.num_rows*self.num_cols - self._num_mines
+        total_mines = self._num_mines + self._pending_mines
+        if not self._is_playing and total_mines > 0 and total_mines <= (self.num_rows*self.num_cols - 4) and self._num_mines == len(self._mine_locations):
+            self.safe_cells = self.num_rows*self.num_cols - total_mines
 
-            for r in range(self.num_rows):
-                for c in range(self.num_cols):
-                    if not self[r][c]._is_mine:
-                        self[r][c]._number = self._count_surrounding(r,c)
+            if not self._pending_mines:
+                self._count_all_surrounding()
 
             self._is_playing = True
         else:
             print ("Error while Initialising MineField: Check number of mines!")
         return self._is_playing
 
+    def _count_all_surrounding(self):
+        for r in range(self.num_rows):
+            for c in range(self.num_cols):
+                if not self[r][c]._is_mine:
+                    self[r][c]._number = self._count_surrounding(r,c)
+
     def _count_surrounding(self, row_id, col_id):
         return sum(1 for (surr_row, surr_col) in self._get_neighbours(row_id, col_id)
                         if (self._is_inside_field(surr_row, surr_col) and
@@ -138,62 +262,220 @@ class MineField(tuple):
     def _is_inside_field(self, row_id, col_id):
         return 0 <= row_id < self.num_rows and 0 <= col_id < self.num_cols
 
+    @traced('reveal_cells', lambda opened: {'cells': len(opened)})
     def reveal_cells(self, row_id, col_id):
         '''
-            A recursive method to reveal safe cells.
             Reveals the selected cell. If it is safe, and has no mines around it, adjacent cells are revealed.
+            The flood fill uses an explicit queue, so large empty areas do not hit the recursion limit.
             If the selected cell is a mine, game is over.
 
-        '''
-        cell = self[row_id][col_id]
-        if not cell.is_visible:
-            self[row_id][col_id].show()
-            self.revealed_safe_cells += 1
+            @Return -- list of [row,col] pairs of the cells that were revealed by this call (in reveal order)
 
-            if (cell._is_mine):
-                assert [row_id,col_id] in self._mine_locations
-                self.stop_play()
-                self.revealed_safe_cells -= 1
+        '''
+        if self._pending_mines and self._is_playing:
+            self._generate_on_first_click(row_id, col_id)
 
-            elif self[row_id][col_id]._number == 0:
-                for (surr_row, surr_col) in self._get_neighbours(row_id, col_id):
-                    if self._is_inside_field(surr_row, surr_col):
-                        self.reveal_cells(surr_row, surr_col) 
+        cell = self[row_id][col_id]
+        if cell.is_visible:
+            return []
+
+        unflagged = [(row_id, col_id)] if cell.is_flagged and not cell._is_mine else []
+        cell.show()
+        if cell._is_mine:
+            assert [row_id,col_id] in self._mine_locations
+            if self._journal is not None:
+                self._journal.append(('reveal', [(row_id, col_id)], unflagged, self.revealed_safe_cells))
+            self.stop_play()
+            return [(row_id, col_id)]
+
+        queue = deque([(row_id, col_id)])
+        opened = []
+        trace, queue_depth = tracer.enabled, 1
+        while queue:
+            if trace:
+                queue_depth = max(queue_depth, len(queue))
+            r, c = queue.popleft()
+            opened.append((r, c))
+            if self[r][c]._number == 0:
+                for surr_row in range(max(r-1, 0), min(r+2, self.num_rows)):
+                    row = self[surr_row]
+                    for surr_col in range(max(c-1, 0), min(c+2, self.num_cols)):
+                        neighbour = row[surr_col]
+                        if not neighbour.is_visible:
+                            if neighbour.is_flagged:
+                                unflagged.append((surr_row, surr_col))
+                            neighbour.show()
+                            queue.append((surr_row, surr_col))
+
+        if self._journal is not None:
+            self._journal.append(('reveal', opened, unflagged, self.revealed_safe_cells))
+        self.revealed_safe_cells += len(opened)
+        if trace:
+            tracer.observe('reveal_cells.queue_depth', queue_depth)
+        return opened
 
     def flag_cell(self, row_id, col_id):
 
+        if self._journal is not None and not self[row_id][col_id].is_visible:
+            self._journal.append(('flag', row_id, col_id))
         self[row_id][col_id].flag()
 
     # @property
     # def current_state():
     #     return []
     def stop_play(self):
+        if self._journal is not None:
+            self._journal.append(('stop', self._is_playing))
         self._is_playing = False
 
     def reveal_all(self, only_mines = True):
 
         if not self._is_playing:
-            for r in range(self.num_rows):
-                for c in range(self.num_cols):
-                    if self[r][c]._is_mine:
-                        self[r][c].show()
+            shown = [(r, c) for r, c in self._mine_locations if not self[r][c].is_visible]
+            for r, c in shown:
+                self[r][c].show()
+            if self._journal is not None:
+                self._journal.append(('reveal', shown, [], self.revealed_safe_cells))
         else:
             raise Exception("Cannot reveal all cells when still in play. End game using stop_play() method (of MineField class) if required.")
 
 
     @classmethod
-    def create_new(cls, row, col, num_mines):
+    def create_new(cls, row, col, num_mines, seed=None, first_click_safe=False, safe_neighbourhood=False):
         ''' 
             Creates a 'row' x 'col' grid with 'num_mines' number of mines at random location (except at the corners)
 
+            Args:
+                seed: None, an int, a random.Random or a NumPy Generator used for placing the mines
+                first_click_safe: if True, mines are only placed on the first call to reveal_cells(), away from the revealed cell
+                safe_neighbourhood: with first_click_safe, also keep the neighbours of the first revealed cell free of mines
+
+        '''
+        board = cls(tuple([tuple([Cell(False) for j in range(col)])
+                         for i in range(row)]))
+
+        board.seed = seed if isinstance(seed, int) else None
+        if first_click_safe:
+            _check_mine_count(num_mines, row*col - 1) # the first revealed cell is kept free
+            board._rng = _make_random(seed)
+            board._pending_mines = num_mines
+            board._safe_neighbourhood = safe_neighbourhood
+        else:
+            board._place_random_mines(num_mines, seed)
+
+        return board
+
+    @classmethod
+    def from_mines(cls, mines):
         '''
-        board = cls(tuple([tuple([Cell(False) for i in range(row)])
-                         for j in range(col)]))
+            Creates a grid with mines at the given cells
 
-        board._place_random_mines(num_mines)
+            Args:
+                mines: rows of bools (a list of lists or a 2D bool array), True where there is a mine
 
+        '''
+        rows = mines.tolist() if hasattr(mines, 'tolist') else mines
+        board = cls(tuple([tuple([Cell(bool(is_mine)) for is_mine in row]) for row in rows]))
+        board._mine_locations = [[r,c] for r, row in enumerate(rows) for c, is_mine in enumerate(row) if is_mine]
+        board._num_mines = len(board._mine_locations)
         return board
 
+    def _restore_state(self, visible, flagged):
+        '''
+            Make the cells visible / flagged as given by the (rows x cols) bool arrays 'visible' and 'flagged'.
+        '''
+        self.revealed_safe_cells = 0
+        for row, visible_row, flagged_row in zip(self, visible.tolist(), flagged.tolist()):
+            for cell, is_visible, is_flagged in zip(row, visible_row, flagged_row):
+                cell.is_visible, cell.is_flagged = is_visible, is_flagged
+                self.revealed_safe_cells += is_visible and not cell._is_mine
+
+    def snapshot(self):
+        '''
+            Mark the current state of the board, to go back to with restore(). From the first snapshot on, every
+            change (reveal, flag, end of play, placement of deferred mines) is journaled, so that taking a snapshot
+            is O(1) and restoring costs as much as the cells changed since.
+
+            @Return -- a token for restore(); tokens taken after the state that is restored become invalid
+
+        '''
+        if self._journal is None:
+            self._journal = []
+        return self._journal_start + len(self._journal)
+
+    def restore(self, token):
+        '''
+            Undo every change made since snapshot() returned 'token'. Undoing the first click of a first_click_safe
+            board also takes back its mines (and rewinds the random number generator that placed them).
+        '''
+        if self._journal is None or not 0 <= token - self._journal_start <= len(self._journal):
+            raise Exception("Invalid snapshot token: %s"%str(token))
+        while self._journal_start + len(self._journal) > token:
+            self._undo(self._journal.pop())
+
+    def commit(self, token=None):
+        '''
+            Drop the journal before snapshot() returned 'token', which no snapshot still in use needs: restore() can then
+            only go back to 'token' or later. With no token, the whole journal is dropped and journaling stops until the
+            next snapshot().
+        '''
+        if self._journal is None:
+            return
+        end = self._journal_start + len(self._journal)
+        if token is None:
+            self._journal, self._journal_start = None, end
+            return
+        if not self._journal_start <= token <= end:
+            raise Exception("Invalid snapshot token: %s"%str(token))
+        del self._journal[:token - self._journal_start]
+        self._journal_start = token
+
+    def _undo(self, change):
+        kind = change[0]
+        if kind == 'reveal':
+            _, cells, unflagged, revealed_safe_cells = change
+            for r, c in cells:
+                self[r][c].is_visible = False
+            for r, c in unflagged:
+                self[r][c].is_flagged = True
+            self.revealed_safe_cells = revealed_safe_cells
+        elif kind == 'flag':
+            self[change[1]][change[2]].flag()
+        elif kind == 'stop':
+            self._is_playing = change[1]
+        elif kind == 'generate':
+            _, num_placed, pending_mines, rng_state = change
+            for r, c in self._mine_locations[num_placed:]:
+                self[r][c]._is_mine = False
+            del self._mine_locations[num_placed:]
+            self._num_mines = num_placed
+            self._pending_mines = pending_mines
+            _set_rng_state(self._rng, rng_state)
+
+    def save(self, path):
+        '''
+            Write the board (mines, revealed and flagged cells) to a compact binary file. See core/snapshot.py.
+        '''
+        from pyminesweeper.core import snapshot
+        snapshot.save(self, path)
+
+    @classmethod
+    def load(cls, path):
+        '''
+            Read a board written by save() (by either engine) into this engine. The whole board is read into memory;
+            to look at part of a large saved board, use snapshot.BoardSnapshot.
+        '''
+        from pyminesweeper.core import snapshot
+        return snapshot.load(path, cls)[0]
+
+    @property
+    def mine_free_cells(self):
+        '''
+            Cells (flat indices, row*num_cols + col) that the mine placement keeps free of mines, such as the corners.
+            Empty for boards built from given mines (from_mines(), load()).
+        '''
+        return _mine_free_cells(self)
+
     @property
     def is_intact(self):
         return self._is_playing
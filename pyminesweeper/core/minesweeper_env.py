@@ -0,0 +1,156 @@
+'''
+
+A Gym-style environment around Game, for training and evaluating agents. The observation array is
+updated incrementally from the cells each move changes (Game.last_revealed, or the flagged cell),
+and is handed out without copying. Does not depend on pygame, and never exits the program.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: minesweeper_env.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import numpy as np
+from pyminesweeper.core import Game, ArrayMineField
+
+
+class MinesweeperEnv(object):
+
+    '''
+        Environment following the Gym API (reset(seed) -> (observation, info), step(action) -> (observation, reward, terminated, truncated, info)).
+
+        Observation: int8 array (rows x cols) holding the number of every revealed cell, HIDDEN for hidden cells,
+        FLAGGED for flagged cells and MINE for a revealed mine. The array is a read-only view of the
+        environment's own buffer, so it changes in place with every step.
+
+        Actions: an int in [0, 2*rows*cols), where a < rows*cols reveals cell a (row-major) and larger values flag
+        cell a - rows*cols; or a (row, col, Game.GameAction) tuple.
+
+    '''
+
+    HIDDEN = -1
+    FLAGGED = -2
+    MINE = -3
+
+    REWARD_WIN = 1.0
+    REWARD_LOSS = -1.0
+    REWARD_PROGRESS = 0.1 # a reveal that opened at least one cell
+    REWARD_NO_PROGRESS = -0.1 # a move that changed nothing (e.g. revealing a revealed cell)
+    REWARD_FLAG = 0.0
+
+    def __init__(self, row, col, num_mines, field_type = ArrayMineField, first_click_safe = True, safe_neighbourhood = False):
+        '''
+            Args:
+                field_type: minefield engine used for the games (see Game)
+                first_click_safe, safe_neighbourhood: passed on to Game
+
+        '''
+        self.num_rows = row
+        self.num_cols = col
+        self.num_mines = num_mines
+        self.num_actions = 2*row*col
+
+        self._field_type = field_type
+        self._first_click_safe = first_click_safe
+        self._safe_neighbourhood = safe_neighbourhood
+
+        self._game = None
+        self._obs = np.full((row, col), self.HIDDEN, dtype=np.int8)
+        self._mask = np.ones((2, row, col), dtype=bool) # [reveal, flag] x rows x cols
+
+        self._obs_view = self._obs.view()
+        self._obs_view.flags.writeable = False
+        self._mask_view = self._mask.view()
+        self._mask_view.flags.writeable = False
+
+    @property
+    def game(self):
+        return self._game
+
+    @property
+    def observation(self):
+        return self._obs_view
+
+    @property
+    def action_mask(self):
+        '''
+            bool array (2 x rows x cols): [0] cells that can be revealed (hidden and not flagged), [1] cells that can be flagged or unflagged.
+            Flatten it to get the mask over the int actions. Read-only view, updated in place.
+        '''
+        return self._mask_view
+
+    def reset(self, seed = None):
+        '''
+            Start a new game. 'seed' is passed to Game for placing the mines.
+        '''
+        self._game = Game(self.num_rows, self.num_cols, self.num_mines, end_program_when_game_finishes = False,
+                          field_type = self._field_type, seed = seed,
+                          first_click_safe = self._first_click_safe, safe_neighbourhood = self._safe_neighbourhood)
+        self._game.start_game()
+
+        self._obs.fill(self.HIDDEN)
+        self._mask.fill(True)
+
+        return self._obs_view, self._info()
+
+    def step(self, action):
+
+        assert self._game is not None and self._game.is_running, "Game is not running! Call reset() first."
+
+        row, col, game_action = self._decode(action)
+        minefield = self._game.minefield
+
+        status = self._game.play_move(row, col, game_action)
+
+        if game_action == Game.GameAction.FLAG:
+            changed = self._mask[1, row, col]
+            if changed:
+                flagged = minefield[row][col].is_flagged
+                self._obs[row, col] = self.FLAGGED if flagged else self.HIDDEN
+                self._mask[0, row, col] = not flagged
+            reward = self.REWARD_FLAG if changed else self.REWARD_NO_PROGRESS
+        else:
+            opened = np.asarray(self._game.last_revealed, dtype=np.intp).reshape(-1, 2)
+            self._update_revealed(minefield, opened)
+            reward = self.REWARD_PROGRESS if len(opened) else self.REWARD_NO_PROGRESS
+
+        if status == Game.GameStatus.WON:
+            reward = self.REWARD_WIN
+        elif status == Game.GameStatus.FAILED:
+            reward = self.REWARD_LOSS
+
+        return self._obs_view, reward, not self._game.is_running, False, self._info()
+
+    def _update_revealed(self, minefield, opened):
+        rows, cols = opened[:, 0], opened[:, 1]
+        if hasattr(minefield, 'number_grid'):
+            numbers = np.where(minefield.mine_mask[rows, cols], self.MINE, minefield.number_grid[rows, cols])
+        else:
+            numbers = [self.MINE if minefield[r][c]._is_mine else minefield[r][c].get_number() for r, c in zip(rows, cols)]
+        self._obs[rows, cols] = numbers
+        self._mask[:, rows, cols] = False
+
+    def _decode(self, action):
+        if isinstance(action, tuple):
+            return action
+        action = int(action)
+        assert 0 <= action < self.num_actions, "Invalid action: %d"%action
+        cell, is_flag = action % (self.num_rows*self.num_cols), action >= self.num_rows*self.num_cols
+        row, col = divmod(cell, self.num_cols)
+        return row, col, Game.GameAction.FLAG if is_flag else Game.GameAction.REVEAL
+
+    def _info(self):
+        return {'status': self._game.status, 'revealed_safe_cells': self._game.minefield.revealed_safe_cells}
+
+
+
+if __name__ == '__main__':
+
+    env = MinesweeperEnv(9, 9, 10)
+    obs, info = env.reset(seed = 0)
+
+    obs, reward, terminated, truncated, info = env.step(40)
+
+    print(obs)
+    print(reward, terminated, info)
@@ -0,0 +1,221 @@
+'''
+
+Append-only move logs of games, and their replay. A log starts with a short header and the board at the
+time recording started (in the save file format of core/snapshot.py, so with its seed and any mines still
+to be placed on the first click), followed by one fixed-width 9-byte record per move:
+
+    row (uint32), col (uint32), action (uint8: 1 reveal, 2 flag, 3 undo)
+
+Records are appended (and by default flushed) as the moves are played, so a log is readable while the game
+is running and after a crash. Start recording with Game.record(path).
+
+Replay re-executes a log headless at full speed, as a generator of game states, and can seek to any move:
+checkpoints are taken every 'checkpoint_interval' moves, and seeking backwards restores the nearest one
+through the journal of the minefield (see Game.snapshot()) before replaying the remaining moves.
+
+    replay = Replay('game.pml')
+    for game in replay.states():
+        ...
+    game = replay.seek(120) # state after 120 moves
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: movelog.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import os
+import struct
+
+import numpy as np
+from pyminesweeper.core import snapshot
+from pyminesweeper.core.game import Game
+
+MAGIC = b'PYML'
+VERSION = 1
+HEADER = struct.Struct('<4sBxxxI') # magic, version, length of the board
+MOVE = struct.Struct('<IIB') # row, col, action
+MOVE_DTYPE = np.dtype([('row', '<u4'), ('col', '<u4'), ('action', 'u1')])
+
+# ----- action codes
+REVEAL = 1
+FLAG = 2
+UNDO = 3
+ACTION_CODES = {Game.GameAction.REVEAL: REVEAL, Game.GameAction.FLAG: FLAG}
+
+CHECKPOINT_INTERVAL = 256
+
+
+class MoveLogWriter(object):
+
+    '''
+        Writes the move log of a game. Created by Game.record(), which then appends every move played.
+    '''
+
+    def __init__(self, path, game, flush = True):
+
+        field = game.minefield
+        if field._pending_mines and not isinstance(field.seed, int):
+            # ----- make the mines placed on the first click reproducible
+            field.seed = int.from_bytes(os.urandom(7), 'little')
+            field._rng = snapshot._generator_for(field, field.seed)
+
+        board = snapshot.dumps(field, game.status)
+        self.path = path
+        self._flush = flush
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(board)) + board)
+        self._file.flush()
+        self.num_moves = 0
+
+    def append(self, row, col, action):
+        self._write(MOVE.pack(row, col, ACTION_CODES[action]))
+
+    def append_undo(self):
+        self._write(MOVE.pack(0, 0, UNDO))
+
+    def _write(self, record):
+        self._file.write(record)
+        if self._flush:
+            self._file.flush()
+        self.num_moves += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_log(path):
+    '''
+        Read a move log. A partly written last record (e.g. after a crash) is ignored.
+
+        @Return -- the board at the start of the log (save file bytes, see Game.loads()), and the moves as
+                   a structured array with fields 'row', 'col' and 'action'
+
+    '''
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise Exception("Not a PyMinesweeper move log: too short")
+    magic, version, board_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise Exception("Not a PyMinesweeper move log")
+    if version != VERSION:
+        raise Exception("Unsupported move log version %d (expected %d)"%(version, VERSION))
+
+    start = HEADER.size + board_size
+    num_moves = (len(data) - start)//MOVE.size
+    return data[HEADER.size:start], np.frombuffer(data, dtype=MOVE_DTYPE, count=num_moves, offset=start)
+
+
+class Replay(object):
+
+    '''
+        Re-executes a move log on a fresh Game (without a GUI or printing).
+
+        'game' is the replayed game, in the state after 'position' moves of the log. It is modified in place
+        as the replay moves on; take game.snapshot() or save it if a state has to be kept.
+
+    '''
+
+    def __init__(self, path, field_type = None, checkpoint_interval = CHECKPOINT_INTERVAL):
+        '''
+            Args:
+                field_type: engine to replay on (MineField or ArrayMineField); the engine the game was recorded on if None.
+                            Only possible if the mines were placed when recording started: each engine places
+                            the mines deferred to the first click with its own random generator.
+                checkpoint_interval: moves between checkpoints for seek()
+
+        '''
+        board, self.moves = read_log(path)
+        header = snapshot._read_header(board)
+        recorded_on = snapshot.ENGINES[header['engine']]
+        if field_type is not None and field_type.__name__ != recorded_on and header['pending_mines']:
+            raise Exception("The mines of this game are placed on the first click by the %s it was recorded on; replay it on that engine."%recorded_on)
+
+        self.game = Game.loads(board, field_type = field_type, undo = True) # the log may hold undo records
+        if self.game.status == Game.GameStatus.NOT_RUNNING: # recording started before start_game()
+            self.game.start_game()
+        self.position = 0
+        self._checkpoint_interval = checkpoint_interval
+        self._checkpoints = {0: self.game.snapshot()}
+
+        # ----- moves as plain ints: much faster to unpack per move than NumPy scalars
+        self._moves = list(zip(self.moves['row'].tolist(), self.moves['col'].tolist(), self.moves['action'].tolist()))
+
+    def __len__(self):
+        return len(self._moves)
+
+    def step(self):
+        '''
+            Play the next move of the log.
+
+            @Return -- the game after the move
+
+        '''
+        row, col, action = self._moves[self.position]
+        if action == UNDO:
+            self.game.undo()
+            # ----- checkpoints taken after the move that was undone are no longer valid
+            num_moves = self.game.snapshot()[3]
+            self._checkpoints = dict((position, state) for position, state in self._checkpoints.items() if state[3] <= num_moves)
+        else:
+            self.game.play_move(row, col, Game.GameAction.REVEAL if action == REVEAL else Game.GameAction.FLAG)
+
+        self.position += 1
+        if self.position % self._checkpoint_interval == 0:
+            self._checkpoints[self.position] = self.game.snapshot()
+        return self.game
+
+    def seek(self, position):
+        '''
+            Bring the game to its state after 'position' moves of the log.
+
+            @Return -- the game
+
+        '''
+        if not 0 <= position <= len(self._moves):
+            raise Exception("Move %d is out of range: the log has %d moves"%(position, len(self._moves)))
+
+        if position < self.position:
+            checkpoint = max(p for p in self._checkpoints if p <= position)
+            self.game.restore(self._checkpoints[checkpoint])
+            self._checkpoints = dict((p, state) for p, state in self._checkpoints.items() if p <= checkpoint)
+            self.position = checkpoint
+
+        while self.position < position:
+            self.step()
+        return self.game
+
+    def states(self, start = 0, stop = None):
+        '''
+            Generator of the game after 'start', start+1, ... 'stop' (default: all) moves of the log.
+        '''
+        stop = len(self._moves) if stop is None else stop
+        yield self.seek(start)
+        while self.position < stop:
+            yield self.step()
+
+
+
+if __name__ == '__main__':
+
+    import random
+    import time
+
+    game = Game(16, 30, 99, end_program_when_game_finishes = False, seed = 3, first_click_safe = True)
+    game.start_game()
+    game.record('game.pml')
+    while game.is_running:
+        row, col = random.randrange(16), random.randrange(30)
+        if not game.minefield[row][col].is_visible:
+            game.play_move(row, col, Game.GameAction.REVEAL)
+    game.stop_recording()
+
+    start = time.perf_counter()
+    replay = Replay('game.pml')
+    for state in replay.states():
+        pass
+    print("Replayed %d moves in %.2f ms: %s"%(len(replay), 1e3*(time.perf_counter() - start), state.status))
+    print(replay.seek(len(replay)//2).minefield)
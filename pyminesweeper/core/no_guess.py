@@ -0,0 +1,266 @@
+'''
+
+Boards that can be solved from a given first click without guessing, and an on-disk cache of them.
+
+A candidate board is generated as for a game with first_click_safe and safe_neighbourhood (so the first
+click opens an area), then played from the first click revealing only cells that the ConstraintSolver
+proves safe. It is accepted if that reveals every safe cell. Most candidates on dense boards are rejected,
+so candidates are checked in batches across worker processes. Candidate i of a search uses its own seed
+(derived from the search seed and i) and the accepted boards are the first ones in candidate order, so
+the result does not depend on the number of workers.
+
+BoardCache keeps accepted boards in an SQLite file, indexed by (rows, cols, mines, first click):
+
+    cache = BoardCache('boards.db')
+    cache.fill(16, 30, 99, (8, 15), count = 1000)          # e.g. overnight
+    board = no_guess_board(16, 30, 99, (8, 15), cache = cache)
+    game = Game(16, 30, 99, False, minefield = board)    # first move: reveal [8,15]
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: no_guess.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import os
+import random
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from pyminesweeper.core.minefield import MineField
+from pyminesweeper.core.array_minefield import ArrayMineField
+from pyminesweeper.core.constraint_solver import ConstraintSolver
+
+BATCH_SIZE = 32 # candidates per worker task
+MAX_CANDIDATES_PER_BOARD = 10000 # a search gives up after this many candidates per board asked for
+
+
+def is_solvable_without_guessing(minefield, row, col):
+    '''
+        Play an ArrayMineField (initialised, nothing revealed; it is modified) from a first reveal at [row,col],
+        revealing only cells proven safe.
+
+        @Return -- True if every safe cell could be revealed that way
+
+    '''
+    num_rows, num_cols = minefield.num_rows, minefield.num_cols
+    solver = ConstraintSolver(num_rows, num_cols)
+    opened = minefield.reveal_cells(row, col)
+    if not minefield.is_intact:
+        return False
+    numbers = minefield.number_grid
+    num_mines = minefield._num_mines
+
+    while not minefield.revealed_all_safe_cells:
+        solver.add_revealed((r, c, numbers[r, c]) for r, c in opened.tolist())
+        cell = solver.next_safe_cell()
+        if cell is None:
+            # ----- all mines proven: whatever is still unknown is safe
+            return len(solver.mines) == num_mines
+        opened = minefield.reveal_cells(*cell)
+    return True
+
+
+def candidate_seed(seed, index):
+    '''
+        Seed of candidate number 'index' of a search seeded with 'seed'.
+    '''
+    return int(np.random.SeedSequence([seed, index]).generate_state(1, np.uint64)[0] >> np.uint64(1))
+
+
+def candidate(num_rows, num_cols, num_mines, first_click, seed):
+    '''
+        The candidate board of a seed: an initialised ArrayMineField with its mines placed around the first click (not revealed yet).
+    '''
+    board = ArrayMineField.create_new(num_rows, num_cols, num_mines, seed = seed, first_click_safe = True, safe_neighbourhood = True)
+    board.initialise()
+    board._generate_on_first_click(*first_click)
+    return board
+
+
+def _search(config, seed, start, stop):
+    '''
+        Worker task: check candidates [start, stop) of a search.
+
+        @Return -- list of (index, candidate seed, mines as packed bits) of the accepted ones
+
+    '''
+    num_rows, num_cols, num_mines, first_click = config
+    accepted = []
+    for index in range(start, stop):
+        board_seed = candidate_seed(seed, index)
+        board = candidate(num_rows, num_cols, num_mines, first_click, board_seed)
+        mines = board.mine_mask.copy()
+        if is_solvable_without_guessing(board, *first_click):
+            accepted.append((index, board_seed, pack_mines(mines)))
+    return accepted
+
+
+def pack_mines(mines):
+    '''
+        (rows x cols) bool array packed row by row at one bit per cell (as a plane of a save file, see snapshot.py).
+    '''
+    return np.packbits(mines, axis=1, bitorder='little').tobytes()
+
+
+def unpack_mines(data, num_rows, num_cols):
+    packed = np.frombuffer(data, dtype=np.uint8).reshape(num_rows, (num_cols + 7)//8)
+    return np.unpackbits(packed, axis=1, count=num_cols, bitorder='little').view(bool)
+
+
+def generate_boards(num_rows, num_cols, num_mines, first_click, count, seed = None, workers = None,
+                    max_candidates = None):
+    '''
+        Generator of 'count' boards solvable without guessing from a first reveal at 'first_click' (row, col).
+
+        Args:
+            seed: int seed of the search (random if None)
+            workers: processes checking candidates (os.cpu_count() if None; 1 checks in this process)
+            max_candidates: candidates checked at most (MAX_CANDIDATES_PER_BOARD per board by default); an Exception is raised when exceeded
+
+        @Return -- yields (candidate seed, mines) pairs, mines being a (rows x cols) bool array; candidate(..., seed) rebuilds the board
+
+    '''
+    if not (0 <= first_click[0] < num_rows and 0 <= first_click[1] < num_cols):
+        raise Exception("First click [%d,%d] is outside the %d x %d board"%(first_click[0], first_click[1], num_rows, num_cols))
+    seed = random.getrandbits(63) if seed is None else seed
+    workers = workers or os.cpu_count() or 1
+    max_candidates = max_candidates or MAX_CANDIDATES_PER_BOARD*count
+    config = (num_rows, num_cols, num_mines, tuple(first_click))
+    batches = [(start, min(start + BATCH_SIZE, max_candidates)) for start in range(0, max_candidates, BATCH_SIZE)]
+
+    found = 0
+    for accepted in _run_batches(config, seed, batches, workers):
+        for index, board_seed, data in accepted:
+            yield board_seed, unpack_mines(data, num_rows, num_cols)
+            found += 1
+            if found == count:
+                return
+    raise Exception("Found only %d of %d boards without guessing in %d candidates: the board may be too dense."%(found, count, max_candidates))
+
+
+def _run_batches(config, seed, batches, workers):
+    '''
+        Results of _search() for every batch, in order, with a bounded number of batches in flight.
+    '''
+    if workers == 1:
+        for start, stop in batches:
+            yield _search(config, seed, start, stop)
+        return
+
+    pool = ProcessPoolExecutor(max_workers = workers)
+    try:
+        pending = deque()
+        for start, stop in batches:
+            pending.append(pool.submit(_search, config, seed, start, stop))
+            if len(pending) >= 2*workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait = True, cancel_futures = True)
+
+
+class BoardCache(object):
+
+    '''
+        SQLite file of boards solvable without guessing. Boards are taken out in the order they were added,
+        so each one is handed out once.
+
+    '''
+
+    def __init__(self, path):
+
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute('CREATE TABLE IF NOT EXISTS boards (id INTEGER PRIMARY KEY, num_rows INTEGER, num_cols INTEGER, num_mines INTEGER, '
+                         'click_row INTEGER, click_col INTEGER, seed INTEGER, mines BLOB)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS boards_by_config ON boards (num_rows, num_cols, num_mines, click_row, click_col, id)')
+        self._db.commit()
+
+    def count(self, num_rows, num_cols, num_mines, first_click):
+        '''
+            Number of cached boards of a configuration.
+        '''
+        return self._db.execute('SELECT COUNT(*) FROM boards WHERE num_rows = ? AND num_cols = ? AND num_mines = ? AND click_row = ? AND click_col = ?',
+                                (num_rows, num_cols, num_mines) + tuple(first_click)).fetchone()[0]
+
+    def add(self, num_rows, num_cols, num_mines, first_click, boards):
+        '''
+            Store boards of a configuration: an iterable of (seed, mines) pairs as given by generate_boards().
+        '''
+        with self._db:
+            self._db.executemany('INSERT INTO boards (num_rows, num_cols, num_mines, click_row, click_col, seed, mines) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                 [(num_rows, num_cols, num_mines, first_click[0], first_click[1], seed, pack_mines(mines)) for seed, mines in boards])
+
+    def take(self, num_rows, num_cols, num_mines, first_click):
+        '''
+            Remove the oldest cached board of a configuration.
+
+            @Return -- (seed, mines) of the board, or None if there is none
+
+        '''
+        with self._db:
+            row = self._db.execute('SELECT id, seed, mines FROM boards WHERE num_rows = ? AND num_cols = ? AND num_mines = ? AND click_row = ? AND click_col = ? '
+                                   'ORDER BY id LIMIT 1', (num_rows, num_cols, num_mines) + tuple(first_click)).fetchone()
+            if row is None:
+                return None
+            self._db.execute('DELETE FROM boards WHERE id = ?', (row[0],))
+        return row[1], unpack_mines(row[2], num_rows, num_cols)
+
+    def fill(self, num_rows, num_cols, num_mines, first_click, count, seed = None, workers = None, commit_every = 100):
+        '''
+            Generate boards of a configuration until the cache holds 'count' of them.
+
+            @Return -- number of boards added
+
+        '''
+        missing = count - self.count(num_rows, num_cols, num_mines, first_click)
+        added, boards = 0, []
+        if missing > 0:
+            for board in generate_boards(num_rows, num_cols, num_mines, first_click, missing, seed = seed, workers = workers):
+                boards.append(board)
+                if len(boards) == commit_every:
+                    self.add(num_rows, num_cols, num_mines, first_click, boards)
+                    added, boards = added + len(boards), []
+            self.add(num_rows, num_cols, num_mines, first_click, boards)
+            added += len(boards)
+        return added
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def no_guess_board(num_rows, num_cols, num_mines, first_click, cache = None, field_type = MineField, seed = None, workers = None):
+    '''
+        A board solvable without guessing when its first move reveals 'first_click' (row, col): taken from 'cache'
+        (a BoardCache) if it holds one of this configuration, generated otherwise.
+
+        @Return -- a minefield of type 'field_type' (not initialised, as from create_new()), to play with Game(..., minefield = board)
+
+    '''
+    board = cache.take(num_rows, num_cols, num_mines, first_click) if cache is not None else None
+    if board is None:
+        board = next(generate_boards(num_rows, num_cols, num_mines, first_click, 1, seed = seed, workers = workers))
+    return field_type.from_mines(board[1])
+
+
+
+if __name__ == '__main__':
+
+    import time
+
+    start = time.perf_counter()
+    boards = list(generate_boards(16, 30, 99, (8, 15), 20, seed = 1))
+    print("20 expert boards without guessing in %.2f s"%(time.perf_counter() - start))
+    print(ArrayMineField.from_mines(boards[0][1]).mine_mask.astype(int))
@@ -0,0 +1,389 @@
+'''
+
+Exact mine probabilities for guessing. Cells that the mine placement keeps free of mines (the corners,
+and the first click's neighbourhood when it applies; see mine_free_cells) are known to be safe. The
+unknown cells next to revealed numbers (the frontier) are
+split into independent components (cells linked by shared constraints), the valid mine configurations
+of each component are enumerated (memoised on the residual counts of the constraints still open), and
+the components are combined with the cells away from the frontier through the number of ways the
+remaining mines can be spread over those cells.
+
+Components larger than max_component_size, or enumerated after the time budget has run out, are
+estimated by Monte Carlo sampling instead, so large frontiers never stall the game loop.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: probability.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import math
+import random
+import time
+
+import numpy as np
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+def _board_state(minefield):
+    '''
+        visible (safe cells only), numbers (of visible cells) and flagged arrays of any of the minefield engines.
+    '''
+    if hasattr(minefield, 'visible_mask'):
+        visible = minefield.visible_mask & ~minefield.mine_mask
+        return visible, np.where(visible, minefield.number_grid, 0), minefield.flag_mask.copy()
+
+    shape = (minefield.num_rows, minefield.num_cols)
+    visible, numbers, flagged = np.zeros(shape, dtype=bool), np.zeros(shape, dtype=np.int8), np.zeros(shape, dtype=bool)
+    for r, row in enumerate(minefield):
+        for c, cell in enumerate(row):
+            flagged[r, c] = cell.is_flagged
+            if cell.is_visible and not cell._is_mine:
+                visible[r, c] = True
+                numbers[r, c] = cell.get_number()
+    return visible, numbers, flagged
+
+
+class _Component(object):
+    '''
+        A set of frontier cells ('cells', flat indices) with the constraints over them, as
+        (list of positions in 'cells', number of mines) pairs.
+    '''
+
+    def __init__(self, cells, constraints):
+        self.cells = cells
+        self.constraints = constraints
+
+    def _ordered(self):
+        '''
+            Cells re-ordered so that constraints open and close quickly (breadth-first along the constraints),
+            with, for every position, the constraints containing it and the constraints open there.
+        '''
+        n = len(self.cells)
+        constraints_of = [[] for _ in range(n)]
+        for j, (members, _) in enumerate(self.constraints):
+            for v in members:
+                constraints_of[v].append(j)
+
+        order, seen = [], [False]*n
+        for start in range(n):
+            if seen[start]:
+                continue
+            queue = [start]
+            seen[start] = True
+            while queue:
+                v = queue.pop(0)
+                order.append(v)
+                for j in constraints_of[v]:
+                    for w in self.constraints[j][0]:
+                        if not seen[w]:
+                            seen[w] = True
+                            queue.append(w)
+
+        position = [0]*n
+        for i, v in enumerate(order):
+            position[v] = i
+        members = [sorted(position[v] for v in m) for m, _ in self.constraints]
+        first = [m[0] for m in members]
+        last = [m[-1] for m in members]
+        containing = [[] for _ in range(n)]
+        for j, m in enumerate(members):
+            for i in m:
+                containing[i].append(j)
+        # ----- sweep for the constraints open at every position (started before it, not finished)
+        open_at, current = [], []
+        for i in range(n):
+            if i:
+                current = [j for j in current if last[j] >= i] + [j for j in containing[i-1] if first[j] == i-1 and last[j] >= i]
+            open_at.append(current)
+        return order, containing, open_at, last
+
+    def enumerate(self, deadline):
+        '''
+            Exact counts of the valid configurations by number of mines.
+
+            @Return -- dict: number of mines -> (number of configurations, array of how many of them have a mine in each cell)
+
+        '''
+        order, containing, open_at, last = self._ordered()
+        n = len(order)
+        residual = [m for _, m in self.constraints]
+        unassigned = [len(members) for members, _ in self.constraints]
+        memo = {}
+        calls = [0]
+
+        def solve(i):
+            if i == n:
+                return {0: (1, np.zeros(0))}
+            key = (i, tuple(residual[j] for j in open_at[i]))
+            if key in memo:
+                return memo[key]
+            calls[0] += 1
+            if calls[0] % 256 == 0 and time.perf_counter() > deadline:
+                raise _BudgetExceeded()
+
+            result = {}
+            for x in (0, 1):
+                feasible = True
+                for j in containing[i]:
+                    residual[j] -= x
+                    unassigned[j] -= 1
+                    if residual[j] < 0 or residual[j] > unassigned[j]:
+                        feasible = False
+                if feasible:
+                    for k, (count, per_cell) in solve(i+1).items():
+                        total, totals = result.get(k+x, (0, None))
+                        head = np.concatenate(([x*count], per_cell))
+                        result[k+x] = (total + count, head if totals is None else totals + head)
+                for j in containing[i]:
+                    residual[j] += x
+                    unassigned[j] += 1
+            memo[key] = result
+            return result
+
+        counts = solve(0)
+        # ----- back from search order to the order of self.cells
+        inverse = np.argsort(order)
+        return dict((k, (float(count), per_cell[inverse].astype(float))) for k, (count, per_cell) in counts.items())
+
+    def sample(self, num_samples, rng, deadline):
+        '''
+            Monte Carlo estimate of the counts by sequential importance sampling: cells are assigned in order,
+            each choice limited to the values that keep every constraint satisfiable and weighted by the inverse
+            of its probability; assignments reaching a dead end count for nothing.
+            Same format as enumerate(), up to a common scale factor. Stops early at 'deadline' (after at least one attempt).
+
+        '''
+        order, containing, _, _ = self._ordered()
+        n = len(order)
+        samples = [] # (log weight, configuration in search order)
+        for attempt in range(num_samples):
+            if attempt and time.perf_counter() > deadline:
+                break
+            residual = [m for _, m in self.constraints]
+            unassigned = [len(members) for members, _ in self.constraints]
+            values = []
+            log_weight = 0.
+            for i in range(n):
+                feasible = []
+                for x in (0, 1):
+                    if all(0 <= residual[j] - x <= unassigned[j] - 1 for j in containing[i]):
+                        feasible.append(x)
+                if not feasible:
+                    break
+                if len(feasible) == 2:
+                    # propose a mine about as often as the tightest constraint suggests
+                    q = max(residual[j]/float(unassigned[j]) for j in containing[i])
+                    q = min(max(q, 0.05), 0.95)
+                    x = 1 if rng.random() < q else 0
+                    log_weight -= math.log(q if x else 1. - q)
+                else:
+                    x = feasible[0]
+                for j in containing[i]:
+                    residual[j] -= x
+                    unassigned[j] -= 1
+                values.append(x)
+            else:
+                samples.append((log_weight, values))
+
+        counts = {}
+        if not samples:
+            return counts
+        top = max(log_weight for log_weight, _ in samples)
+        inverse = np.argsort(order)
+        for log_weight, values in samples:
+            weight = math.exp(log_weight - top)
+            config = np.array(values, dtype=float)[inverse]
+            k = int(config.sum())
+            total, totals = counts.get(k, (0., np.zeros(n)))
+            counts[k] = (total + weight, totals + weight*config)
+        return counts
+
+    def local_estimate(self):
+        '''
+            Rough estimate from the constraints alone, for when sampling finds no valid configuration in time:
+            every cell gets the average mine density of the constraints containing it. Same format as enumerate().
+        '''
+        density, num_constraints = np.zeros(len(self.cells)), np.zeros(len(self.cells))
+        for members, mines in self.constraints:
+            density[members] += mines/float(len(members))
+            num_constraints[members] += 1
+        density = np.clip(density/num_constraints, 0., 1.)
+        return {int(round(density.sum())): (1., density)}
+
+
+def _frontier_components(visible, numbers, unknown, known_mines):
+    '''
+        Split the frontier into independent components.
+
+        @Return -- list of _Component, and a bool mask of the frontier cells
+    '''
+    num_rows, num_cols = visible.shape
+    padded = np.pad(unknown, 1)
+    has_unknown_neighbour = np.zeros(visible.shape, dtype=bool)
+    for dr in range(3):
+        for dc in range(3):
+            if dr != 1 or dc != 1:
+                has_unknown_neighbour |= padded[dr:dr+num_rows, dc:dc+num_cols]
+    constraint_cells = np.argwhere(visible & has_unknown_neighbour)
+
+    raw = [] # (unknown flat cells, mines)
+    for r, c in constraint_cells.tolist():
+        window = (slice(max(r-1, 0), r+2), slice(max(c-1, 0), c+2))
+        rows, cols = np.nonzero(unknown[window])
+        cells = ((rows + window[0].start)*num_cols + cols + window[1].start).tolist()
+        raw.append((cells, int(numbers[r, c]) - int(known_mines[window].sum())))
+
+    # ----- union-find over cells sharing a constraint
+    parent = {}
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    for cells, _ in raw:
+        for cell in cells:
+            parent.setdefault(cell, cell)
+        for cell in cells[1:]:
+            a, b = find(cells[0]), find(cell)
+            if a != b:
+                parent[a] = b
+
+    groups = {}
+    for cell in parent:
+        groups.setdefault(find(cell), []).append(cell)
+    constraints_of_group = {}
+    for cells, mines in raw:
+        constraints_of_group.setdefault(find(cells[0]), []).append((cells, mines))
+
+    components = []
+    frontier = np.zeros(visible.shape, dtype=bool)
+    for root, cells in groups.items():
+        index = dict((cell, i) for i, cell in enumerate(cells))
+        constraints = [([index[cell] for cell in members], mines) for members, mines in constraints_of_group[root]]
+        components.append(_Component(cells, constraints))
+        frontier.ravel()[cells] = True
+    return components, frontier
+
+
+def mine_probabilities(minefield, num_mines = None, time_budget = 0.05, max_component_size = 48,
+                       num_samples = 2000, seed = None, trust_flags = False, known_mines = None, mine_free = None):
+    '''
+        Probability of every cell of 'minefield' being a mine, given what is visible.
+
+        Args:
+            num_mines: total number of mines on the board (read from the minefield if None)
+            time_budget: seconds allowed for exact enumeration; components left when it runs out are sampled
+            max_component_size: components with more cells than this are always sampled
+            num_samples: samples per component for the Monte Carlo estimate
+            seed: seed for the sampling
+            trust_flags: treat flagged cells as known mines (otherwise flags are ignored)
+            known_mines: optional bool array (rows x cols) of cells known to be mines (e.g. proven by a solver)
+            mine_free: optional bool array (rows x cols) of cells known to be safe; by default the cells that the mine
+                       placement of the minefield keeps free (its mine_free_cells, e.g. the corners)
+
+        @Return -- float array (rows x cols); 0 for revealed cells
+
+    '''
+    deadline = time.perf_counter() + time_budget
+    sampling_budget = time_budget/4. # per sampled component, once the budget has run out
+    rng = random.Random(seed)
+
+    if num_mines is None:
+        num_mines = minefield._num_mines + getattr(minefield, '_pending_mines', 0)
+
+    visible, numbers, flagged = _board_state(minefield)
+    known_mines = np.zeros(visible.shape, dtype=bool) if known_mines is None else known_mines & ~visible
+    if trust_flags:
+        known_mines = known_mines | (flagged & ~visible)
+    if mine_free is None:
+        mine_free = np.zeros(visible.shape, dtype=bool)
+        mine_free.ravel()[sorted(getattr(minefield, 'mine_free_cells', ()))] = True
+    unknown = ~visible & ~known_mines & ~mine_free
+
+    components, frontier = _frontier_components(visible, numbers, unknown, known_mines)
+    interior = unknown & ~frontier
+    num_interior = int(interior.sum())
+    remaining = num_mines - int(known_mines.sum())
+
+    # ----- per component: distribution over its number of mines, and per-cell mine weights for each count
+    distributions, cell_weights = [], []
+    components.sort(key = lambda component: len(component.cells)) # the exact budget goes to as many components as possible
+    for component in components:
+        counts = None
+        if len(component.cells) <= max_component_size and time.perf_counter() < deadline:
+            try:
+                counts = component.enumerate(deadline)
+            except _BudgetExceeded:
+                counts = None
+        if counts is None:
+            counts = component.sample(num_samples, rng, max(deadline, time.perf_counter() + sampling_budget))
+        if not counts:
+            counts = component.local_estimate()
+        size = max(counts) + 1
+        distribution = np.zeros(size)
+        weights = np.zeros((size, len(component.cells)))
+        for k, (count, per_cell) in counts.items():
+            distribution[k] = count
+            weights[k] = per_cell
+        scale = distribution.max()
+        distributions.append(distribution/scale)
+        cell_weights.append(weights/scale)
+
+    # ----- ways of spreading the remaining mines over the interior, as log-weights by number of frontier mines
+    def interior_weights(length):
+        f = np.arange(length)
+        m = remaining - f
+        valid = (m >= 0) & (m <= num_interior)
+        log_w = np.full(length, -np.inf)
+        log_w[valid] = [math.lgamma(num_interior+1) - math.lgamma(x+1) - math.lgamma(num_interior-x+1) for x in m[valid]]
+        return log_w
+
+    # ----- prefix/suffix convolutions give, for each component, the distribution of all the others
+    prefix = [np.ones(1)]
+    for distribution in distributions:
+        prefix.append(np.convolve(prefix[-1], distribution))
+    suffix = [np.ones(1)]
+    for distribution in reversed(distributions):
+        suffix.append(np.convolve(suffix[-1], distribution))
+    suffix = suffix[::-1]
+
+    total = prefix[-1]
+    log_w = interior_weights(len(total))
+    if np.all(np.isinf(log_w)):
+        log_w = np.zeros(len(total)) # inconsistent mine count; fall back to ignoring it
+    shift = log_w.max()
+    w = np.exp(log_w - shift)
+    normaliser = float(np.dot(total, w))
+
+    probabilities = np.zeros(visible.shape)
+    flat = probabilities.ravel()
+    for i, component in enumerate(components):
+        others = np.convolve(prefix[i], suffix[i+1])
+        # weight of this component having k mines: sum over the others' counts g of others[g] * w[k+g]
+        w_k = np.array([np.dot(others, w[k:k+len(others)]) for k in range(len(distributions[i]))])
+        flat[component.cells] = np.dot(w_k, cell_weights[i])/normaliser
+
+    if num_interior:
+        f = np.arange(len(total))
+        flat[interior.ravel()] = float(np.dot(total*w, np.clip(remaining - f, 0, None)))/normaliser/num_interior
+    flat[known_mines.ravel()] = 1.
+
+    return np.clip(probabilities, 0., 1.)
+
+
+
+if __name__ == '__main__':
+
+    from pyminesweeper.core import ArrayMineField
+
+    field = ArrayMineField.create_new(9, 9, 10, seed = 1, first_click_safe = True)
+    field.initialise()
+    field.reveal_cells(4, 4)
+
+    print(field)
+    print(np.round(mine_probabilities(field), 2))
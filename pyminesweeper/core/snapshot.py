@@ -0,0 +1,263 @@
+'''
+
+Compact binary save files for minefields and games. A file is a fixed 64-byte header (shape, number of
+mines, seed, engine, game status) followed by three bit planes (mines, visible, flagged), each packed
+row by row at one bit per cell. A board therefore costs about 3/8 of a byte per cell on disk, against
+hundreds of bytes per cell for a pickled MineField.
+
+    game.save('game.pms')
+    game = Game.load('game.pms')
+
+BoardSnapshot opens a file memory-mapped, so that reading some rows or cells of a large saved board
+only pages in the bytes of those rows.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: snapshot.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import struct
+
+import numpy as np
+
+MAGIC = b'PYMS'
+VERSION = 1
+HEADER = struct.Struct('<4sBBbBIIIIQq') # magic, version, engine, game status, flags, rows, cols, mines, pending mines, revealed safe cells, seed
+HEADER_SIZE = 64 # header is padded, so that the planes start aligned
+
+# ----- header flags
+PLAYING = 1
+INITIALISED = 2
+SAFE_NEIGHBOURHOOD = 4
+HAS_SEED = 8
+HAS_STATUS = 16 # saved from a Game (the status field is meaningful)
+
+ENGINES = ('MineField', 'ArrayMineField') # engine byte -> class name
+
+NUM_PLANES = 3 # mines, visible, flagged
+
+
+def _engines():
+    from pyminesweeper.core import MineField, ArrayMineField
+    return (MineField, ArrayMineField)
+
+
+def _masks(minefield):
+    '''
+        mines, visible and flagged bool arrays of a MineField or ArrayMineField.
+    '''
+    if hasattr(minefield, 'visible_mask'):
+        return minefield.mine_mask, minefield.visible_mask, minefield.flag_mask
+
+    shape = (minefield.num_rows, minefield.num_cols)
+    mines, visible, flagged = np.zeros(shape, dtype=bool), np.zeros(shape, dtype=bool), np.zeros(shape, dtype=bool)
+    for r, row in enumerate(minefield):
+        for c, cell in enumerate(row):
+            mines[r, c], visible[r, c], flagged[r, c] = cell._is_mine, cell.is_visible, cell.is_flagged
+    return mines, visible, flagged
+
+
+def dumps(minefield, status = None):
+    '''
+        Save file contents (bytes) of a minefield.
+
+        Args:
+            minefield: a MineField or ArrayMineField, in any state
+            status: Game.GameStatus of the game the minefield belongs to, if any
+
+    '''
+    if not isinstance(minefield, _engines()):
+        raise Exception("Cannot save a %s: only MineField and ArrayMineField boards can be saved."%type(minefield).__name__)
+    engine = ENGINES.index('ArrayMineField' if hasattr(minefield, 'visible_mask') else 'MineField')
+
+    mines, visible, flagged = _masks(minefield)
+    seed = minefield.seed
+    has_seed = isinstance(seed, int) and -2**63 <= seed < 2**63
+
+    flags = ((PLAYING if minefield._is_playing else 0) |
+             (INITIALISED if hasattr(minefield, 'safe_cells') else 0) |
+             (SAFE_NEIGHBOURHOOD if minefield._safe_neighbourhood else 0) |
+             (HAS_SEED if has_seed else 0) |
+             (HAS_STATUS if status is not None else 0))
+
+    header = HEADER.pack(MAGIC, VERSION, engine, status.value if status is not None else 0, flags,
+                         minefield.num_rows, minefield.num_cols, minefield._num_mines, minefield._pending_mines,
+                         minefield.revealed_safe_cells, seed if has_seed else 0)
+
+    planes = [np.packbits(plane, axis=1, bitorder='little').tobytes() for plane in (mines, visible, flagged)]
+    return header.ljust(HEADER_SIZE, b'\0') + b''.join(planes)
+
+
+def _read_header(data):
+    '''
+        Parsed header of save file contents: dict of the header fields.
+    '''
+    if len(data) < HEADER_SIZE:
+        raise Exception("Not a PyMinesweeper save file: too short")
+    magic, version, engine, status, flags, rows, cols, num_mines, pending, revealed, seed = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise Exception("Not a PyMinesweeper save file")
+    if version != VERSION:
+        raise Exception("Unsupported save file version %d (expected %d)"%(version, VERSION))
+
+    row_bytes = (cols + 7)//8
+    if len(data) < HEADER_SIZE + NUM_PLANES*rows*row_bytes:
+        raise Exception("Truncated save file: expected %d bytes of cell data"%(NUM_PLANES*rows*row_bytes))
+
+    return {'engine': engine, 'status': status if flags & HAS_STATUS else None, 'flags': flags,
+            'num_rows': rows, 'num_cols': cols, 'num_mines': num_mines, 'pending_mines': pending,
+            'revealed_safe_cells': revealed, 'seed': seed if flags & HAS_SEED else None, 'row_bytes': row_bytes}
+
+
+def _build_minefield(header, mines, visible, flagged, field_type = None):
+    '''
+        Minefield of type 'field_type' (default: the engine it was saved from) in the saved state.
+    '''
+    field_type = field_type or _engines()[header['engine']]
+    flags = header['flags']
+
+    board = field_type.from_mines(mines)
+    board.seed = header['seed']
+    board._safe_neighbourhood = bool(flags & SAFE_NEIGHBOURHOOD)
+    if header['pending_mines']:
+        # ----- mines not placed yet: the same seed places them as it would have
+        board._pending_mines = header['pending_mines']
+        board._rng = _generator_for(board, header['seed'])
+
+    if flags & INITIALISED:
+        board.initialise()
+        board._is_playing = bool(flags & PLAYING)
+
+    board._restore_state(visible, flagged)
+    return board
+
+
+def _generator_for(board, seed):
+    '''
+        Random number generator for deferred mine placement, of the kind create_new() gives the engine.
+    '''
+    from pyminesweeper.core.minefield import _make_random
+    from pyminesweeper.core.array_minefield import _make_generator
+    return _make_generator(seed) if hasattr(board, 'visible_mask') else _make_random(seed)
+
+
+def loads(data, field_type = None):
+    '''
+        Minefield saved in 'data' (bytes or a bytes-like buffer).
+
+        Args:
+            field_type: engine to load the board into (MineField or ArrayMineField); the engine it was saved from if None
+
+        @Return -- the minefield, and the Game.GameStatus value saved with it (None if it was saved without a game)
+
+    '''
+    header = _read_header(data)
+    planes = _unpack_planes(np.frombuffer(data, dtype=np.uint8, count=NUM_PLANES*header['num_rows']*header['row_bytes'], offset=HEADER_SIZE), header)
+    return _build_minefield(header, *planes, field_type = field_type), header['status']
+
+
+def _unpack_planes(buffer, header):
+    planes = buffer.reshape(NUM_PLANES, header['num_rows'], header['row_bytes'])
+    return [np.unpackbits(plane, axis=1, count=header['num_cols'], bitorder='little').view(bool) for plane in planes]
+
+
+def save(minefield, path, status = None):
+    '''
+        Write a minefield (and the status of its game, if given) to a save file.
+    '''
+    with open(path, 'wb') as f:
+        f.write(dumps(minefield, status))
+
+
+def load(path, field_type = None):
+    '''
+        Read a save file into a minefield. The whole board is unpacked into memory; BoardSnapshot reads only the rows
+        or cells asked for.
+
+        @Return -- the minefield, and the Game.GameStatus value saved with it (None if it was saved without a game)
+
+    '''
+    with BoardSnapshot(path) as snapshot:
+        return snapshot.to_minefield(field_type), snapshot.status
+
+
+class BoardSnapshot(object):
+
+    '''
+        Read-only, memory-mapped view of a save file. The header is read on opening; the cell data is only
+        paged in as rows or cells are accessed, so inspecting part of a huge saved board is cheap.
+
+            with BoardSnapshot('big.pms') as snapshot:
+                print(snapshot.num_rows, snapshot.num_cols, snapshot.num_mines)
+                print(snapshot.visible(100, 110)) # rows 100 to 109 only
+
+    '''
+
+    def __init__(self, path):
+
+        self.path = path
+        self._data = np.memmap(path, dtype=np.uint8, mode='r')
+        self._header = _read_header(self._data)
+
+        self.num_rows = self._header['num_rows']
+        self.num_cols = self._header['num_cols']
+        self.num_mines = self._header['num_mines'] + self._header['pending_mines']
+        self.seed = self._header['seed']
+        self.is_playing = bool(self._header['flags'] & PLAYING)
+        self.revealed_safe_cells = self._header['revealed_safe_cells']
+
+        self._planes = self._data[HEADER_SIZE:HEADER_SIZE + NUM_PLANES*self.num_rows*self._header['row_bytes']].reshape(
+                            NUM_PLANES, self.num_rows, self._header['row_bytes'])
+
+    @property
+    def status(self):
+        '''
+            Game.GameStatus value the board was saved with (None if it was saved without a game)
+        '''
+        return self._header['status']
+
+    @property
+    def engine(self):
+        return ENGINES[self._header['engine']]
+
+    def _rows(self, plane, start, stop):
+        start, stop, _ = slice(start, stop).indices(self.num_rows)
+        return np.unpackbits(self._planes[plane, start:stop], axis=1, count=self.num_cols, bitorder='little').view(bool)
+
+    def mines(self, start = None, stop = None):
+        '''
+            bool array of the mines in rows [start, stop) (all rows by default). Mines still to be placed on the first click are not included.
+        '''
+        return self._rows(0, start, stop)
+
+    def visible(self, start = None, stop = None):
+        return self._rows(1, start, stop)
+
+    def flagged(self, start = None, stop = None):
+        return self._rows(2, start, stop)
+
+    def cell(self, row, col):
+        '''
+            @Return -- is_mine, is_visible, is_flagged of the cell at [row,col] (reads one byte of each plane)
+        '''
+        byte, bit = divmod(col, 8)
+        return tuple(bool((self._planes[plane, row, byte] >> bit) & 1) for plane in range(NUM_PLANES))
+
+    def to_minefield(self, field_type = None):
+        '''
+            Load the whole board into a minefield (of the engine it was saved from if 'field_type' is None).
+        '''
+        return _build_minefield(self._header, *_unpack_planes(self._planes, self._header), field_type = field_type)
+
+    def close(self):
+        self._planes = None # the file is unmapped once no array refers to it
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
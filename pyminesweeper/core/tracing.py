@@ -0,0 +1,259 @@
+'''
+
+Opt-in instrumentation of the hot paths of PyMinesweeper (Game.play_move, reveal_cells, initialise,
+mine generation and GUI rendering). While tracing is disabled every instrumented call only pays for
+one flag check; when enabled, each call is timed and counted, the numbers it reports (e.g. cells
+opened) go into histograms, registered callbacks are called, and the statistics can be dumped to a
+JSON file periodically.
+
+    from pyminesweeper.core.tracing import tracer
+    tracer.enable(dump_path = 'trace.json', dump_interval = 5.)
+    ...
+    print(tracer.summary())
+
+For a single game under cProfile, use profiled() (or the --profile flag of the command-line script).
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: tracing.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import functools
+import json
+import math
+import os
+import sys
+import time
+
+
+class Histogram(object):
+    '''
+        Histogram with power-of-two buckets: constant memory, percentiles accurate to a factor of two.
+    '''
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.
+        self.min = None
+        self.max = None
+        self.buckets = {} # exponent e -> number of values in [2**(e-1), 2**e)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        exponent = math.frexp(value)[1] if value > 0 else None
+        self.buckets[exponent] = self.buckets.get(exponent, 0) + 1
+
+    def percentile(self, q):
+        '''
+            Upper bound of the bucket holding the q-th percentile (q in [0, 100]), capped at the maximum.
+        '''
+        if not self.count:
+            return 0.
+        rank = q/100.*self.count
+        seen = 0
+        for exponent in sorted(self.buckets, key = lambda e: -math.inf if e is None else e):
+            seen += self.buckets[exponent]
+            if seen >= rank:
+                return 0. if exponent is None else min(math.ldexp(1., exponent), self.max)
+        return self.max
+
+    def summary(self):
+        return {'count': self.count, 'mean': self.total/self.count if self.count else 0., 'min': self.min, 'max': self.max,
+                'p50': self.percentile(50), 'p90': self.percentile(90), 'p99': self.percentile(99)}
+
+
+class Tracer(object):
+
+    '''
+        Collects counters and histograms of the instrumented events. Use the module-level 'tracer' instance.
+
+        Every instrumented call to an event (e.g. 'reveal_cells') increments the counter of the event,
+        adds its duration (seconds) to the histogram of the event, and adds every number it reports
+        (e.g. 'cells') to the histogram 'event.name'. Callbacks are called as callback(event, duration, info).
+
+    '''
+
+    def __init__(self):
+
+        self.enabled = False
+        self.counters = {}
+        self.histograms = {}
+
+        self._callbacks = {} # event (None for all events) -> list of callbacks
+        self._dump_path = None
+        self._dump_interval = None
+        self._next_dump = None
+
+    def enable(self, dump_path = None, dump_interval = 10.):
+        '''
+            Start tracing.
+
+            Args:
+                dump_path: file to write the statistics to (as JSON) every 'dump_interval' seconds and on disable()
+                dump_interval: seconds between dumps (checked whenever an event is recorded)
+
+        '''
+        self._dump_path = dump_path
+        self._dump_interval = dump_interval
+        self._next_dump = time.perf_counter() + dump_interval if dump_path else None
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self._dump_path:
+            self.dump()
+
+    def reset(self):
+        self.counters.clear()
+        self.histograms.clear()
+
+    def add_callback(self, callback, event = None):
+        '''
+            Call callback(event, duration, info) after every instrumented call to 'event' (every event if None).
+        '''
+        self._callbacks.setdefault(event, []).append(callback)
+
+    def remove_callback(self, callback, event = None):
+        self._callbacks.get(event, []).remove(callback)
+
+    def count(self, name, n = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, value):
+        '''
+            Add 'value' to the histogram 'name'.
+        '''
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(value)
+
+    def record(self, event, duration, info = None):
+        '''
+            Record one call to 'event' that took 'duration' seconds. 'info' is an optional dict of numbers reported by the call.
+        '''
+        self.count(event)
+        self.observe(event, duration)
+        if info:
+            for name, value in info.items():
+                self.observe('%s.%s'%(event, name), value)
+
+        for callback in self._callbacks.get(event, ()):
+            callback(event, duration, info)
+        for callback in self._callbacks.get(None, ()):
+            callback(event, duration, info)
+
+        if self._next_dump is not None and time.perf_counter() >= self._next_dump:
+            self.dump()
+            self._next_dump = time.perf_counter() + self._dump_interval
+
+    def stats(self):
+        '''
+            @Return -- dict with the 'counters' and a summary of every histogram ('histograms')
+        '''
+        return {'time': time.time(), 'counters': dict(self.counters),
+                'histograms': dict((name, histogram.summary()) for name, histogram in self.histograms.items())}
+
+    def dump(self, path = None):
+        '''
+            Write stats() as JSON to 'path' (default: the dump_path given to enable()), replacing the file atomically.
+        '''
+        path = path or self._dump_path
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.stats(), f, indent = 1)
+        os.replace(path + '.tmp', path)
+
+    def summary(self):
+        '''
+            Human-readable table of the events: calls and latency percentiles, and the histograms of reported numbers.
+        '''
+        lines = ['%-32s %8s %10s %10s %10s %10s'%('event', 'calls', 'mean', 'p50', 'p99', 'max')]
+        for name in sorted(self.histograms):
+            s = self.histograms[name].summary()
+            if name in self.counters: # timed event: durations in ms
+                lines.append('%-32s %8d %8.3fms %8.3fms %8.3fms %8.3fms'%(name, s['count'], 1e3*s['mean'], 1e3*s['p50'], 1e3*s['p99'], 1e3*s['max']))
+            else:
+                lines.append('%-32s %8d %10.1f %10.1f %10.1f %10.1f'%(name, s['count'], s['mean'], s['p50'], s['p99'], s['max']))
+        return '\n'.join(lines)
+
+
+tracer = Tracer()
+
+
+def traced(event, info = None):
+    '''
+        Decorator instrumenting a function as 'event'. 'info', if given, maps the function's return value
+        to the dict of numbers to record with it (e.g. lambda opened: {'cells': len(opened)}).
+    '''
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            tracer.record(event, time.perf_counter() - start, info(result) if info else None)
+            return result
+        return wrapper
+    return decorate
+
+
+class profiled(object):
+
+    '''
+        Context manager running its block under cProfile with tracing enabled. On exit (also through
+        sys.exit(), e.g. when the GUI is closed) it prints the tracer summary and the top functions
+        of the profile, or saves the profile to 'output' (for pstats / snakeviz) if given.
+
+            with profiled():
+                GUI(Game(16, 30, 99, False)).run()
+
+    '''
+
+    def __init__(self, output = None, sort = 'cumulative', limit = 30, dump_path = None):
+        self._output = output
+        self._sort = sort
+        self._limit = limit
+        self._dump_path = dump_path
+        self._profile = None
+
+    def __enter__(self):
+        import cProfile
+        tracer.enable(dump_path = self._dump_path)
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return self._profile
+
+    def __exit__(self, *exc_info):
+        import pstats
+        self._profile.disable()
+        tracer.disable()
+
+        print(tracer.summary())
+        if self._output:
+            self._profile.dump_stats(self._output)
+            print("Profile written to %s"%self._output)
+        else:
+            pstats.Stats(self._profile, stream = sys.stdout).sort_stats(self._sort).print_stats(self._limit)
+        return False
+
+
+
+if __name__ == '__main__':
+
+    from pyminesweeper.core import Game
+    from pyminesweeper.core.tracing import tracer, profiled # the instance the engines use, not this script's copy
+
+    tracer.add_callback(lambda event, duration, info: print(event, '%.1f us'%(1e6*duration), info), 'reveal_cells')
+
+    with profiled(limit = 10):
+        game = Game(30, 30, 120, end_program_when_game_finishes = False, seed = 0, first_click_safe = True)
+        game.start_game()
+        for row in range(30):
+            if game.is_running:
+                game.play_move(row, row, Game.GameAction.REVEAL)
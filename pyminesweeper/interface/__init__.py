@@ -1,3 +1,24 @@
+from .interface import GameInterface, AsyncGameInterface
 
-from .interface import GameInterface
-from .gui import GUI
+# ----- front-ends are imported on first access (PEP 562): the GUI needs pygame, and bots should not pay for it
+_LAZY = {'GUI': 'gui',
+         'ConstraintSolverInterface': 'solver_interface',
+         'RemoteGame': 'remote',
+         'RemoteGameInterface': 'remote',
+         'GameServer': 'server',
+         'run_tournament': 'tournament'}
+
+__all__ = ['GameInterface', 'AsyncGameInterface'] + list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+        value = getattr(import_module('.' + _LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module %r has no attribute %r"%(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
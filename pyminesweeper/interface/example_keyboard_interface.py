@@ -8,8 +8,37 @@ An Example child class to show the usage of the Interface super class. This clas
     @package: pyminesweeper v0.9
 
 '''
+import asyncio
+
 from pyminesweeper.core import Game
-from pyminesweeper.interface import GameInterface
+from pyminesweeper.interface import GameInterface, AsyncGameInterface
+
+def parse_move(text):
+	'''
+		Parse keyboard input in the format: <row> <col> <action>
+
+		@Return -- row, col, action; or None (after printing why) if the input is invalid
+
+	'''
+	inp = text.split()
+
+	if len(inp) != 3:
+		print("Invalid input. Provide row_id, col_id, and action (R / F) separated by spaces.")
+		return None
+
+	row = int(inp[0])
+	col = int(inp[1])
+
+	if inp[2] == 'r' or inp[2] == 'R':
+		action = Game.GameAction.REVEAL 
+	elif inp[2] == 'f' or inp[2] == 'F':
+		action = Game.GameAction.FLAG
+	else:
+		print ("Invalid Action: Provide 'R'/'F' as action.")
+		return None
+
+	return row, col, action
+
 
 class ExampleKeyboardInterface(GameInterface):
 
@@ -18,25 +47,27 @@ class ExampleKeyboardInterface(GameInterface):
 			Get keyboard input from user in the format: <row> <col> <action>
 		'''
 
-		inp =  input("Enter <row> <col> <action>: ").split()
+		move = parse_move(input("Enter <row> <col> <action>: "))
 
-		if len(inp) != 3:
-			print("Invalid input. Provide row_id, col_id, and action (R / F) separated by spaces.")
+		if move is None:
 			return self.get_input()
 
-		row = int(inp[0])
-		col = int(inp[1])
+		return move
 
-		if inp[2] == 'r' or inp[2] == 'R':
-			action = Game.GameAction.REVEAL 
-		elif inp[2] == 'f' or inp[2] == 'F':
-			action = Game.GameAction.FLAG
-		else:
-			print ("Invalid Action: Provide 'R'/'F' as action.")
-			return self.get_input()
 
-		return row, col, action
+class ExampleAsyncKeyboardInterface(AsyncGameInterface):
+
+	'''
+		The same with AsyncGameInterface: input() runs in a thread, so other games in the event loop go on while waiting for the user.
+	'''
+
+	async def get_input(self):
+
+		move = None
+		while move is None:
+			move = parse_move(await asyncio.get_running_loop().run_in_executor(None, input, "Enter <row> <col> <action>: "))
 
+		return move
 
 
 if __name__ == '__main__':
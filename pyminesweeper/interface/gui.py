@@ -9,42 +9,26 @@ A PyGame GUI for PyMinesweeper defined using the Interface base class.
 
 '''
 import pygame, sys
-from pygame.locals import *
+from pygame.locals import QUIT, KEYUP, K_ESCAPE, MOUSEMOTION, MOUSEBUTTONDOWN, NOEVENT, SRCALPHA
 from pyminesweeper.interface import GameInterface
 from pyminesweeper.core import Game
+from pyminesweeper.core.tracing import traced
 
 # ----- set constants
 FPS = 50
+WAKEUP_MS = 500 # longest wait for an event in the event-driven loop
 WINDOWWIDTH = 800
 WINDOWHEIGHT = 900
 # BOXSIZE = 30
 # GAPSIZE = 5
 XMARGIN = 60
 YMARGIN = XMARGIN
+FIELDBOTTOMMARGIN = 140 # space below the field for the buttons and tip text
 
 
 
-# ----- define colors 
-LIGHTGRAY = (225, 225, 225)
-DARKGRAY = (160, 160, 160)
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
-RED = (255, 0, 0)
-BLUE = (0, 0, 255)
-GREEN = (0, 128, 0)
-
-# ----- assign major colors
-BGCOLOR = WHITE
-FIELDCOLOR = BLACK
-BOXCOLOR_COV = DARKGRAY # covered box color
-BOXCOLOR_REV = LIGHTGRAY # revealed box color
-MINECOLOR = BLACK
-TEXTCOLOR_1 = BLUE
-TEXTCOLOR_2 = RED
-TEXTCOLOR_3 = BLACK
-HILITECOLOR = GREEN
-RESETBGCOLOR = LIGHTGRAY
-FLAGGEDCELL_COV = RED
+# ----- colors are shared with the headless renderer
+from pyminesweeper.interface.theme import *
 
 # ----- set up font 
 FONTTYPE = 'Courier New'
@@ -52,21 +36,47 @@ FONTSIZE = 20
 
 class GUI(GameInterface):
 
-    def __init__(self, game):
+    def __init__(self, game, record = None, pool = None):
+        '''
+            Args:
+                record: file to write the move log of the game to (see Game.record()); after a reset it holds the new game
+                pool: BoardPool (of the size of 'game') to take the boards of new games from when the game is reset
+
+        '''
 
         super().__init__(game)
 
+        self._record = record
+        self._pool = pool
+        if record is not None:
+            game.record(record)
+
         self.FIELDWIDTH, self.FIELDHEIGHT, self.NUM_MINES = game.field_info
 
-        self.BOXSIZE = int((5*(XMARGIN+WINDOWWIDTH))/(7*self.FIELDWIDTH)) 
+        # ----- boxes (plus a gap of a sixth of a box) have to fit both across and down the field area
+        self.BOXSIZE = int(min((5*(XMARGIN+WINDOWWIDTH))/(7*self.FIELDWIDTH),
+                               (6*(WINDOWHEIGHT-YMARGIN-FIELDBOTTOMMARGIN))/(7*self.FIELDHEIGHT)))
         self.GAPSIZE = int(self.BOXSIZE/6)
-    
+
         # ----- assertions
-        assert self.BOXSIZE^2 * (self.FIELDHEIGHT*self.FIELDWIDTH) < WINDOWHEIGHT*WINDOWWIDTH, 'Boxes will not fit on screen'
-        assert self.BOXSIZE/2 > 5, 'Bounding errors when drawing rectangle, cannot use half-5 in draw_mines_and_numbers'
+        assert self.BOXSIZE/2 > 5, 'Board of %d x %d cells is too large to draw in the window. Use a headless GameInterface for large boards.'%(self.FIELDWIDTH, self.FIELDHEIGHT)
 
         self._initialise_pygame()
 
+        # ----- every box state is pre-rendered once per box size (kept when the game is reset)
+        if getattr(self, '_TILES_BOXSIZE', None) != self.BOXSIZE:
+            self._TILES = self._build_tiles()
+            self._TILES_BOXSIZE = self.BOXSIZE
+
+        # ----- incremental rendering: the board (without hover highlights) is kept on its own surface,
+        #       and only the cells that changed are repainted there and pushed to the display
+        self._BOARDSURFACE = pygame.Surface((WINDOWWIDTH, WINDOWHEIGHT))
+        self._full_redraw = True
+        self._dirty_cells = set()
+        self._highlight = None # (box_x, box_y) or a button rect that is highlighted on the display
+        self._mouse = None
+        self._hover = (None, None)
+
     def _initialise_pygame(self):
 
         if not pygame.get_init():
@@ -80,12 +90,28 @@ class GUI(GameInterface):
             self._RESET_SURF, self._RESET_RECT = self._draw_button('RESET', TEXTCOLOR_3, RESETBGCOLOR, WINDOWWIDTH/2, WINDOWHEIGHT-120)
             self._SHOW_SURF, self._SHOW_RECT = self._draw_button('REVEAL SOLUTION', TEXTCOLOR_3, RESETBGCOLOR, WINDOWWIDTH/2, WINDOWHEIGHT-95)
 
+            # ----- tip text is rendered once
+            tipFont = pygame.font.SysFont(FONTTYPE, 16) ## not using self._BASICFONT - too big
+            self._TIP_SURFS = [self._render_text('Tip: Highlight a box and right click ', tipFont, TEXTCOLOR_3, WINDOWWIDTH/2, WINDOWHEIGHT-60),
+                               self._render_text('to flag cells that you think contain mines.', tipFont, TEXTCOLOR_3, WINDOWWIDTH/2, WINDOWHEIGHT-40)]
+
             # ----- set background color
         self._DISPLAYSURFACE.fill(BGCOLOR)
 
-    def get_input(self):
-        mouse_x, mouse_y, action = [0, 0, None]
-        for event in pygame.event.get(): 
+    def get_input(self, timeout = None):
+        '''
+            Args:
+                timeout: if given, block for up to 'timeout' ms until an event arrives instead of only polling the queue
+
+        '''
+        (mouse_x, mouse_y), action = pygame.mouse.get_pos(), None
+        events = pygame.event.get()
+        if timeout is not None and not events:
+            event = pygame.event.wait(timeout)
+            if event.type != NOEVENT:
+                events = [event] + pygame.event.get()
+
+        for event in events: 
             if event.type == QUIT or (event.type == KEYUP and event.key == K_ESCAPE):
                 self._terminate()
             elif event.type == MOUSEMOTION:
@@ -101,72 +127,132 @@ class GUI(GameInterface):
 
 
 
-    def run(self):
+    def run(self, event_driven = False, wakeup_ms = WAKEUP_MS):
+        '''
+            Args:
+                event_driven: instead of polling at FPS frames per second, sleep until an input event arrives
+                              (or 'wakeup_ms' ms have passed), so that an idle window uses no CPU
+
+        '''
 
         assert self._game.status != Game.GameStatus.NOT_RUNNING, "Error: Game is not Running!"
 
         while self._game.status == Game.GameStatus.RUNNING:
 
-            mouse1_clicked = False
-            mouse2_clicked = False
-
-            # ----- draw field
-            self._DISPLAYSURFACE.fill(BGCOLOR)
-            pygame.draw.rect(self._DISPLAYSURFACE, FIELDCOLOR, (XMARGIN-5, YMARGIN-5, (self.BOXSIZE+self.GAPSIZE)*self.FIELDWIDTH+5, (self.BOXSIZE+self.GAPSIZE)*self.FIELDHEIGHT+5))
-
-            self._draw_field()
-            self._draw_mines_and_numbers() 
-
-            mouse_x, mouse_y, action = self.get_input()
-
-            self._draw_covers()
-
-            tipFont = pygame.font.SysFont(FONTTYPE, 16) ## not using self._BASICFONT - too big
-            self._draw_text('Tip: Highlight a box and right click ', tipFont, TEXTCOLOR_3, WINDOWWIDTH/2, WINDOWHEIGHT-60)
-            self._draw_text('to flag cells that you think contain mines.', tipFont, TEXTCOLOR_3, WINDOWWIDTH/2, WINDOWHEIGHT-40)
-
-            # ----- determine boxes at clicked areas
-            box_x, box_y = self._get_box_at_pixel(mouse_x, mouse_y)
+            if event_driven:
+                self._frame(wakeup_ms)
+            else:
+                self._frame()
+                self._FPSCLOCK.tick(FPS)
 
-            # ----- mouse not over a box in field
-            if (box_x, box_y) == (None, None):
+    @traced('render')
+    def _frame(self, timeout = None):
+        '''
+            one iteration of the main loop: handle input, repaint what changed and push only the changed areas to the display
 
-                # ----- check if reset box is clicked
-                if self._RESET_RECT.collidepoint(mouse_x, mouse_y):
-                    self._hightlight_button(self._RESET_RECT)
-                    if action == Game.GameAction.REVEAL: 
-                        self._reset_game()
+            Args:
+                timeout: passed to get_input() to block until there is input
 
-                # ----- check if show box is clicked
-                if self._SHOW_RECT.collidepoint(mouse_x, mouse_y):
-                    self._hightlight_button(self._SHOW_RECT)
-                    if action == Game.GameAction.REVEAL:
-                        self.game_lost()
+        '''
+        mouse_x, mouse_y, action = self.get_input(timeout)
+
+        # ----- determine boxes at clicked areas (only when the mouse moved or clicked)
+        if (mouse_x, mouse_y) != self._mouse or action is not None:
+            self._mouse = (mouse_x, mouse_y)
+            self._hover = self._get_box_at_pixel(mouse_x, mouse_y)
+        box_x, box_y = self._hover
+
+        highlight = None
+
+        # ----- mouse not over a box in field
+        if (box_x, box_y) == (None, None):
+
+            # ----- check if reset box is clicked
+            if self._RESET_RECT.collidepoint(mouse_x, mouse_y):
+                highlight = self._RESET_RECT
+                if action == Game.GameAction.REVEAL: 
+                    self._reset_game()
+                    return
+
+            # ----- check if show box is clicked
+            if self._SHOW_RECT.collidepoint(mouse_x, mouse_y):
+                highlight = self._SHOW_RECT
+                if action == Game.GameAction.REVEAL:
+                    self.game_lost()
+                    return
+
+        # ---- mouse currently over box in field
+        else:
 
-            # ---- mouse currently over box in field
+            # ----- play the move on an unrevealed box; the cells it changed are repainted in this frame
+            if action is not None and not self._game.minefield[box_x][box_y].is_visible:
+                self._game.play_move(box_x, box_y, action)
+                if action == Game.GameAction.FLAG:
+                    self._dirty_cells.add((box_x, box_y))
+                else:
+                    self._dirty_cells.update((int(r), int(c)) for r, c in self._game.last_revealed)
+
+            # ----- highlight unrevealed box (after the move, so that a box just revealed loses its highlight)
+            if not self._game.minefield[box_x][box_y].is_visible:
+                highlight = (box_x, box_y)
+
+        # check if player has won 
+        if self._game.status == Game.GameStatus.FAILED:
+            self.game_lost()
+            return
+
+        elif self._game.status == Game.GameStatus.WON:
+            self.game_won()
+            return
+
+        # ----- repaint changed cells on the board surface, then copy them (and the highlight changes) to the display
+        dirty_rects = []
+        if self._full_redraw:
+            self._draw_board()
+            self._DISPLAYSURFACE.blit(self._BOARDSURFACE, (0, 0))
+            dirty_rects.append(self._DISPLAYSURFACE.get_rect())
+            self._full_redraw = False
+            self._highlight = None
+        for box in self._dirty_cells:
+            rect = self._draw_cell(self._BOARDSURFACE, *box)
+            self._DISPLAYSURFACE.blit(self._BOARDSURFACE, rect, rect)
+            dirty_rects.append(rect)
+        # ----- (a button highlight is a pygame.Rect, which is unhashable: only box highlights can be dirty cells)
+        if self._highlight is not None and (self._highlight != highlight or self._is_dirty_box(self._highlight)):
+            rect = self._highlight_rect(self._highlight)
+            self._DISPLAYSURFACE.blit(self._BOARDSURFACE, rect, rect)
+            dirty_rects.append(rect)
+            self._highlight = None
+        if highlight is not None and (self._highlight is None or self._is_dirty_box(highlight)):
+            if isinstance(highlight, tuple):
+                self._highlight_box(*highlight)
             else:
+                self._hightlight_button(highlight)
+            dirty_rects.append(self._highlight_rect(highlight))
+            self._highlight = highlight
+        self._dirty_cells.clear()
 
-                # ----- highlight unrevealed box
-                if not self._game.minefield[box_x][box_y].is_visible: 
-                    self._highlight_box(box_x, box_y)
-                        
-                    if action is not None:
-                        self._game.play_move(box_x, box_y, action)
+        # ----- redraw changed areas of the screen
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
 
-            # check if player has won 
-            if self._game.status == Game.GameStatus.FAILED:
-                self.game_lost()
+    def _is_dirty_box(self, highlight):
+        return isinstance(highlight, tuple) and highlight in self._dirty_cells
 
-            elif self._game.status == Game.GameStatus.WON:
-                self.game_won()
-
-            # ----- redraw screen, wait clock tick
-            pygame.display.update()
-            self._FPSCLOCK.tick(FPS)
+    def _highlight_rect(self, highlight):
+        '''
+            area covered by the highlight of a box (given as (box_x, box_y)) or a button (given as its rect)
+        '''
+        if isinstance(highlight, tuple):
+            left, top = self._get_left_top_xy(*highlight)
+            return pygame.Rect(left, top, self.BOXSIZE, self.BOXSIZE)
+        return highlight.inflate(8, 8)
 
     def _reset_game(self):
         row,col,num_mines = self._game.field_info
-        self.__init__(Game(row, col, num_mines, False))
+        self._game.stop_recording()
+        minefield = self._pool.get() if self._pool is not None else None
+        self.__init__(Game(row, col, num_mines, False, minefield = minefield), self._record, self._pool)
 
 
     def game_won(self):
@@ -182,11 +268,13 @@ class GUI(GameInterface):
         '''
             highlight box when mouse hovers over it
         '''
-        left, top = self._get_left_top_xy(box_x, box_y)
-        pygame.draw.rect(self._DISPLAYSURFACE, HILITECOLOR, (left, top, self.BOXSIZE, self.BOXSIZE), 4)
+        self._DISPLAYSURFACE.blit(self._TILES['highlight'], self._get_left_top_xy(box_x, box_y))
 
     def _game_over_animation(self, win = True):
 
+        # ----- the field (e.g. with the mines revealed) is drawn once and copied over the flash in every step
+        self._draw_board()
+        fieldRect = self._field_rect()
         origSurf = self._DISPLAYSURFACE.copy()
         flashSurf = pygame.Surface(self._DISPLAYSURFACE.get_size())
         flashSurf = flashSurf.convert_alpha()
@@ -204,103 +292,108 @@ class GUI(GameInterface):
                     flashSurf.fill((r, g, b, alpha))
                     self._DISPLAYSURFACE.blit(origSurf, (0, 0))
                     self._DISPLAYSURFACE.blit(flashSurf, (0, 0))
-                    pygame.draw.rect(self._DISPLAYSURFACE, FIELDCOLOR, (XMARGIN-5, YMARGIN-5, (self.BOXSIZE+self.GAPSIZE)*self.FIELDWIDTH+5, (self.BOXSIZE+self.GAPSIZE)*self.FIELDHEIGHT+5))
-                    self._draw_field()
-                    self._draw_mines_and_numbers()
-                    tipFont = pygame.font.SysFont(FONTTYPE, 16) ## not using self._BASICFONT - too big
-                    self._draw_text('Tip: Highlight a box and right click ', tipFont, TEXTCOLOR_3, WINDOWWIDTH/2, WINDOWHEIGHT-60)
-                    self._draw_text('to flag cells that you think contain mines.', tipFont, TEXTCOLOR_3, WINDOWWIDTH/2, WINDOWHEIGHT-40)
-                    self._RESET_SURF, self._RESET_RECT = self._draw_button('RESET', TEXTCOLOR_3, RESETBGCOLOR, WINDOWWIDTH/2, WINDOWHEIGHT-120)
-                    self._SHOW_SURF, self._SHOW_RECT = self._draw_button('REVEAL SOLUTION', TEXTCOLOR_3, RESETBGCOLOR, WINDOWWIDTH/2, WINDOWHEIGHT-95)
-                    self._draw_covers()
+                    self._DISPLAYSURFACE.blit(self._BOARDSURFACE, fieldRect, fieldRect)
+                    self._draw_buttons_and_tips(self._DISPLAYSURFACE)
                     pygame.display.update()
                     self._FPSCLOCK.tick(FPS)
 
-    def _get_box_at_pixel(self, x, y):
+    def _draw_board(self):
         '''
-            gets coordinates of box at mouse coordinates
+            draws the whole window (field, cells, buttons and tips) onto the board surface
         '''
+        surface = self._BOARDSURFACE
+        surface.fill(BGCOLOR)
+        pygame.draw.rect(surface, FIELDCOLOR, self._field_rect())
         for box_x in range(self.FIELDWIDTH):
             for box_y in range(self.FIELDHEIGHT):
-                left, top = self._get_left_top_xy(box_x, box_y)
-                boxRect = pygame.Rect(left, top, self.BOXSIZE, self.BOXSIZE)
-                if boxRect.collidepoint(x, y):
-                    return (box_x, box_y)
-        return (None, None)
+                self._draw_cell(surface, box_x, box_y)
+        self._draw_buttons_and_tips(surface)
 
+    def _draw_buttons_and_tips(self, surface):
 
-    def _hightlight_button(self, butRect):
-        '''
-            highlight button when mouse hovers over it
-        '''
-        linewidth = 4
-        pygame.draw.rect(self._DISPLAYSURFACE, HILITECOLOR, (butRect.left-linewidth, butRect.top-linewidth, butRect.width+2*linewidth, butRect.height+2*linewidth), linewidth)
+        surface.blit(self._RESET_SURF, self._RESET_RECT)
+        surface.blit(self._SHOW_SURF, self._SHOW_RECT)
+        for textobj, textrect in self._TIP_SURFS:
+            surface.blit(textobj, textrect)
 
+    def _field_rect(self):
 
-    def _draw_field(self):
-        '''
-            draws field GUI and reset button
-        '''
-
-        for box_x in range(self.FIELDWIDTH):
-            for box_y in range(self.FIELDHEIGHT):
-                left, top = self._get_left_top_xy(box_x, box_y)
-                pygame.draw.rect(self._DISPLAYSURFACE, BOXCOLOR_REV, (left, top, self.BOXSIZE, self.BOXSIZE))
-
-        self._DISPLAYSURFACE.blit(self._RESET_SURF, self._RESET_RECT)
-        self._DISPLAYSURFACE.blit(self._SHOW_SURF, self._SHOW_RECT)
+        return pygame.Rect(XMARGIN-5, YMARGIN-5, (self.BOXSIZE+self.GAPSIZE)*self.FIELDWIDTH+5, (self.BOXSIZE+self.GAPSIZE)*self.FIELDHEIGHT+5)
 
-    def _draw_mines_and_numbers(self):
-        '''    
-            draws mines and numbers onto GUI
-            field should have mines and numbers
+    def _draw_cell(self, surface, box_x, box_y):
+        '''
+            draws one box in its current state: a single blit of its tile
 
+            @Return -- the rect of the box
         '''
+        cell = self._game.minefield[box_x][box_y]
+        if not cell.is_visible:
+            tile = 'flagged' if cell.is_flagged else 'covered'
+        elif cell._is_mine:
+            tile = 'mine_flagged' if cell.is_flagged else 'mine'
+        else:
+            tile = cell.get_number()
+        return surface.blit(self._TILES[tile], self._get_left_top_xy(box_x, box_y))
 
-        field = self._game.minefield
+    def _build_tiles(self):
+        '''
+            pre-renders every state of a box at the current BOXSIZE
 
+            @Return -- dict of surfaces: 'covered', 'flagged', the revealed numbers 0-8, 'mine', 'mine_flagged'
+                       (mines revealed at game over) and the transparent hover 'highlight'
+        '''
+        size = (self.BOXSIZE, self.BOXSIZE)
         half = int(self.BOXSIZE*0.5) 
         quarter = int(self.BOXSIZE*0.25)
         eighth = int(self.BOXSIZE*0.125)
-        
-        for box_x in range(self.FIELDWIDTH):
-            for box_y in range(self.FIELDHEIGHT):
-                if field[box_x][box_y].is_visible:
-                    left, top = self._get_left_top_xy(box_x, box_y)
-                    center_x, center_y = self._get_centre_xy(box_x, box_y)
-                    if field[box_x][box_y]._is_mine:
-                        pygame.draw.circle(self._DISPLAYSURFACE, MINECOLOR, (left+half, top+half), quarter)
-                        pygame.draw.circle(self._DISPLAYSURFACE, WHITE, (left+half, top+half), eighth)
-                        pygame.draw.line(self._DISPLAYSURFACE, MINECOLOR, (left+eighth, top+half), (left+half+quarter+eighth, top+half))
-                        pygame.draw.line(self._DISPLAYSURFACE, MINECOLOR, (left+half, top+eighth), (left+half, top+half+quarter+eighth))
-                        pygame.draw.line(self._DISPLAYSURFACE, MINECOLOR, (left+quarter, top+quarter), (left+half+quarter, top+half+quarter))
-                        pygame.draw.line(self._DISPLAYSURFACE, MINECOLOR, (left+quarter, top+half+quarter), (left+half+quarter, top+quarter))
-                    else: 
-                        num = field[box_x][box_y].get_number()
-                        if num in range(1,3):
-                            text_colour = TEXTCOLOR_1
-                        else:
-                            text_colour = TEXTCOLOR_2
-                        self._draw_text(str(num), self._BASICFONT, text_colour, center_x, center_y)
-
-    def _draw_covers(self):
-
-        # uses revealedBox FIELDWIDTH x FIELDHEIGHT data structure to determine whether to draw box covering mine/number
-        # draw red cover instead of gray cover over marked mines
 
-        for box_x in range(self.FIELDWIDTH):
-            for box_y in range(self.FIELDHEIGHT):
+        tiles = {}
+        for key in ['covered', 'flagged', 'mine'] + list(range(9)):
+            tiles[key] = pygame.Surface(size)
+            tiles[key].fill(BOXCOLOR_COV if key == 0 else BOXCOLOR_REV)
 
-                left, top = self._get_left_top_xy(box_x, box_y)
-                if self._game.minefield[box_x][box_y].is_flagged:
-                    pygame.draw.rect(self._DISPLAYSURFACE, FLAGGEDCELL_COV, (left, top, self.BOXSIZE, self.BOXSIZE), 5)
+        for num in range(1, 9):
+            if num in range(1,3):
+                text_colour = TEXTCOLOR_1
+            else:
+                text_colour = TEXTCOLOR_2
+            self._draw_text(str(num), self._BASICFONT, text_colour, self.BOXSIZE/2, self.BOXSIZE/2, tiles[num])
+
+        mine = tiles['mine']
+        pygame.draw.circle(mine, MINECOLOR, (half, half), quarter)
+        pygame.draw.circle(mine, WHITE, (half, half), eighth)
+        pygame.draw.line(mine, MINECOLOR, (eighth, half), (half+quarter+eighth, half))
+        pygame.draw.line(mine, MINECOLOR, (half, eighth), (half, half+quarter+eighth))
+        pygame.draw.line(mine, MINECOLOR, (quarter, quarter), (half+quarter, half+quarter))
+        pygame.draw.line(mine, MINECOLOR, (quarter, half+quarter), (half+quarter, quarter))
 
-                if self._game.minefield[box_x][box_y].is_visible:
+        # ----- red cover outline over flagged boxes
+        tiles['mine_flagged'] = mine.copy()
+        for key in ('flagged', 'mine_flagged'):
+            pygame.draw.rect(tiles[key], FLAGGEDCELL_COV, (0, 0, self.BOXSIZE, self.BOXSIZE), 5)
 
-                    if self._game.minefield[box_x][box_y].get_number() == 0:
-                        pygame.draw.rect(self._DISPLAYSURFACE, BOXCOLOR_COV, (left, top, self.BOXSIZE, self.BOXSIZE))
-                    # else:
-                    #     pygame.draw.rect(self._DISPLAYSURFACE, WHITE, (left, top, self.BOXSIZE, self.BOXSIZE), 5)
+        tiles['highlight'] = pygame.Surface(size, SRCALPHA)
+        pygame.draw.rect(tiles['highlight'], HILITECOLOR, (0, 0, self.BOXSIZE, self.BOXSIZE), 4)
+
+        return tiles
+
+    def _get_box_at_pixel(self, x, y):
+        '''
+            gets coordinates of box at mouse coordinates (None, None in the gaps and outside the field)
+        '''
+        box_x, offset_x = divmod(x - XMARGIN, self.BOXSIZE + self.GAPSIZE)
+        box_y, offset_y = divmod(y - YMARGIN, self.BOXSIZE + self.GAPSIZE)
+        if 0 <= box_x < self.FIELDWIDTH and 0 <= box_y < self.FIELDHEIGHT and offset_x < self.BOXSIZE and offset_y < self.BOXSIZE:
+            return (box_x, box_y)
+        return (None, None)
+
+
+    def _hightlight_button(self, butRect):
+        '''
+            highlight button when mouse hovers over it
+        '''
+        linewidth = 4
+        pygame.draw.rect(self._DISPLAYSURFACE, HILITECOLOR, (butRect.left-linewidth, butRect.top-linewidth, butRect.width+2*linewidth, butRect.height+2*linewidth), linewidth)
 
 
     def _get_left_top_xy(self, box_x, box_y):
@@ -311,24 +404,22 @@ class GUI(GameInterface):
         top = YMARGIN + box_y*(self.BOXSIZE+self.GAPSIZE)
         return left, top
 
-    def _get_centre_xy(self, box_x, box_y):
+    def _draw_text(self, text, font, color, x, y, surface = None):  
         '''
-            get center coordinates for drawing mine boxes
+            function to easily draw text (on the display, or on 'surface')
         '''
-        center_x = XMARGIN + self.BOXSIZE/2 + box_x*(self.BOXSIZE+self.GAPSIZE)
-        center_y = YMARGIN + self.BOXSIZE/2 + box_y*(self.BOXSIZE+self.GAPSIZE)
-        return center_x, center_y
-
+        textobj, textrect = self._render_text(text, font, color, x, y)
+        (self._DISPLAYSURFACE if surface is None else surface).blit(textobj, textrect)
 
-    def _draw_text(self, text, font, color, x, y):  
+    def _render_text(self, text, font, color, x, y):
         '''
-            function to easily draw text and also return object & rect pair
+            renders text centred at [x,y] and returns obj & rect
         '''
         textobj = font.render(text, True, color)
         textrect = textobj.get_rect()
         textrect.centerx = x
         textrect.centery = y
-        self._DISPLAYSURFACE.blit(textobj, textrect)
+        return (textobj, textrect)
 
     def _draw_button(self, text, color, bgcolor, center_x, center_y):
         '''
@@ -2,6 +2,10 @@
 
 A base class for providing interface between a Game instance and a solver. It is incomplete on its own. See 'example_keyboard_interface.py' for example.
 
+AsyncGameInterface is the asyncio variant: get_input() is a coroutine and run() is awaited, so that many games and bots can be played concurrently in one event loop:
+
+	await asyncio.gather(*(bot.run() for bot in bots))
+
 
     @author: JustaGist (saifksidhik@gmail.com)
     @file: interface.py
@@ -78,6 +82,71 @@ class GameInterface:
 
 
 
+class AsyncGameInterface(GameInterface):
+	'''
+		Base for interface classes whose get_input() is a coroutine (waiting for a network agent, a human, a worker process...).
+		run() is a coroutine too: await it, or run it as a task and cancel the task to abandon the game.
+
+	'''
+
+	def __init__(self, game_instance, move_timeout = None, print_board = False):
+		'''
+			Args:
+				move_timeout: seconds get_input() may take per move (no limit if None); see move_timed_out()
+				print_board: print the minefield after every move, as GameInterface.run() does
+
+		'''
+		super().__init__(game_instance)
+		self.move_timeout = move_timeout
+		self._print_board = print_board
+
+	async def get_input(self):
+		'''
+			Has to be implemented in derived class (as a coroutine)
+
+			@Return -- row, col, action (see GameInterface.get_input)
+
+		'''
+		raise NotImplementedError
+
+	def move_timed_out(self):
+		'''
+			Called when get_input() took longer than move_timeout (it is cancelled). Override in derived class to
+			play a fallback move instead of ending run() with the asyncio.TimeoutError.
+
+			@Return -- row, col, action to play
+
+		'''
+		import asyncio
+		raise asyncio.TimeoutError("No move within %s seconds"%self.move_timeout)
+
+	async def run(self):
+		'''
+			Override in derived class if required
+
+		'''
+		import asyncio # not at module level: asyncio takes longer to import than the rest of the package
+		assert self._game.status != Game.GameStatus.NOT_RUNNING, "Error: Game is not Running!"
+
+		if self._print_board:
+			print(self._game.minefield)
 
+		while self._game.status == Game.GameStatus.RUNNING:
 
+			try:
+				row, col, action = await asyncio.wait_for(self.get_input(), self.move_timeout)
+			except asyncio.TimeoutError:
+				row, col, action = self.move_timed_out()
+
+			self._game.play_move(row,col, action)
+
+			if self._print_board:
+				print(self._game.minefield)
+
+		if self._game.status == Game.GameStatus.FAILED:
+			self.game_lost()
+
+		elif self._game.status == Game.GameStatus.WON:
+			self.game_won()
 
+		return self._game.status
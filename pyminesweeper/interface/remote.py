@@ -0,0 +1,220 @@
+'''
+
+Client side of the game server (see server.py): RemoteGame plays a game hosted by a GameServer and can be
+used wherever a Game is, so existing bots play remotely unchanged:
+
+    game = RemoteGame(('127.0.0.1', 8765), 16, 30, 99, first_click_safe = True)
+    ConstraintSolverInterface(game).run()
+
+RemoteGameInterface is the GameInterface to derive new remote bots from (get_input() as usual).
+
+The client keeps a mirror MineField of what it has seen, updated from the delta the server answers every
+move with; the mines are only known where they were revealed.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: remote.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import json
+import socket
+
+from pyminesweeper.core import Game, MineField
+from pyminesweeper.core.minefield import _corner_cells
+from pyminesweeper.interface import GameInterface
+
+ACTION_NAMES = {Game.GameAction.REVEAL: 'reveal', Game.GameAction.FLAG: 'flag'}
+
+
+class RemoteGame(object):
+
+    '''
+        A game hosted by a GameServer, with the interface of Game (start_game, play_move, minefield, status,
+        is_running, last_revealed, field_info, end_and_reveal_field).
+
+    '''
+
+    def __init__(self, address, row, col, num_mines, seed = None, first_click_safe = False, engine = None, timeout = None):
+        '''
+            Args:
+                address: (host, port) of a TCP server, or the path of a Unix socket
+                seed: seed of the mine placement on the server (an int), random if None
+                first_click_safe: place the mines only when the first cell is revealed
+                engine: minefield engine of the server to play on ("MineField" or "ArrayMineField"); the server's default if None
+                timeout: socket timeout in seconds
+
+        '''
+        if isinstance(address, str):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(address)
+        else:
+            self._socket = socket.create_connection(address, timeout)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._socket.makefile('rwb')
+
+        self._options = {'seed': seed, 'first_click_safe': first_click_safe}
+        if engine is not None:
+            self._options['engine'] = engine
+        self._session = None
+        self._status = Game.GameStatus.NOT_RUNNING
+        self._last_revealed = []
+        self._mines = [] # all mines, sent by the server when the game is lost
+
+        self._minefield = MineField.from_mines([[False]*col for _ in range(row)])
+        self._minefield._num_mines = num_mines # mines still unknown to the client are counted (for mine_probabilities)
+        if row*col - 5 >= num_mines: # the server's boards keep the corners free of mines then (see _mine_free_cells)
+            self._minefield._mine_free = _corner_cells(row, col)
+
+        self.field_info = [row, col, num_mines]
+
+    def _request(self, **request):
+        '''
+            Send a request and wait for its response.
+
+            @Return -- the response dict (an Exception is raised with the server's message if it failed)
+
+        '''
+        self._file.write(json.dumps(request, separators = (',', ':')).encode() + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise Exception("Connection to the game server was closed")
+        response = json.loads(line)
+        if not response['ok']:
+            raise Exception("Game server: %s"%response['error'])
+        return response
+
+    @property
+    def minefield(self):
+        '''
+            Mirror of the remote minefield: only the revealed cells (and the flags) are known.
+        '''
+        return self._minefield
+
+    @property
+    def is_running(self):
+        return self._status == Game.GameStatus.RUNNING
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def last_revealed(self):
+        return self._last_revealed
+
+    @property
+    def session(self):
+        return self._session
+
+    def start_game(self):
+        row, col, num_mines = self.field_info
+        response = self._request(op = 'new', rows = row, cols = col, mines = num_mines, **self._options)
+        self._session = response['session']
+        self._status = Game.GameStatus[response['status']]
+
+    def play_move(self, row, col, action):
+        '''
+            Play a move on the server and apply its result to the mirror minefield.
+
+            @Return -- the Game.GameStatus after the move
+
+        '''
+        if self._status != Game.GameStatus.RUNNING:
+            raise Exception("Game is not running!")
+
+        response = self._request(op = 'move', session = self._session, row = int(row), col = int(col), action = ACTION_NAMES[action])
+
+        self._last_revealed = []
+        for r, c, flagged in response.get('flagged', ()):
+            self._minefield[r][c].is_flagged = flagged
+        for r, c, number in response.get('revealed', ()):
+            cell = self._minefield[r][c]
+            if number < 0:
+                cell._is_mine = True
+            else:
+                cell._number = number
+                self._minefield.revealed_safe_cells += not cell.is_visible
+            cell.show()
+            self._last_revealed.append([r, c])
+        self._mines = response.get('mines', self._mines)
+
+        self._status = Game.GameStatus[response['status']]
+        return self._status
+
+    def board(self):
+        '''
+            The board as the server sees it: list of rows as strings (see MineField.__str__).
+        '''
+        return self._request(op = 'board', session = self._session)['board']
+
+    def end_and_reveal_field(self, only_mines = True):
+        '''
+            Show the mines on the mirror minefield (those of a lost game; the cells of the remote board are not sent).
+        '''
+        for r, c in self._mines:
+            self._minefield[r][c]._is_mine = True
+            self._minefield[r][c].show()
+
+    def close(self):
+        '''
+            End the game on the server and disconnect.
+        '''
+        try:
+            if self._session is not None:
+                self._request(op = 'close', session = self._session)
+                self._session = None
+        finally:
+            self._file.close()
+            self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+class RemoteGameInterface(GameInterface):
+
+    '''
+        GameInterface playing a game hosted by a GameServer. Derive from it and implement get_input() as for
+        a local game; run() ends the remote game when done. It can also be combined with an existing bot:
+
+            class RemoteSolver(RemoteGameInterface, ConstraintSolverInterface):
+                pass
+
+            RemoteSolver(('127.0.0.1', 8765), 16, 30, 99, first_click_safe = True).run()
+
+    '''
+
+    def __init__(self, address, row, col, num_mines, **options):
+        '''
+            Args:
+                address: (host, port) of a TCP server, or the path of a Unix socket
+                options: seed, first_click_safe, engine, timeout (see RemoteGame)
+
+        '''
+        super().__init__(RemoteGame(address, row, col, num_mines, **options))
+
+    def run(self):
+        try:
+            super().run()
+        finally:
+            self._game.close()
+
+
+
+if __name__ == '__main__':
+
+    import sys
+    from pyminesweeper.interface.solver_interface import ConstraintSolverInterface
+
+    host, port = sys.argv[1] if len(sys.argv) > 1 else '127.0.0.1', int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+
+    with RemoteGame((host, port), 16, 30, 99, first_click_safe = True) as game:
+        ConstraintSolverInterface(game).run()
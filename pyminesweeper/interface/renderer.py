@@ -0,0 +1,260 @@
+'''
+
+A headless renderer drawing the state of a minefield to an RGB image (NumPy array) or a PNG, without
+pygame or a display, in the colour scheme of the GUI. Rows of the field go down the image and columns
+across, as in MineField.__str__.
+
+Every cell state is pre-rendered once per box size into a tile (the numbers with a small bitmap font),
+so an image is one fancy-indexing lookup of the cell states. PNGs are encoded with zlib. A recorded
+game (a fresh minefield and its list of moves) can be streamed to a PNG frame sequence, with the frames
+encoded in a pool of worker processes:
+
+    save_frames(field, moves, 'replay/frame_%05d.png', box_size = 12)
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: renderer.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import functools
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from pyminesweeper.core import Game
+from pyminesweeper.interface.theme import FIELDCOLOR, BOXCOLOR_COV, BOXCOLOR_REV, MINECOLOR, WHITE, TEXTCOLOR_1, TEXTCOLOR_2, FLAGGEDCELL_COV
+
+# ----- cell states: the revealed numbers 0-8 are their own codes
+COVERED = 9
+FLAGGED = 10
+MINE = 11
+MINE_FLAGGED = 12 # a flagged mine revealed at the end of a game
+NUM_STATES = 13
+
+BOXSIZE = 16
+
+# ----- 5 x 7 bitmap font for the numbers
+DIGITS = {1: ('..#..', '.##..', '..#..', '..#..', '..#..', '..#..', '.###.'),
+          2: ('.###.', '#...#', '....#', '...#.', '..#..', '.#...', '#####'),
+          3: ('#####', '...#.', '..#..', '...#.', '....#', '#...#', '.###.'),
+          4: ('...#.', '..##.', '.#.#.', '#..#.', '#####', '...#.', '...#.'),
+          5: ('#####', '#....', '####.', '....#', '....#', '#...#', '.###.'),
+          6: ('..##.', '.#...', '#....', '####.', '#...#', '#...#', '.###.'),
+          7: ('#####', '....#', '...#.', '..#..', '.#...', '.#...', '.#...'),
+          8: ('.###.', '#...#', '#...#', '.###.', '#...#', '#...#', '.###.')}
+
+
+def cell_states(minefield):
+    '''
+        State code of every cell of a MineField or ArrayMineField.
+
+        @Return -- (rows x cols) uint8 array of COVERED, FLAGGED, MINE, MINE_FLAGGED or the number (0-8) of a revealed cell
+
+    '''
+    if hasattr(minefield, 'visible_mask'):
+        flagged = minefield.flag_mask
+        states = np.where(flagged, FLAGGED, COVERED).astype(np.uint8)
+        visible = minefield.visible_mask
+        states[visible] = minefield.number_grid[visible]
+        states[visible & minefield.mine_mask] = MINE
+        states[visible & minefield.mine_mask & flagged] = MINE_FLAGGED
+        return states
+
+    states = np.empty((minefield.num_rows, minefield.num_cols), dtype=np.uint8)
+    for r, row in enumerate(minefield):
+        for c, cell in enumerate(row):
+            if not cell.is_visible:
+                states[r, c] = FLAGGED if cell.is_flagged else COVERED
+            elif cell._is_mine:
+                states[r, c] = MINE_FLAGGED if cell.is_flagged else MINE
+            else:
+                states[r, c] = cell.get_number()
+    return states
+
+
+@functools.lru_cache(maxsize = 8)
+def tiles(box_size = BOXSIZE):
+    '''
+        Every cell state drawn as a box with its gap (of a sixth of a box, as in the GUI) below and to the right.
+
+        @Return -- (NUM_STATES x pitch x pitch x 3) uint8 array, indexed by state code
+
+    '''
+    gap = max(1, box_size//6)
+    pitch = box_size + gap
+    atlas = np.empty((NUM_STATES, pitch, pitch, 3), dtype=np.uint8)
+    atlas[:] = FIELDCOLOR
+    atlas[:, :box_size, :box_size] = BOXCOLOR_REV
+    atlas[0, :box_size, :box_size] = BOXCOLOR_COV
+
+    # ----- numbers, scaled up to about half the box height
+    scale = max(1, int(box_size*0.5)//7)
+    if box_size >= 7:
+        for num, rows in DIGITS.items():
+            glyph = np.array([[ch == '#' for ch in row] for row in rows]).repeat(scale, axis=0).repeat(scale, axis=1)
+            top, left = (box_size - glyph.shape[0])//2, (box_size - glyph.shape[1])//2
+            atlas[num, top:top+glyph.shape[0], left:left+glyph.shape[1]][glyph] = TEXTCOLOR_1 if num in range(1,3) else TEXTCOLOR_2
+
+    # ----- mine: a disc with a white centre and spikes
+    half, quarter, eighth = box_size*0.5, box_size*0.25, box_size*0.125
+    y, x = np.mgrid[:box_size, :box_size] + 0.5
+    dy, dx = y - half, x - half
+    distance = np.hypot(dy, dx)
+    spikes = (distance <= half - eighth) & ((np.abs(dy) < 0.75) | (np.abs(dx) < 0.75) | (np.abs(np.abs(dx) - np.abs(dy)) < 1.))
+    for state in (MINE, MINE_FLAGGED):
+        atlas[state, :box_size, :box_size][(distance <= quarter) | spikes] = MINECOLOR
+        atlas[state, :box_size, :box_size][distance <= eighth] = WHITE
+
+    # ----- red cover outline over flagged boxes
+    width = max(1, box_size//8)
+    for state in (FLAGGED, MINE_FLAGGED):
+        box = atlas[state, :box_size, :box_size]
+        box[:width] = box[-width:] = box[:, :width] = box[:, -width:] = FLAGGEDCELL_COV
+
+    atlas.setflags(write = False)
+    return atlas
+
+
+def render_states(states, box_size = BOXSIZE):
+    '''
+        RGB image of an array of cell states (see cell_states()).
+
+        @Return -- (height x width x 3) uint8 array with a border of the field colour around the boxes
+
+    '''
+    atlas = tiles(box_size)
+    pitch = atlas.shape[1]
+    gap = pitch - box_size
+    num_rows, num_cols = states.shape
+
+    image = np.empty((num_rows*pitch + gap, num_cols*pitch + gap, 3), dtype=np.uint8)
+    image[:gap] = image[:, :gap] = FIELDCOLOR
+    image[gap:, gap:] = atlas[states].transpose(0, 2, 1, 3, 4).reshape(num_rows*pitch, num_cols*pitch, 3)
+    return image
+
+
+def render_array(minefield, box_size = BOXSIZE):
+    '''
+        RGB image (height x width x 3 uint8 array) of the current state of a minefield.
+    '''
+    return render_states(cell_states(minefield), box_size)
+
+
+def encode_png(image, compress_level = 6):
+    '''
+        PNG file contents (bytes) of an RGB image (height x width x 3 uint8 array).
+    '''
+    height, width = image.shape[:2]
+    scanlines = np.zeros((height, 1 + 3*width), dtype=np.uint8) # every scanline starts with filter type 0 (none)
+    scanlines[:, 1:] = np.asarray(image, dtype=np.uint8).reshape(height, 3*width)
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    return (b'\x89PNG\r\n\x1a\n' +
+            chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) + # 8 bit RGB
+            chunk(b'IDAT', zlib.compress(scanlines.tobytes(), compress_level)) +
+            chunk(b'IEND', b''))
+
+
+def render_png(minefield, box_size = BOXSIZE):
+    '''
+        PNG file contents (bytes) of the current state of a minefield.
+    '''
+    return encode_png(render_array(minefield, box_size))
+
+
+def write_png(minefield_or_image, path, box_size = BOXSIZE):
+    '''
+        Save a minefield (or an RGB image array) as a PNG file.
+    '''
+    if isinstance(minefield_or_image, np.ndarray):
+        data = encode_png(minefield_or_image)
+    else:
+        data = render_png(minefield_or_image, box_size)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def replay_states(minefield, moves):
+    '''
+        Play 'moves' on 'minefield' (which is modified) and yield the cell states before the first move and after every move.
+
+        Args:
+            minefield: the minefield the game was played on, initialised and in its state before the first move
+            moves: iterable of (row, col, action), action being a Game.GameAction
+
+    '''
+    yield cell_states(minefield)
+    for row, col, action in moves:
+        if action == Game.GameAction.FLAG:
+            minefield.flag_cell(row, col)
+        else:
+            minefield.reveal_cells(row, col)
+        yield cell_states(minefield)
+
+
+def _encode_frame(states, box_size, compress_level):
+    '''
+        Worker task: one frame as PNG bytes.
+    '''
+    return encode_png(render_states(states, box_size), compress_level)
+
+
+def render_frames(minefield, moves, box_size = BOXSIZE, workers = None, compress_level = 6):
+    '''
+        Replay a recorded game and yield the PNG contents (bytes) of every frame, in order (see replay_states()).
+
+        The moves are replayed in this process; the frames are rendered and encoded in 'workers' processes
+        (os.cpu_count() if None; 1 renders in this process), with a bounded number of frames in flight.
+
+    '''
+    states = replay_states(minefield, moves)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for frame_states in states:
+            yield _encode_frame(frame_states, box_size, compress_level)
+        return
+
+    with ProcessPoolExecutor(max_workers = workers) as pool:
+        pending = deque()
+        for frame_states in states:
+            pending.append(pool.submit(_encode_frame, frame_states, box_size, compress_level))
+            if len(pending) >= 4*workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def save_frames(minefield, moves, path_pattern, box_size = BOXSIZE, workers = None, compress_level = 6):
+    '''
+        Replay a recorded game to PNG files, frame i being saved to path_pattern%i (e.g. 'frames/frame_%05d.png').
+
+        @Return -- number of frames written
+
+    '''
+    num_frames = 0
+    for index, data in enumerate(render_frames(minefield, moves, box_size, workers, compress_level)):
+        with open(path_pattern%index, 'wb') as f:
+            f.write(data)
+        num_frames += 1
+    return num_frames
+
+
+
+if __name__ == '__main__':
+
+    from pyminesweeper.core import ArrayMineField
+
+    field = ArrayMineField.create_new(16, 30, 99, seed = 1, first_click_safe = True)
+    field.initialise()
+    field.reveal_cells(8, 15)
+    field.flag_cell(0, 0)
+
+    write_png(field, 'minefield.png', box_size = 24)
+    print("Saved minefield.png")
@@ -0,0 +1,286 @@
+'''
+
+An asyncio server hosting many games at once, for bots that play over a TCP or Unix socket (see
+RemoteGame and RemoteGameInterface in remote.py for the client side).
+
+The protocol is line-delimited JSON: every request is one JSON object on one line, answered by one
+JSON line, in order. Requests carry an "op" and may carry an "id", which is echoed in the response.
+
+    {"op": "new", "rows": 16, "cols": 30, "mines": 99}          -> {"ok": true, "session": "9f2c...", "status": "RUNNING", ...}
+    {"op": "move", "session": "9f2c...", "row": 8, "col": 15, "action": "reveal"}
+                                                                -> {"ok": true, "status": "RUNNING", "revealed": [[8, 15, 0], [7, 14, 1], ...]}
+    {"op": "move", "session": "9f2c...", "row": 0, "col": 0, "action": "flag"}
+                                                                -> {"ok": true, "status": "RUNNING", "flagged": [[0, 0, true]]}
+    {"op": "board", "session": "9f2c..."}                       -> {"ok": true, "board": ["  12F ...", ...], ...}
+    {"op": "status", "session": "9f2c..."}  /  {"op": "close", "session": "9f2c..."}  /  {"op": "stats"}
+
+Moves answer with the change to the board only: the cells revealed, as [row, col, number] (number -1 for
+a mine), or the flag toggled. A move that loses the game also lists the "mines". Errors are answered
+with {"ok": false, "error": "..."}.
+
+Games are kept by session id (not by connection, so a bot can reconnect) and are dropped after
+'idle_timeout' seconds without requests. Each connection is served one request at a time, and a
+response is only read from the next request once the previous one has been written out to the socket,
+so a client that sends faster than it reads is slowed down instead of filling the server's memory.
+
+Requests that touch a board (creating it, moves, printing it) run in worker threads, so a large board
+(placing its mines, or a move opening a big region) does not hold up the other sessions or the expiry of
+idle games. Requests of the same session still run one at a time, in order.
+
+    python -m pyminesweeper.interface.server --port 8765
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: server.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import asyncio
+import json
+import secrets
+import time
+
+from pyminesweeper.core import Game, MineField, ArrayMineField
+
+ENGINES = {'MineField': MineField, 'ArrayMineField': ArrayMineField}
+ACTIONS = {'reveal': Game.GameAction.REVEAL, 'flag': Game.GameAction.FLAG}
+
+MAX_LINE = 2**16 # longest request line accepted (bytes)
+
+
+class GameServer(object):
+
+    '''
+        Hosts Game instances by session id and serves the protocol above.
+
+            server = GameServer(idle_timeout = 600)
+            asyncio.run(server.serve(port = 8765))
+
+        handle_request() can also be called directly (e.g. from tests or another transport).
+
+    '''
+
+    def __init__(self, idle_timeout = 300., max_sessions = 10000, max_cells = 10**6, field_type = ArrayMineField):
+        '''
+            Args:
+                idle_timeout: seconds after which a game without requests is dropped
+                max_sessions: games hosted at most at the same time
+                max_cells: largest board (rows x cols) a client may create
+                field_type: default minefield engine of new games (clients may ask for "MineField" or "ArrayMineField")
+
+        '''
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.max_cells = max_cells
+        self.field_type = field_type
+
+        self._sessions = {} # session id -> [game, time of last request, asyncio.Lock serialising its requests]
+        self._servers = []
+
+    @property
+    def num_sessions(self):
+        return len(self._sessions)
+
+    # ----- protocol
+
+    def handle_request(self, request):
+        '''
+            Answer one request (a dict, or a JSON line as str/bytes).
+
+            @Return -- the response dict
+
+        '''
+        try:
+            if not isinstance(request, dict):
+                request = json.loads(request)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            handler = getattr(self, '_op_%s'%request.get('op'), None)
+            if handler is None:
+                raise ValueError("unknown op: %s"%request.get('op'))
+            response = handler(request)
+        except Exception as e:
+            response = {'ok': False, 'error': str(e)}
+
+        if isinstance(request, dict) and 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    def _session(self, request):
+        session = self._sessions.get(request.get('session'))
+        if session is None:
+            raise ValueError("unknown or expired session: %s"%request.get('session'))
+        session[1] = time.monotonic()
+        return session[0]
+
+    def _op_new(self, request):
+
+        rows, cols, num_mines = int(request['rows']), int(request['cols']), int(request['mines'])
+        if rows <= 0 or cols <= 0 or rows*cols > self.max_cells:
+            raise ValueError("board must have between 1 and %d cells"%self.max_cells)
+        if len(self._sessions) >= self.max_sessions:
+            raise ValueError("server is full (%d games)"%self.max_sessions)
+        field_type = ENGINES[request['engine']] if 'engine' in request else self.field_type
+
+        game = Game(rows, cols, num_mines, end_program_when_game_finishes = False, field_type = field_type,
+                    seed = request.get('seed'), first_click_safe = request.get('first_click_safe', True))
+        game.start_game()
+
+        session_id = secrets.token_hex(8)
+        self._sessions[session_id] = [game, time.monotonic(), asyncio.Lock()]
+        return {'ok': True, 'session': session_id, 'status': game.status.name, 'rows': rows, 'cols': cols, 'mines': num_mines}
+
+    def _op_move(self, request):
+
+        game = self._session(request)
+        row, col = int(request['row']), int(request['col'])
+        rows, cols = game.field_info[:2]
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise ValueError("cell [%d,%d] is outside the %d x %d board"%(row, col, rows, cols))
+        action = ACTIONS[request.get('action', 'reveal')]
+
+        status = game.play_move(row, col, action)
+        response = {'ok': True, 'status': status.name}
+        minefield = game.minefield
+        if action == Game.GameAction.FLAG:
+            response['flagged'] = [[row, col, minefield[row][col].is_flagged]]
+        else:
+            revealed = []
+            for r, c in game.last_revealed:
+                cell = minefield[int(r)][int(c)]
+                revealed.append([int(r), int(c), -1 if cell._is_mine else cell.get_number()])
+            response['revealed'] = revealed
+            if status == Game.GameStatus.FAILED:
+                response['mines'] = [[int(r), int(c)] for r, c in minefield._mine_locations]
+        return response
+
+    def _op_board(self, request):
+
+        game = self._session(request)
+        return {'ok': True, 'status': game.status.name, 'board': [''.join(str(cell) for cell in row) for row in game.minefield]}
+
+    def _op_status(self, request):
+
+        game = self._session(request)
+        return {'ok': True, 'status': game.status.name, 'revealed_safe_cells': game.minefield.revealed_safe_cells}
+
+    def _op_close(self, request):
+
+        self._session(request)
+        self._sessions.pop(request['session'], None)
+        return {'ok': True}
+
+    def _op_stats(self, request):
+
+        return {'ok': True, 'sessions': len(self._sessions), 'max_sessions': self.max_sessions}
+
+    def expire_idle(self, now = None):
+        '''
+            Drop the games that had no request for 'idle_timeout' seconds.
+
+            @Return -- number of games dropped
+
+        '''
+        deadline = (time.monotonic() if now is None else now) - self.idle_timeout
+        expired = [session_id for session_id, (_, last_used, _) in list(self._sessions.items()) if last_used < deadline]
+        for session_id in expired:
+            self._sessions.pop(session_id, None)
+        return len(expired)
+
+    async def handle_request_async(self, request):
+        '''
+            As handle_request(), in a worker thread (except for requests that are answered at once), one request of a
+            session at a time.
+
+            @Return -- the response dict
+
+        '''
+        try:
+            if not isinstance(request, dict):
+                request = json.loads(request)
+        except ValueError:
+            return self.handle_request(request) # answers the error
+        if not isinstance(request, dict) or request.get('op') == 'stats':
+            return self.handle_request(request)
+
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(request.get('session'))
+        if session is None: # a new game, or an error
+            return await loop.run_in_executor(None, self.handle_request, request)
+        async with session[2]:
+            return await loop.run_in_executor(None, self.handle_request, request)
+
+    # ----- transport
+
+    async def _handle_connection(self, reader, writer):
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError: # line longer than MAX_LINE
+                    writer.write(b'{"ok":false,"error":"request too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self.handle_request_async(line)
+                writer.write(json.dumps(response, separators = (',', ':')).encode() + b'\n')
+                await writer.drain() # backpressure: wait until the client reads
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _expiry_loop(self):
+
+        while True:
+            await asyncio.sleep(max(self.idle_timeout/4., 0.01))
+            self.expire_idle()
+
+    async def serve(self, host = '127.0.0.1', port = 8765, path = None):
+        '''
+            Serve on TCP [host:port], or on the Unix socket 'path' if given, until cancelled.
+        '''
+        if path is not None:
+            server = await asyncio.start_unix_server(self._handle_connection, path, limit = MAX_LINE)
+        else:
+            server = await asyncio.start_server(self._handle_connection, host, port, limit = MAX_LINE)
+        self._servers.append(server)
+
+        expiry = asyncio.ensure_future(self._expiry_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            expiry.cancel()
+
+    @property
+    def addresses(self):
+        '''
+            Addresses the server is listening on (e.g. to find the port chosen for port 0).
+        '''
+        return [socket.getsockname() for server in self._servers for socket in server.sockets]
+
+
+
+if __name__ == '__main__':
+
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog = "python -m pyminesweeper.interface.server")
+    parser.add_argument("--host", default = "127.0.0.1", help = "Address to listen on.")
+    parser.add_argument("--port", type = int, default = 8765, help = "TCP port to listen on.")
+    parser.add_argument("--unix", default = None, metavar = "PATH", help = "Listen on a Unix socket instead of TCP.")
+    parser.add_argument("--idle-timeout", type = float, default = 300., help = "Seconds after which an idle game is dropped.")
+    parser.add_argument("--max-sessions", type = int, default = 10000, help = "Maximum number of games hosted at once.")
+    args = parser.parse_args()
+
+    server = GameServer(idle_timeout = args.idle_timeout, max_sessions = args.max_sessions)
+    print("Serving on %s"%(args.unix or "%s:%d"%(args.host, args.port)))
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,108 @@
+'''
+
+A GameInterface that plays by itself using the ConstraintSolver: it reveals cells proven safe, flags
+cells proven to be mines, and guesses only when nothing is certain (the cell least likely to be a mine,
+from pyminesweeper.core.probability). Useful as a reference bot (for
+example in a tournament) and for auto-play.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: solver_interface.py
+    @package: pyminesweeper v0.9
+
+'''
+import random
+import numpy as np
+from pyminesweeper.core import Game
+from pyminesweeper.core.constraint_solver import ConstraintSolver
+from pyminesweeper.core.probability import mine_probabilities
+from pyminesweeper.interface import GameInterface
+
+
+class ConstraintSolverInterface(GameInterface):
+
+    '''
+        The solver is fed from Game.last_revealed after every move, so each move only costs work proportional
+        to the cells it opened (plus the constraints around them).
+
+    '''
+
+    def __init__(self, game_instance, flag_mines = True, seed = None, use_probabilities = True, time_budget = 0.05):
+        '''
+            Args:
+                flag_mines: play FLAG moves for the cells proven to be mines (otherwise they are only avoided)
+                seed: seed for the random choice of guesses (and the probability sampling)
+                use_probabilities: guess the cell with the lowest mine probability instead of a random cell
+                time_budget: seconds of exact enumeration allowed per guess (see mine_probabilities)
+
+        '''
+        super().__init__(game_instance)
+
+        self.num_rows, self.num_cols = game_instance.field_info[:2]
+        self._solver = ConstraintSolver(self.num_rows, self.num_cols)
+        self._flag_mines = flag_mines
+        self._random = random.Random(seed)
+        self._use_probabilities = use_probabilities
+        self._time_budget = time_budget
+        self._unknown = None # cells not known to the solver, built on the first guess after the opening
+
+    def _absorb_last_move(self):
+        minefield = self._game.minefield
+        opened = [(int(r), int(c)) for r, c in self._game.last_revealed]
+        self._solver.add_revealed((r, c, minefield[r][c].get_number()) for r, c in opened)
+        if self._unknown is not None:
+            self._unknown.difference_update(r*self.num_cols + c for r, c in opened)
+
+    def get_input(self):
+        '''
+            Next move: a safe cell to reveal, else a certain mine to flag, else a guess.
+
+        '''
+        self._absorb_last_move()
+
+        if self._flag_mines:
+            mine = self._solver.next_mine()
+            if mine is not None:
+                return mine[0], mine[1], Game.GameAction.FLAG
+
+        safe = self._solver.next_safe_cell()
+        if safe is not None:
+            return safe[0], safe[1], Game.GameAction.REVEAL
+
+        return self.guess()
+
+    def guess(self):
+        '''
+            Reveal the unknown cell least likely to be a mine (ties broken at random), or a random unknown
+            cell if use_probabilities is off. Override for other guessing strategies.
+
+        '''
+        if not self._solver.revealed:
+            return self.num_rows//2, self.num_cols//2, Game.GameAction.REVEAL
+
+        if self._unknown is None:
+            self._unknown = set(range(self.num_rows*self.num_cols)) - self._solver.revealed
+        self._unknown -= self._solver.mines
+        self._unknown -= self._solver.safe
+
+        candidates = tuple(self._unknown)
+        if self._use_probabilities:
+            known_mines = np.zeros((self.num_rows, self.num_cols), dtype=bool)
+            known_mines.ravel()[list(self._solver.mines)] = True
+            probabilities = mine_probabilities(self._game.minefield, time_budget = self._time_budget,
+                                               seed = self._random.random(), known_mines = known_mines).ravel()
+            lowest = probabilities[list(candidates)].min()
+            candidates = [cell for cell in candidates if probabilities[cell] <= lowest + 1e-9]
+
+        row, col = divmod(self._random.choice(candidates), self.num_cols)
+        return row, col, Game.GameAction.REVEAL
+
+
+
+if __name__ == '__main__':
+
+    game = Game(16, 30, 99, end_program_when_game_finishes = False, first_click_safe = True)
+
+    interface = ConstraintSolverInterface(game)
+
+    interface.run()
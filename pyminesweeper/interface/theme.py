@@ -0,0 +1,32 @@
+''' 
+
+Colour scheme of PyMinesweeper, shared by the PyGame GUI and the headless renderer (does not import pygame).
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: theme.py
+    @package: pyminesweeper v0.9
+
+'''
+
+# ----- define colors 
+LIGHTGRAY = (225, 225, 225)
+DARKGRAY = (160, 160, 160)
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+GREEN = (0, 128, 0)
+
+# ----- assign major colors
+BGCOLOR = WHITE
+FIELDCOLOR = BLACK
+BOXCOLOR_COV = DARKGRAY # covered box color
+BOXCOLOR_REV = LIGHTGRAY # revealed box color
+MINECOLOR = BLACK
+TEXTCOLOR_1 = BLUE
+TEXTCOLOR_2 = RED
+TEXTCOLOR_3 = BLACK
+HILITECOLOR = GREEN
+RESETBGCOLOR = LIGHTGRAY
+FLAGGEDCELL_COV = RED
@@ -0,0 +1,166 @@
+'''
+
+A headless tournament runner for evaluating solvers over many games. Games are spread over a pool of
+worker processes, played without printing or a GUI, and summarised as win rate, moves per game and
+per-move latency percentiles.
+
+A solver is either a GameInterface subclass (its get_input() is called for every move) or a callable
+taking the Game and returning (row, col, action). Both must be importable (picklable) when more than
+one worker is used.
+
+
+    @author: JustaGist (saifksidhik@gmail.com)
+    @file: tournament.py
+    @package: pyminesweeper v0.9
+
+'''
+
+import inspect
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from pyminesweeper.core import Game, ArrayMineField
+from pyminesweeper.interface import GameInterface
+
+
+class TournamentResult(object):
+    '''
+        Aggregate result of a tournament. Latencies are per move (choosing and playing it), in seconds.
+    '''
+
+    def __init__(self, num_games, wins, losses, moves_per_game, latencies, wall_time):
+
+        self.num_games = num_games
+        self.wins = wins
+        self.losses = losses
+        self.stalled = num_games - wins - losses # games that hit the move limit
+        self.win_rate = wins/float(num_games)
+        self.mean_moves = float(np.mean(moves_per_game)) if len(moves_per_game) else 0.
+        self.num_moves = int(np.sum(moves_per_game))
+        self.latency_p50 = float(np.percentile(latencies, 50)) if len(latencies) else 0.
+        self.latency_p99 = float(np.percentile(latencies, 99)) if len(latencies) else 0.
+        self.wall_time = wall_time
+
+    def __str__(self):
+        return ("Games: %d (won: %d, lost: %d, stalled: %d)\n"
+                "Win rate: %.2f%%\n"
+                "Moves per game: %.1f\n"
+                "Per-move latency: p50 %.1f us, p99 %.1f us\n"
+                "Wall time: %.2f s (%.0f moves/s)")%(self.num_games, self.wins, self.losses, self.stalled,
+                                                     100*self.win_rate, self.mean_moves,
+                                                     1e6*self.latency_p50, 1e6*self.latency_p99,
+                                                     self.wall_time, self.num_moves/max(self.wall_time, 1e-9))
+
+
+def game_seed(seed, game_index, stream = 0):
+    '''
+        Seed of game number 'game_index' of a tournament; independent of how games are spread over workers.
+        Other values of 'stream' give further independent seeds for the same game.
+    '''
+    return int(np.random.SeedSequence([seed, game_index, stream]).generate_state(1, np.uint64)[0] >> np.uint64(1))
+
+
+def play_headless(solver, game, max_moves, seed = None):
+    '''
+        Play one game to the end (or until 'max_moves' moves) without printing.
+
+        Args:
+            seed: if given, the global random and np.random generators are seeded from it, and so is a
+                  GameInterface subclass that takes a 'seed' argument, so that the solver plays the game reproducibly
+
+        @Return -- number of moves played, and the latency of every move
+
+    '''
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed % 2**32)
+
+    if isinstance(solver, type) and issubclass(solver, GameInterface):
+        if seed is not None and 'seed' in inspect.signature(solver).parameters:
+            interface = solver(game, seed = seed)
+        else:
+            interface = solver(game)
+        choose_move = interface.get_input # GameInterface.__init__ starts the game
+    else:
+        game.start_game()
+        choose_move = lambda: solver(game)
+
+    latencies = []
+    while game.is_running and len(latencies) < max_moves:
+        start = time.perf_counter()
+        row, col, action = choose_move()
+        game.play_move(row, col, action)
+        latencies.append(time.perf_counter() - start)
+
+    return len(latencies), latencies
+
+
+def _play_games(solver, config, seed, first_game, last_game):
+    '''
+        Worker task: play games [first_game, last_game) of the tournament.
+    '''
+    row, col, num_mines, field_type, first_click_safe, max_moves = config
+
+    wins = losses = 0
+    moves, latencies = [], []
+    for index in range(first_game, last_game):
+        game = Game(row, col, num_mines, end_program_when_game_finishes = False, field_type = field_type,
+                    seed = game_seed(seed, index), first_click_safe = first_click_safe)
+        # ----- the solver's random choices are seeded per game, so results do not depend on the number of workers
+        num_moves, game_latencies = play_headless(solver, game, max_moves, seed = game_seed(seed, index, stream = 1))
+        wins += game.status == Game.GameStatus.WON
+        losses += game.status == Game.GameStatus.FAILED
+        moves.append(num_moves)
+        latencies.extend(game_latencies)
+
+    return wins, losses, moves, np.array(latencies, dtype=np.float32)
+
+
+def run_tournament(solver, row, col, num_mines, num_games, workers = None, seed = 0,
+                   field_type = ArrayMineField, first_click_safe = True, max_moves = None, games_per_task = None):
+    '''
+        Play 'num_games' games of a 'row' x 'col' board with 'num_mines' mines with 'solver', across 'workers' processes.
+
+        Args:
+            solver: a GameInterface subclass, or a callable(game) -> (row, col, action)
+            workers: number of worker processes (os.cpu_count() if None); 1 plays all games in this process
+            seed: tournament seed; game i always gets the same board, and the solver the same random seed, for the same seed
+            max_moves: moves after which a game is abandoned (default: 2 x number of cells)
+            games_per_task: games handed to a worker at a time (default: spread evenly, a few tasks per worker)
+
+        @Return -- a TournamentResult
+
+    '''
+    max_moves = max_moves or 2*row*col
+    config = (row, col, num_mines, field_type, first_click_safe, max_moves)
+
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [_play_games(solver, config, seed, 0, num_games)]
+    else:
+        with ProcessPoolExecutor(max_workers = workers) as pool:
+            games_per_task = games_per_task or max(1, num_games//(4*workers))
+            bounds = list(range(0, num_games, games_per_task)) + [num_games]
+            futures = [pool.submit(_play_games, solver, config, seed, first, last) for first, last in zip(bounds[:-1], bounds[1:])]
+            results = [future.result() for future in futures]
+    wall_time = time.perf_counter() - start
+
+    return TournamentResult(num_games,
+                            sum(result[0] for result in results),
+                            sum(result[1] for result in results),
+                            [moves for result in results for moves in result[2]],
+                            np.concatenate([result[3] for result in results]),
+                            wall_time)
+
+
+
+if __name__ == '__main__':
+
+    def random_player(game):
+        return random.randrange(game.field_info[0]), random.randrange(game.field_info[1]), Game.GameAction.REVEAL
+
+    print(run_tournament(random_player, 9, 9, 10, 100, workers = 1))
@@ -19,7 +19,7 @@ setup(
     license = "BSD",
     keywords = "minesweeer, game",
     # url = "https://bitbucket.org/justagist/reinfor_learn",
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     scripts=['pyminesweeper/commandlinescripts/pyminesweeper'],
     install_requires=[
           'pygame', 'numpy'
@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+import pytest
+
+from pyminesweeper.core import Game, MineField, ArrayMineField, BatchGame
+
+
+def masks(minefield):
+    visible = np.array([[cell.is_visible for cell in row] for row in minefield])
+    flagged = np.array([[cell.is_flagged for cell in row] for row in minefield])
+    return visible, flagged
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_same_moves_as_minefield_engines(seed):
+    num_games, rows, cols, num_mines = 8, 9, 12, 18
+    batch = BatchGame(num_games, rows, cols, num_mines, seed = seed, auto_reset = False)
+    games = {}
+    for field_type in (MineField, ArrayMineField):
+        games[field_type] = [Game(rows, cols, num_mines, False, minefield = field_type.from_mines(batch._mines[g])) for g in range(num_games)]
+        for game in games[field_type]:
+            game.start_game()
+
+    moves = random.Random(seed)
+    for _ in range(40):
+        row, col = [moves.randrange(rows) for _ in range(num_games)], [moves.randrange(cols) for _ in range(num_games)]
+        actions = [Game.GameAction.FLAG if moves.random() < 0.2 else Game.GameAction.REVEAL for _ in range(num_games)]
+        status, _, changed = batch.play_moves(row, col, actions)
+
+        for field_type, field_games in games.items():
+            for g, game in enumerate(field_games):
+                before = masks(game.minefield)
+                if game.is_running:
+                    game.play_move(row[g], col[g], actions[g])
+                visible, flagged = masks(game.minefield)
+                assert status[g] == game.status.value, (field_type, g)
+                assert np.array_equal(batch.visible_mask[g], visible), (field_type, g)
+                assert np.array_equal(batch.flag_mask[g], flagged), (field_type, g)
+                assert np.array_equal(changed[g], (visible != before[0]) | (flagged != before[1])), (field_type, g)
+
+
+def test_boards_and_auto_reset():
+    batch = BatchGame(50, 9, 9, 10, seed = 1)
+    assert (batch._mines.sum(axis = (1, 2)) == 10).all()
+    assert not batch._mines[:, [0, 0, -1, -1], [0, -1, 0, -1]].any() # never at the corners
+
+    rows, cols = np.nonzero(batch._mines[0])
+    status, rewards, _ = batch.play_moves([rows[0]]*50, [cols[0]]*50, [BatchGame.REVEAL]*50)
+    assert status[0] == Game.GameStatus.FAILED.value and rewards[0] == BatchGame.REWARD_LOSS
+    assert batch.status[0] == Game.GameStatus.RUNNING.value and not batch.visible_mask[0].any() # reset to a new game
+
+
+def test_first_click_safe():
+    batch = BatchGame(200, 9, 9, 30, seed = 2, first_click_safe = True, safe_neighbourhood = True)
+    status, _, _ = batch.play_moves([4]*200, [4]*200, [BatchGame.REVEAL]*200)
+    assert (status != Game.GameStatus.FAILED.value).all()
+    assert (batch.observation[:, 4, 4] == 0).all()
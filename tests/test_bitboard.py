@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from pyminesweeper.core import MineField, ArrayMineField
+from pyminesweeper.core.bitboard import BitBoard, cells, from_array, neighbour_counts, population, to_array
+
+
+def counts(mask):
+    '''
+        Number of set neighbours of every cell (NumPy reference).
+    '''
+    padded = np.pad(mask.astype(int), 1)
+    rows, cols = mask.shape
+    return sum(padded[dr:dr+rows, dc:dc+cols] for dr in range(3) for dc in range(3) if (dr, dc) != (1, 1))
+
+
+def dilated(mask):
+    return counts(mask) + mask > 0
+
+
+def planes_to_array(planes, num_cols):
+    return sum(to_array(plane, num_cols).astype(int) << bit for bit, plane in enumerate(planes))
+
+
+def random_board(seed, shape):
+    rng = np.random.default_rng(seed)
+    mines = rng.random(shape) < 0.2
+    visible = rng.random(shape) < 0.5
+    flagged = ~visible & (rng.random(shape) < 0.3)
+    return mines, visible, flagged
+
+
+@pytest.mark.parametrize('seed', range(40))
+@pytest.mark.parametrize('shape', [(1, 1), (9, 9), (16, 30), (7, 70)])
+def test_queries_match_numpy(seed, shape):
+    mines, visible, flagged = random_board(seed, shape)
+    board = BitBoard(shape[0], shape[1], from_array(mines), from_array(visible), from_array(flagged))
+    numbers = counts(mines)
+    hidden = ~visible
+    revealed_numbers = visible & ~mines & (numbers > 0)
+    array = lambda rows: to_array(rows, shape[1])
+
+    assert np.array_equal(planes_to_array(board.number_planes, shape[1]), numbers)
+    assert np.array_equal(planes_to_array(board.hidden_neighbour_counts(), shape[1]), counts(hidden))
+    assert np.array_equal(planes_to_array(board.flag_neighbour_counts(), shape[1]), counts(flagged))
+    assert np.array_equal(array(board.revealed_numbers()), revealed_numbers)
+    assert np.array_equal(array(board.frontier()), dilated(revealed_numbers) & hidden)
+    assert np.array_equal(array(board.numbers_with_hidden_neighbours()), revealed_numbers & dilated(hidden))
+    assert np.array_equal(array(board.satisfied_numbers()), revealed_numbers & (counts(flagged) == numbers))
+    assert np.array_equal(array(board.saturated_numbers()), revealed_numbers & (counts(hidden) == numbers))
+    assert np.array_equal(array(neighbour_counts(board.mines, board.full)[0]), numbers & 1 == 1)
+    assert population(board.mines) == mines.sum()
+    assert list(cells(board.visible)) == [tuple(cell) for cell in np.argwhere(visible).tolist()]
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_from_minefield_and_updates(field_type):
+    field = field_type.create_new(16, 30, 99, seed = 3, first_click_safe = True)
+    field.initialise()
+    board = BitBoard.from_minefield(field)
+    revealed = field.reveal_cells(8, 15)
+    board.reveal(revealed)
+    row, col = next((r, c) for r in range(16) for c in range(30) if not field[r][c].is_visible)
+    field.flag_cell(row, col)
+    board.flag(row, col)
+
+    expected = BitBoard.from_minefield(field) # with the mines placed by the first click
+    assert (board.visible, board.flagged) == (expected.visible, expected.flagged)
+    assert np.array_equal(expected.to_array(expected.mines), np.array([[cell._is_mine for cell in r] for r in field]))
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from pyminesweeper.core import BoardPool, Game, MineField, ArrayMineField
+
+
+def test_default_engine_and_ready_boards():
+    with BoardPool(16, 30, 99, seed = 7) as pool:
+        board = pool.get(timeout = 10)
+        assert isinstance(board, ArrayMineField)
+        assert board.is_intact and board._num_mines == 99
+
+        game = pool.new_game()
+        game.start_game()
+        assert game.play_move(0, 0, Game.GameAction.REVEAL) != Game.GameStatus.FAILED # corners never hold mines
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_same_seed_same_boards(field_type):
+    boards = []
+    for _ in range(2):
+        with BoardPool(9, 9, 10, field_type = field_type, seed = 3) as pool:
+            boards.append([(board.seed, np.array(board.mine_mask if hasattr(board, 'mine_mask') else
+                                                 [[cell._is_mine for cell in row] for row in board]))
+                           for board in (pool.get(timeout = 10) for _ in range(4))])
+    for (seed_a, mines_a), (seed_b, mines_b) in zip(*boards):
+        assert seed_a == seed_b and np.array_equal(mines_a, mines_b)
+    # ----- the seed of a board rebuilds it
+    seed, mines = boards[0][0]
+    board = field_type.create_new(9, 9, 10, seed = seed)
+    board.initialise()
+    assert sorted(map(list, board._mine_locations)) == np.argwhere(mines).tolist()
+
+
+def test_generation_errors_are_raised_by_get():
+    with BoardPool(3, 3, 9, seed = 0) as pool:
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                pool.get(timeout = 10)
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from pyminesweeper.core import ArrayMineField
+from pyminesweeper.core.constraint_solver import ConstraintSolver
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_proofs_are_sound(seed):
+    board = ArrayMineField.create_new(16, 30, 99, seed = seed, first_click_safe = True, safe_neighbourhood = True)
+    board.initialise()
+    solver = ConstraintSolver(16, 30)
+    opened = [(int(r), int(c)) for r, c in board.reveal_cells(8, 15)]
+    solver.add_revealed((r, c, board[r][c].get_number()) for r, c in opened)
+    while True:
+        cell = solver.next_safe_cell()
+        if cell is None:
+            break
+        solver.add_revealed((int(r), int(c), board[int(r)][int(c)].get_number()) for r, c in board.reveal_cells(*cell))
+        assert board.is_intact
+
+    mines = board.mine_mask
+    assert all(mines[divmod(cell, 30)] for cell in solver.mines)
+    assert not any(mines[divmod(cell, 30)] for cell in solver.safe)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_incremental_matches_from_scratch(seed):
+    board = ArrayMineField.create_new(16, 16, 40, seed = seed, first_click_safe = True, safe_neighbourhood = True)
+    board.initialise()
+    incremental = ConstraintSolver(16, 16)
+    opened = [(int(r), int(c)) for r, c in board.reveal_cells(8, 8)]
+    incremental.add_revealed((r, c, board[r][c].get_number()) for r, c in opened)
+    moves = random.Random(seed)
+    for _ in range(5):
+        cell = incremental.next_safe_cell()
+        if cell is None:
+            break
+        for r, c in board.reveal_cells(*cell):
+            incremental.add_revealed([(int(r), int(c), board[int(r)][int(c)].get_number())])
+
+    revealed = [(r, c, board[r][c].get_number()) for r in range(16) for c in range(16) if board[r][c].is_visible]
+    moves.shuffle(revealed)
+    from_scratch = ConstraintSolver(16, 16)
+    from_scratch.add_revealed(revealed)
+    assert from_scratch.mines == incremental.mines
+    assert from_scratch.safe | from_scratch.revealed == incremental.safe | incremental.revealed
+
+
+def test_subset_rule():
+    # 1 1 0     the 0 at [0,2] clears [1,1] and [1,2]; the 1 at [0,1] then has one
+    # . . .     unknown cell left, so [1,0] is the mine
+    solver = ConstraintSolver(2, 3)
+    solver.add_revealed([(0, 0, 1), (0, 1, 1), (0, 2, 0)])
+    assert solver.mines == {3}
+    assert solver.is_known(1, 1) and solver.is_known(1, 2)
+    assert solver.next_mine() == (1, 0) and solver.next_mine() is None
@@ -0,0 +1,61 @@
+import random
+
+from pyminesweeper.core import EndlessMineField
+
+
+def test_looking_at_cells_keeps_the_cache_bounded():
+    field = EndlessMineField(seed = 0, chunk_size = 8, max_chunks = 10)
+    field.initialise()
+    for row in range(-40, 40, 3):
+        for col in range(-40, 40, 3):
+            field[row][col].get_number()
+            assert field.num_cached_chunks <= 10
+
+
+def test_spilled_state_is_bounded_and_kept():
+    small = EndlessMineField(density = 0.2, seed = 3, chunk_size = 8, max_chunks = 10, max_spilled = 2)
+    large = EndlessMineField(density = 0.2, seed = 3, chunk_size = 8, max_chunks = 10**6)
+    moves = random.Random(0)
+    for field in (small, large):
+        field.initialise()
+    for _ in range(300):
+        row, col = moves.randrange(-60, 60), moves.randrange(-60, 60)
+        if moves.random() < 0.3:
+            small.flag_cell(row, col)
+            large.flag_cell(row, col)
+        else:
+            assert small.reveal_cells(row, col) == large.reveal_cells(row, col)
+        small._is_playing = large._is_playing = True # keep playing after a mine
+        assert small.num_cached_chunks <= 10
+        assert len(small._spilled) <= 2
+
+    assert small._on_disk
+    assert small.window(-60, -60, 120, 120) == large.window(-60, -60, 120, 120)
+
+
+def test_reveal_cut_off_by_reveal_limit_is_resumed():
+    limited = EndlessMineField(density = 0.12, seed = 4, chunk_size = 8, max_chunks = 10, reveal_limit = 20)
+    unlimited = EndlessMineField(density = 0.12, seed = 4, chunk_size = 8)
+    for field in (limited, unlimited):
+        field.initialise()
+    expected = unlimited.reveal_cells(0, 0)
+
+    opened = limited.reveal_cells(0, 0)
+    assert len(opened) == 20 and limited.has_pending_reveal
+    opened += limited.reveal_cells(0, 0) # clicking the open region again resumes it
+    while limited.has_pending_reveal:
+        opened += limited.continue_reveal()
+
+    assert sorted(opened) == sorted(expected)
+    assert limited.revealed_safe_cells == unlimited.revealed_safe_cells
+    assert limited.window(-40, -40, 80, 80) == unlimited.window(-40, -40, 80, 80)
+
+
+def test_looking_at_cells_does_not_count_neighbours():
+    field = EndlessMineField(seed = 0, chunk_size = 8, max_chunks = 10)
+    field.initialise()
+    field.flag_cell(100, 100)
+    assert field[100][100].is_flagged and not field[101][101].is_visible
+    assert field._chunks[(12, 12)].numbers is None
+    field.reveal_cells(0, 0)
+    assert field._locate(0, 0)[0].numbers is not None
@@ -0,0 +1,76 @@
+import pytest
+
+from pyminesweeper.core import Game, MineField, ArrayMineField
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_moves_are_not_journaled_by_default(field_type):
+    game = Game(30, 30, 100, False, field_type = field_type, seed = 1, first_click_safe = True)
+    game.start_game()
+    game.play_move(15, 15, Game.GameAction.REVEAL)
+    game.play_move(0, 0, Game.GameAction.FLAG)
+    assert game.minefield._journal is None
+    with pytest.raises(Exception):
+        game.undo()
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_undo_and_redo(field_type):
+    game = Game(30, 30, 100, False, field_type = field_type, seed = 1, first_click_safe = True, undo = True)
+    game.start_game()
+    game.play_move(15, 15, Game.GameAction.REVEAL)
+    revealed = game.minefield.revealed_safe_cells
+    game.play_move(0, 0, Game.GameAction.FLAG)
+
+    assert game.undo() == Game.GameStatus.RUNNING
+    assert not game.minefield[0][0].is_flagged
+    game.undo()
+    assert game.minefield.revealed_safe_cells == 0
+    game.redo()
+    assert game.minefield.revealed_safe_cells == revealed
+
+
+def hidden_cell(game):
+    return next((r, c) for r in range(30) for c in range(30) if not game.minefield[r][c].is_visible)
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_max_undo_bounds_the_journal(field_type):
+    game = Game(30, 30, 100, False, field_type = field_type, seed = 1, first_click_safe = True, undo = True, max_undo = 5)
+    game.start_game()
+    game.play_move(15, 15, Game.GameAction.REVEAL)
+    row, col = hidden_cell(game)
+    for _ in range(201):
+        game.play_move(row, col, Game.GameAction.FLAG)
+    assert len(game.minefield._journal) == 5 # one change per flag move
+
+    for _ in range(5):
+        assert game.undo() == Game.GameStatus.RUNNING
+    assert game.undo() is None
+    assert not game.minefield[row][col].is_flagged # back to 196 flag moves
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_commit_after_lookahead(field_type):
+    game = Game(30, 30, 100, False, field_type = field_type, seed = 1, first_click_safe = True)
+    game.start_game()
+    game.play_move(15, 15, Game.GameAction.REVEAL)
+    row, col = hidden_cell(game)
+
+    root = game.snapshot()
+    game.play_move(row, col, Game.GameAction.FLAG)
+    middle = game.snapshot()
+    game.play_move(row, col, Game.GameAction.FLAG)
+    game.commit(middle)
+    game.restore(middle)
+    assert game.minefield[row][col].is_flagged
+    with pytest.raises(Exception):
+        game.restore(root)
+
+    game.commit()
+    assert game.minefield._journal is None
+    game.play_move(row, col, Game.GameAction.FLAG)
+    state = game.snapshot()
+    game.play_move(row, col, Game.GameAction.FLAG)
+    game.restore(state)
+    assert not game.minefield[row][col].is_flagged
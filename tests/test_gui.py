@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from pyminesweeper.core import Game
+from pyminesweeper.interface import GUI
+
+
+@pytest.fixture
+def gui():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    gui = GUI(Game(9, 9, 10, end_program_when_game_finishes = False, seed = 0))
+    yield gui
+    pygame.quit()
+
+
+def _hover(gui, position, frames = 2):
+    for _ in range(frames):
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos = position, rel = (0, 0), buttons = (0, 0, 0)))
+        gui._frame()
+
+
+def test_hovering_buttons(gui):
+    for button in (gui._RESET_RECT, gui._SHOW_RECT, gui._RESET_RECT):
+        _hover(gui, button.center)
+        assert gui._highlight == button
+
+    box = gui._get_left_top_xy(4, 4)
+    _hover(gui, (box[0] + 1, box[1] + 1))
+    assert gui._highlight == (4, 4)
+
+    _hover(gui, gui._SHOW_RECT.center)
+    assert gui._highlight == gui._SHOW_RECT
+
+
+def test_revealed_box_loses_its_highlight_in_the_same_frame(gui):
+    row, col = next((r, c) for r in range(9) for c in range(9) if not gui._game.minefield[r][c]._is_mine)
+    left, top = gui._get_left_top_xy(row, col)
+    position = (left + 1, top + 1)
+    _hover(gui, position)
+    assert gui._highlight == (row, col)
+
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos = position, button = 1))
+    gui._frame()
+    assert gui._game.minefield[row][col].is_visible
+    assert gui._highlight is None
+    box = pygame.Rect(left - 4, top - 4, gui.BOXSIZE + 8, gui.BOXSIZE + 8)
+    display, board = gui._DISPLAYSURFACE.subsurface(box), gui._BOARDSURFACE.subsurface(box)
+    assert pygame.image.tobytes(display, 'RGB') == pygame.image.tobytes(board, 'RGB')
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from pyminesweeper.core import Game, ArrayMineField
+from pyminesweeper.interface import AsyncGameInterface
+
+
+def safe_cells(game):
+    return [(r, c) for r, row in enumerate(game.minefield) for c, cell in enumerate(row) if not cell._is_mine and not cell.is_visible]
+
+
+class CheatingBot(AsyncGameInterface):
+    '''
+        Reveals a hidden safe cell per move, letting the event loop run other tasks before every move.
+    '''
+
+    def __init__(self, game, name = None, moves = None, delay = 0, **kwargs):
+        super().__init__(game, **kwargs)
+        self.name, self.moves, self.delay = name, moves, delay
+        self.result = None
+
+    async def get_input(self):
+        await asyncio.sleep(self.delay)
+        if self.moves is not None:
+            self.moves.append(self.name)
+        row, col = safe_cells(self._game)[0]
+        return row, col, Game.GameAction.REVEAL
+
+    def game_won(self):
+        self.result = 'won'
+
+    def game_lost(self):
+        self.result = 'lost'
+
+
+class FallbackBot(CheatingBot):
+    '''
+        Never answers in time; plays a safe cell instead.
+    '''
+
+    def move_timed_out(self):
+        self.moves.append('fallback')
+        row, col = safe_cells(self._game)[0]
+        return row, col, Game.GameAction.REVEAL
+
+
+def new_game(seed, field_type = ArrayMineField):
+    return Game(9, 9, 10, False, field_type = field_type, seed = seed)
+
+
+def test_bot_plays_to_the_end():
+    bot = CheatingBot(new_game(0))
+    assert asyncio.run(bot.run()) == Game.GameStatus.WON
+    assert bot.result == 'won' and not safe_cells(bot._game)
+
+
+def test_bots_play_concurrently():
+    moves = []
+    bots = [CheatingBot(new_game(seed), name = seed, moves = moves) for seed in range(4)]
+
+    async def play():
+        return await asyncio.gather(*(bot.run() for bot in bots))
+
+    assert asyncio.run(play()) == [Game.GameStatus.WON]*4
+    assert moves[:4] == [0, 1, 2, 3] # every bot waits for its first move before any plays a second one
+    for seed, bot in enumerate(bots):
+        assert bot.result == 'won'
+        alone = CheatingBot(new_game(seed), name = seed, moves = [])
+        asyncio.run(alone.run())
+        assert moves.count(seed) == len(alone.moves)
+
+
+def test_move_timeout():
+    bot = CheatingBot(new_game(1), delay = 10, move_timeout = 0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(bot.run())
+    assert bot._game.status == Game.GameStatus.RUNNING and bot.result is None
+
+    moves = []
+    bot = FallbackBot(new_game(1), moves = moves, delay = 10, move_timeout = 0.01)
+    assert asyncio.run(bot.run()) == Game.GameStatus.WON
+    assert moves and set(moves) == {'fallback'}
+
+
+def test_cancelling_run_abandons_the_game():
+    bot = CheatingBot(new_game(2), delay = 10)
+
+    async def play():
+        task = asyncio.ensure_future(bot.run())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(play())
+    assert bot._game.status == Game.GameStatus.RUNNING and bot.result is None
+
+
+def test_get_input_has_to_be_implemented():
+    with pytest.raises(NotImplementedError):
+        asyncio.run(AsyncGameInterface(new_game(3)).run())
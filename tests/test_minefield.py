@@ -0,0 +1,27 @@
+import pytest
+
+from pyminesweeper.core import MineField, ArrayMineField
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+@pytest.mark.parametrize('first_click_safe', [False, True])
+def test_too_many_mines_raise(field_type, first_click_safe):
+    with pytest.raises(ValueError):
+        field_type.create_new(3, 3, 9, seed = 0, first_click_safe = first_click_safe)
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+@pytest.mark.parametrize('num_mines', [1, 3, 5])
+def test_all_mines_placed(field_type, num_mines):
+    board = field_type.create_new(3, 3, num_mines, seed = 0)
+    assert board._num_mines == num_mines
+    assert len(board._mine_locations) == num_mines
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_all_mines_placed_on_first_click(field_type):
+    board = field_type.create_new(5, 5, 20, seed = 0, first_click_safe = True, safe_neighbourhood = True)
+    assert board.initialise()
+    board.reveal_cells(2, 2)
+    assert len(board._mine_locations) == 20
+    assert not board[2][2]._is_mine
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from pyminesweeper.core import Game, MineField, ArrayMineField
+from pyminesweeper.core.minesweeper_env import MinesweeperEnv
+
+
+def expected_observation(minefield):
+    obs = np.full((minefield.num_rows, minefield.num_cols), MinesweeperEnv.HIDDEN, dtype=np.int8)
+    for r, row in enumerate(minefield):
+        for c, cell in enumerate(row):
+            if cell.is_visible:
+                obs[r, c] = MinesweeperEnv.MINE if cell._is_mine else cell.get_number()
+            elif cell.is_flagged:
+                obs[r, c] = MinesweeperEnv.FLAGGED
+    return obs
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_observation_and_mask_follow_the_game(field_type):
+    env = MinesweeperEnv(9, 12, 15, field_type = field_type)
+    rng = np.random.default_rng(0)
+    for episode in range(5):
+        obs, info = env.reset(seed = episode)
+        assert (obs == MinesweeperEnv.HIDDEN).all() and env.action_mask.all()
+        terminated = False
+        while not terminated:
+            action = rng.choice(np.flatnonzero(env.action_mask.ravel()))
+            obs, reward, terminated, truncated, info = env.step(action)
+            assert np.array_equal(obs, expected_observation(env.game.minefield))
+            hidden = obs == MinesweeperEnv.HIDDEN
+            assert np.array_equal(env.action_mask[0], hidden)
+            assert np.array_equal(env.action_mask[1], hidden | (obs == MinesweeperEnv.FLAGGED))
+            assert not truncated and info['status'] == env.game.status
+            if info['status'] == Game.GameStatus.WON:
+                assert reward == MinesweeperEnv.REWARD_WIN
+            elif info['status'] == Game.GameStatus.FAILED:
+                assert reward == MinesweeperEnv.REWARD_LOSS
+            else:
+                assert reward == (MinesweeperEnv.REWARD_FLAG if action >= 9*12 else MinesweeperEnv.REWARD_PROGRESS)
+
+
+def test_actions_and_read_only_views():
+    env = MinesweeperEnv(9, 9, 10)
+    obs, _ = env.reset(seed = 1)
+    with pytest.raises(ValueError):
+        obs[0, 0] = 0
+
+    obs, reward, terminated, _, _ = env.step((4, 4, Game.GameAction.REVEAL)) # first click is safe
+    assert not env.action_mask[0, 4, 4] and obs[4, 4] >= 0
+    assert env.step(4*9 + 4)[1] == MinesweeperEnv.REWARD_NO_PROGRESS # revealed already
+
+    row, col = np.argwhere(obs == MinesweeperEnv.HIDDEN)[0]
+    env.step(81 + row*9 + col)
+    assert obs[row, col] == MinesweeperEnv.FLAGGED and not env.action_mask[0, row, col] # the same array, updated in place
+    env.step(81 + row*9 + col)
+    assert obs[row, col] == MinesweeperEnv.HIDDEN
@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+import pytest
+
+from pyminesweeper.core import Game, MineField, ArrayMineField
+from pyminesweeper.core.movelog import Replay, read_log, HEADER, MOVE
+
+
+def state(game):
+    cells = [[(cell.is_visible, cell.is_flagged) for cell in row] for row in game.minefield]
+    return np.array(cells), game.status, game.minefield.revealed_safe_cells
+
+
+def record_game(path, field_type, first_click_safe, seed):
+    '''
+        Play random moves (mostly on safe cells, with some losses taken back by undo) while recording.
+
+        @Return -- the state after every move of the log
+    '''
+    game = Game(12, 16, 30, False, field_type = field_type, seed = seed, first_click_safe = first_click_safe, undo = True)
+    game.start_game()
+    game.record(path)
+    moves = random.Random(seed)
+    states = [state(game)]
+    while game.status != Game.GameStatus.WON and len(states) < 120:
+        if game.status == Game.GameStatus.FAILED or (states[1:] and moves.random() < 0.1):
+            game.undo()
+        else:
+            row, col = moves.randrange(12), moves.randrange(16)
+            cell = game.minefield[row][col]
+            if cell.is_visible or (cell._is_mine and moves.random() < 0.8):
+                continue
+            game.play_move(row, col, Game.GameAction.FLAG if moves.random() < 0.3 else Game.GameAction.REVEAL)
+        states.append(state(game))
+    game.stop_recording()
+    return states
+
+
+def same(a, b):
+    return np.array_equal(a[0], b[0]) and a[1:] == b[1:]
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+@pytest.mark.parametrize('first_click_safe', [False, True])
+def test_replay_and_seek(tmp_path, field_type, first_click_safe):
+    path = str(tmp_path/'game.pml')
+    states = record_game(path, field_type, first_click_safe, seed = 4)
+    replay = Replay(path, checkpoint_interval = 8)
+    assert len(replay) == len(states) - 1
+
+    for position, game in enumerate(replay.states()):
+        assert same(state(game), states[position]), position
+
+    positions = list(range(len(states)))
+    random.Random(0).shuffle(positions)
+    for position in positions:
+        assert same(state(replay.seek(position)), states[position]), position
+
+
+def test_replay_on_the_other_engine(tmp_path):
+    path = str(tmp_path/'game.pml')
+    states = record_game(path, MineField, False, seed = 6)
+    replay = Replay(path, field_type = ArrayMineField)
+    assert isinstance(replay.game.minefield, ArrayMineField)
+    assert same(state(replay.seek(len(replay))), states[-1])
+
+    record_game(path, MineField, True, seed = 6)
+    with pytest.raises(Exception):
+        Replay(path, field_type = ArrayMineField) # mines placed on the first click by MineField's generator
+
+
+def test_partly_written_record_is_ignored(tmp_path):
+    path = str(tmp_path/'game.pml')
+    states = record_game(path, ArrayMineField, True, seed = 8)
+    with open(path, 'ab') as f:
+        f.write(b'\x01\x00\x00') # a crash in the middle of a record
+    board, moves = read_log(path)
+    assert len(moves) == len(states) - 1
+    with open(path, 'rb') as f:
+        assert len(f.read()) == HEADER.size + len(board) + len(moves)*MOVE.size + 3
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from pyminesweeper.core import Game, MineField, ArrayMineField
+from pyminesweeper.core.no_guess import (BoardCache, candidate, generate_boards, is_solvable_without_guessing,
+                                         no_guess_board, pack_mines, unpack_mines)
+
+CONFIG = (9, 9, 10, (4, 4))
+
+
+def boards(count = 6, seed = 1, workers = 1):
+    return [(board_seed, mines.tolist()) for board_seed, mines in generate_boards(*CONFIG, count, seed = seed, workers = workers)]
+
+
+def test_boards_do_not_depend_on_the_number_of_workers():
+    single = boards()
+    assert len(single) == 6 and len(set(board_seed for board_seed, _ in single)) == 6
+    assert boards() == single
+    assert boards(workers = 2) == single
+    assert boards(seed = 2) != single
+
+
+def test_boards_are_solvable_without_guessing():
+    for board_seed, mines in boards():
+        mines = np.array(mines)
+        assert mines.sum() == 10 and not mines[3:6, 3:6].any() # the first click opens an area
+        assert np.array_equal(candidate(*CONFIG, board_seed).mine_mask, mines)
+
+        board = ArrayMineField.from_mines(mines)
+        board.initialise()
+        assert is_solvable_without_guessing(board, 4, 4) and board.revealed_all_safe_cells
+
+
+def test_rejected_candidates_need_a_guess():
+    # ----- the first click reveals the first three columns; the mine can be either cell of the last one
+    mines = np.zeros((2, 4), dtype=bool)
+    mines[0, 3] = True
+    board = ArrayMineField.from_mines(mines)
+    board.initialise()
+    assert not is_solvable_without_guessing(board, 0, 0)
+    assert board.revealed_safe_cells == 6
+
+    with pytest.raises(Exception):
+        next(generate_boards(9, 9, 60, (4, 4), 1, seed = 0, workers = 1, max_candidates = 64))
+
+
+def test_first_click_outside_the_board():
+    for first_click in [(9, 0), (0, -1)]:
+        with pytest.raises(Exception):
+            next(generate_boards(9, 9, 10, first_click, 1, workers = 1))
+
+
+def test_pack_and_unpack_mines():
+    mines = np.random.default_rng(0).random((7, 13)) < 0.3
+    assert np.array_equal(unpack_mines(pack_mines(mines), 7, 13), mines)
+
+
+def test_board_cache(tmp_path):
+    path = str(tmp_path/'boards.db')
+    generated = boards(4)
+    with BoardCache(path) as cache:
+        assert cache.count(*CONFIG) == 0 and cache.take(*CONFIG) is None
+        cache.add(*CONFIG, [(board_seed, np.array(mines)) for board_seed, mines in generated[:3]])
+        assert cache.count(*CONFIG) == 3 and cache.count(9, 9, 10, (0, 0)) == 0
+
+        board_seed, mines = cache.take(*CONFIG)
+        assert (board_seed, mines.tolist()) == generated[0]
+        assert cache.count(*CONFIG) == 2
+
+    with BoardCache(path) as cache: # kept on disk, oldest first
+        assert cache.fill(*CONFIG, 2, workers = 1) == 0
+        assert cache.fill(*CONFIG, 5, seed = 1, workers = 1, commit_every = 2) == 3
+        taken = [cache.take(*CONFIG) for _ in range(5)]
+        assert [(board_seed, mines.tolist()) for board_seed, mines in taken] == generated[1:3] + boards(3)
+        assert cache.take(*CONFIG) is None
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_no_guess_board(tmp_path, field_type):
+    generated = boards(2)
+    with BoardCache(str(tmp_path/'boards.db')) as cache:
+        cache.add(*CONFIG, [(board_seed, np.array(mines)) for board_seed, mines in generated[1:]])
+        cached = no_guess_board(*CONFIG, cache = cache, field_type = field_type)
+        assert cache.count(*CONFIG) == 0
+        generated_now = no_guess_board(*CONFIG, cache = cache, field_type = field_type, seed = 1, workers = 1)
+
+    for board, (_, mines) in [(cached, generated[1]), (generated_now, generated[0])]:
+        assert type(board) is field_type
+        game = Game(9, 9, 10, False, minefield = board)
+        game.start_game()
+        assert [[cell._is_mine for cell in row] for row in game.minefield] == mines
+        game.play_move(4, 4, Game.GameAction.REVEAL)
+        assert game.is_running and game.minefield[4][4].get_number() == 0
@@ -0,0 +1,53 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from pyminesweeper.core import MineField, ArrayMineField
+from pyminesweeper.core.probability import mine_probabilities
+
+
+def brute_force(field, num_mines):
+    '''
+        Mine probabilities by enumerating every placement of the mines away from the corners that matches the revealed numbers.
+    '''
+    rows, cols = field.num_rows, field.num_cols
+    corners = {(0, 0), (0, cols-1), (rows-1, 0), (rows-1, cols-1)}
+    revealed = [(r, c, field[r][c].get_number()) for r in range(rows) for c in range(cols) if field[r][c].is_visible]
+    open_cells = set((r, c) for r, c, _ in revealed)
+    candidates = [(r, c) for r in range(rows) for c in range(cols) if (r, c) not in corners | open_cells]
+
+    totals, count = np.zeros((rows, cols)), 0
+    for mines in itertools.combinations(candidates, num_mines):
+        mines = set(mines)
+        if all(number == sum((r+dr, c+dc) in mines for dr in (-1, 0, 1) for dc in (-1, 0, 1)) for r, c, number in revealed):
+            for r, c in mines:
+                totals[r, c] += 1
+            count += 1
+    return totals/count
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_untouched_board_keeps_corners_safe(field_type):
+    field = field_type.create_new(9, 9, 10, seed = 1)
+    field.initialise()
+    probabilities = mine_probabilities(field)
+    assert probabilities[[0, 0, 8, 8], [0, 8, 0, 8]].tolist() == [0.]*4
+    assert np.allclose(probabilities[1:8, :], 10/77.)
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+@pytest.mark.parametrize('seed', range(6))
+def test_matches_brute_force(field_type, seed):
+    field = field_type.create_new(5, 5, 4, seed = seed)
+    field.initialise()
+    moves = random.Random(seed)
+    safe = [(r, c) for r in range(5) for c in range(5) if not field[r][c]._is_mine]
+    for row, col in moves.sample(safe, 2):
+        field.reveal_cells(row, col)
+    if field.revealed_all_safe_cells:
+        return
+
+    probabilities = mine_probabilities(field, time_budget = 10.)
+    assert np.allclose(probabilities, brute_force(field, 4))
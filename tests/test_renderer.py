@@ -0,0 +1,135 @@
+import random
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from pyminesweeper.core import Game, MineField, ArrayMineField
+from pyminesweeper.interface import renderer
+from pyminesweeper.interface.theme import FIELDCOLOR, BOXCOLOR_COV, BOXCOLOR_REV, FLAGGEDCELL_COV
+
+
+def decode_png(data):
+    '''
+        RGB image of a PNG written by encode_png (8 bit RGB, filter type 0 on every scanline).
+    '''
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    chunks, pos = {}, 8
+    while pos < len(data):
+        length, = struct.unpack('>I', data[pos:pos+4])
+        kind, body = data[pos+4:pos+8], data[pos+8:pos+8+length]
+        assert struct.unpack('>I', data[pos+8+length:pos+12+length])[0] == zlib.crc32(kind + body) & 0xffffffff
+        chunks[kind] = body
+        pos += 12 + length
+    width, height, depth, colour_type = struct.unpack('>IIBB', chunks[b'IHDR'][:10])
+    assert (depth, colour_type) == (8, 2) and b'IEND' in chunks
+    scanlines = np.frombuffer(zlib.decompress(chunks[b'IDAT']), dtype=np.uint8).reshape(height, 1 + 3*width)
+    assert not scanlines[:, 0].any()
+    return scanlines[:, 1:].reshape(height, width, 3)
+
+
+def mines(seed = 2):
+    mask = np.zeros(9*12, dtype=bool)
+    mask[np.random.default_rng(seed).choice(9*12, 18, replace = False)] = True
+    return mask.reshape(9, 12)
+
+
+def played_fields(moves = 40, seed = 2):
+    '''
+        The same random moves on a MineField and an ArrayMineField with the same mines: reveals of safe
+        cells and flags, then a reveal of a mine that ends the game.
+
+        @Return -- (field, array_field, moves played)
+    '''
+    mine_mask = mines(seed)
+    field, array_field = MineField.from_mines(mine_mask), ArrayMineField.from_mines(mine_mask)
+    player = random.Random(seed)
+    played = []
+    for minefield in (field, array_field):
+        minefield.initialise()
+    while len(played) < moves:
+        row, col = player.randrange(9), player.randrange(12)
+        action = Game.GameAction.FLAG if player.random() < 0.3 else Game.GameAction.REVEAL
+        if len(played) == moves - 1: # the losing move
+            row, col = [(r, c) for r, c in zip(*np.nonzero(mine_mask)) if not field[r][c].is_flagged][0]
+            action = Game.GameAction.REVEAL
+        elif action == Game.GameAction.REVEAL and mine_mask[row, col]:
+            continue
+        for minefield in (field, array_field):
+            if action == Game.GameAction.FLAG:
+                minefield.flag_cell(row, col)
+            else:
+                minefield.reveal_cells(row, col)
+        played.append((int(row), int(col), action))
+    return field, array_field, played
+
+
+def test_cell_states_are_the_same_on_both_engines():
+    field, array_field, _ = played_fields()
+    states = renderer.cell_states(field)
+    assert np.array_equal(states, renderer.cell_states(array_field))
+
+    for r, row in enumerate(field):
+        for c, cell in enumerate(row):
+            if not cell.is_visible:
+                assert states[r, c] == (renderer.FLAGGED if cell.is_flagged else renderer.COVERED)
+            elif not cell._is_mine:
+                assert states[r, c] == cell.get_number()
+
+
+@pytest.mark.parametrize('box_size', [5, 16, 24])
+def test_render_array_shape_and_colours(box_size):
+    field, array_field, _ = played_fields()
+    image = renderer.render_array(field, box_size)
+    assert np.array_equal(image, renderer.render_array(array_field, box_size))
+
+    gap = max(1, box_size//6)
+    pitch = box_size + gap
+    assert image.shape == (9*pitch + gap, 12*pitch + gap, 3) and image.dtype == np.uint8
+    assert (image[:gap] == FIELDCOLOR).all() and (image[:, :gap] == FIELDCOLOR).all()
+
+    states = renderer.cell_states(field)
+    for r in range(9):
+        for c in range(12):
+            top, left = gap + r*pitch, gap + c*pitch
+            corner = tuple(image[top, left])
+            if states[r, c] in (renderer.FLAGGED, renderer.MINE_FLAGGED):
+                assert corner == FLAGGEDCELL_COV
+            else: # as in the GUI, only the revealed zeros are drawn in the darker box colour
+                assert corner == (BOXCOLOR_COV if states[r, c] == 0 else BOXCOLOR_REV)
+            assert (image[top+box_size:top+pitch, left:left+pitch] == FIELDCOLOR).all()
+
+
+def test_write_png_round_trip(tmp_path):
+    field, _, _ = played_fields()
+    path = tmp_path/'field.png'
+    renderer.write_png(field, str(path), box_size = 12)
+    assert np.array_equal(decode_png(path.read_bytes()), renderer.render_array(field, 12))
+
+    image = np.random.default_rng(0).integers(0, 256, (7, 5, 3), dtype=np.uint8)
+    renderer.write_png(image, str(path))
+    assert np.array_equal(decode_png(path.read_bytes()), image)
+
+
+def test_save_frames_writes_a_frame_per_move(tmp_path):
+    field, _, moves = played_fields()
+    fresh = MineField.from_mines(mines())
+    fresh.initialise()
+
+    num_frames = renderer.save_frames(fresh, moves, str(tmp_path/'frame_%03d.png'), box_size = 8, workers = 1)
+    assert num_frames == len(moves) + 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['frame_%03d.png'%i for i in range(num_frames)]
+    covered = np.full((9, 12), renderer.COVERED, dtype=np.uint8)
+    assert np.array_equal(decode_png((tmp_path/'frame_000.png').read_bytes()), renderer.render_states(covered, 8))
+    assert np.array_equal(decode_png((tmp_path/('frame_%03d.png'%len(moves))).read_bytes()), renderer.render_array(field, 8))
+
+
+def test_frames_do_not_depend_on_the_number_of_workers():
+    _, _, moves = played_fields()
+    frames = []
+    for workers in (1, 2):
+        fresh = ArrayMineField.from_mines(mines())
+        fresh.initialise()
+        frames.append(list(renderer.render_frames(fresh, moves, box_size = 8, workers = workers)))
+    assert frames[0] == frames[1]
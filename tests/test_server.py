@@ -0,0 +1,40 @@
+import asyncio
+
+from pyminesweeper.interface.server import GameServer
+
+
+def test_new_game_with_too_many_mines_fails():
+    response = GameServer().handle_request('{"op": "new", "rows": 3, "cols": 3, "mines": 9, "first_click_safe": false, "id": 1}')
+    assert response['ok'] is False and response['id'] == 1
+    assert 'mines' in response['error']
+
+
+def test_new_game_and_move():
+    server = GameServer()
+    response = server.handle_request({'op': 'new', 'rows': 9, 'cols': 9, 'mines': 10, 'seed': 1})
+    assert response['ok'] and response['mines'] == 10
+    move = server.handle_request({'op': 'move', 'session': response['session'], 'row': 4, 'col': 4})
+    assert move['ok'] and move['status'] == 'RUNNING' and [4, 4] in [cell[:2] for cell in move['revealed']]
+
+
+def test_large_board_does_not_block_the_event_loop():
+    server = GameServer()
+    ticks = []
+
+    async def ticker(done):
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            ticks.append(1)
+
+    async def play():
+        done = asyncio.Event()
+        ticking = asyncio.ensure_future(ticker(done))
+        new = await server.handle_request_async({'op': 'new', 'rows': 400, 'cols': 400, 'mines': 100, 'seed': 1})
+        move = await server.handle_request_async({'op': 'move', 'session': new['session'], 'row': 200, 'col': 200})
+        done.set()
+        await ticking
+        return move
+
+    move = asyncio.run(play())
+    assert move['ok'] and len(move['revealed']) > 10000
+    assert len(ticks) >= 10 # other coroutines ran while the board was opened
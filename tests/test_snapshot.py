@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from pyminesweeper.core import Game, MineField, ArrayMineField
+from pyminesweeper.core.snapshot import BoardSnapshot, dumps, loads
+
+
+def state(minefield):
+    cells = [[(cell._is_mine, cell.is_visible, cell.is_flagged) for cell in row] for row in minefield]
+    return np.array(cells), minefield.revealed_safe_cells, minefield.is_intact
+
+
+def played_game(field_type):
+    game = Game(20, 30, 90, False, field_type = field_type, seed = 5, first_click_safe = True)
+    game.start_game()
+    game.play_move(10, 15, Game.GameAction.REVEAL)
+    hidden = [(r, c) for r in range(20) for c in range(30) if not game.minefield[r][c].is_visible]
+    for row, col in hidden[:3]:
+        game.play_move(row, col, Game.GameAction.FLAG)
+    return game
+
+
+@pytest.mark.parametrize('saved_from', [MineField, ArrayMineField])
+@pytest.mark.parametrize('loaded_into', [None, MineField, ArrayMineField])
+def test_save_and_load_round_trip(tmp_path, saved_from, loaded_into):
+    game = played_game(saved_from)
+    path = str(tmp_path/'game.pms')
+    game.save(path)
+
+    loaded = Game.load(path, field_type = loaded_into)
+    assert isinstance(loaded.minefield, loaded_into or saved_from)
+    assert loaded.status == game.status
+    cells, revealed, playing = state(game.minefield)
+    loaded_cells, loaded_revealed, loaded_playing = state(loaded.minefield)
+    assert np.array_equal(loaded_cells, cells) and (loaded_revealed, loaded_playing) == (revealed, playing)
+
+    # ----- the loaded game plays on like the original
+    row, col = next((r, c) for r in range(20) for c in range(30) if not cells[r, c, 0] and not cells[r, c, 1])
+    assert loaded.play_move(row, col, Game.GameAction.REVEAL) == game.play_move(row, col, Game.GameAction.REVEAL)
+    assert sorted(map(tuple, loaded.last_revealed)) == sorted(map(tuple, game.last_revealed))
+
+
+@pytest.mark.parametrize('field_type', [MineField, ArrayMineField])
+def test_mines_waiting_for_the_first_click_are_kept(field_type):
+    board = field_type.create_new(9, 9, 10, seed = 2, first_click_safe = True, safe_neighbourhood = True)
+    board.initialise()
+    loaded = loads(dumps(board))[0]
+    for field in (board, loaded):
+        field.reveal_cells(4, 4)
+    assert np.array_equal(state(loaded)[0], state(board)[0])
+
+
+def test_board_snapshot_reads_rows_and_cells(tmp_path):
+    game = played_game(ArrayMineField)
+    path = str(tmp_path/'game.pms')
+    game.save(path)
+    field = game.minefield
+    with BoardSnapshot(path) as snapshot:
+        assert (snapshot.num_rows, snapshot.num_cols, snapshot.num_mines) == (20, 30, 90)
+        assert np.array_equal(snapshot.mines(5, 8), field.mine_mask[5:8])
+        assert np.array_equal(snapshot.visible(), field.visible_mask)
+        assert np.array_equal(snapshot.flagged(10, 20), field.flag_mask[10:20])
+        for row, col in ((0, 0), (10, 15), (19, 29)):
+            assert snapshot.cell(row, col) == (field.mine_mask[row, col], field.visible_mask[row, col], field.flag_mask[row, col])
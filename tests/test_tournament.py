@@ -0,0 +1,20 @@
+import random
+
+from pyminesweeper.core import Game
+from pyminesweeper.interface.solver_interface import ConstraintSolverInterface
+from pyminesweeper.interface.tournament import run_tournament
+
+
+def random_player(game):
+    return random.randrange(game.field_info[0]), random.randrange(game.field_info[1]), Game.GameAction.REVEAL
+
+
+def _outcome(result):
+    return result.wins, result.losses, result.num_moves
+
+
+def test_results_do_not_depend_on_workers():
+    for solver in (random_player, ConstraintSolverInterface):
+        single = run_tournament(solver, 9, 9, 10, 24, workers = 1, seed = 3)
+        assert _outcome(single) == _outcome(run_tournament(solver, 9, 9, 10, 24, workers = 3, seed = 3))
+        assert _outcome(single) == _outcome(run_tournament(solver, 9, 9, 10, 24, workers = 1, seed = 3))